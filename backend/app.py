@@ -6,8 +6,14 @@ from backend.routes.notes_routes import router as notes_router
 from backend.routes.page_cordination import router as page_cordination_router
 from backend.routes.time_routes import router as time_router
 from backend.routes.journal_routes import router as journal_router
+from backend.routes.metrics_routes import router as metrics_router
+from backend.services.calendar_outbox import calendar_worker
+from backend.services.query_profiler import QueryProfilerMiddleware, install_query_profiler
+
+install_query_profiler()
 
 app = FastAPI()
+app.add_middleware(QueryProfilerMiddleware)
 
 # Include routers with the "/api" prefix
 app.include_router(day_plan_router, prefix="/api")
@@ -16,3 +22,14 @@ app.include_router(notes_router, prefix="/api")
 app.include_router(page_cordination_router, prefix="/api")
 app.include_router(time_router, prefix="/api")
 app.include_router(journal_router, prefix="/api")
+app.include_router(metrics_router, prefix="/api")
+
+
+@app.on_event("startup")
+def start_calendar_worker():
+    calendar_worker.start()
+
+
+@app.on_event("shutdown")
+def stop_calendar_worker():
+    calendar_worker.stop()
@@ -1,4 +1,5 @@
-from sqlalchemy import create_engine
+from contextlib import contextmanager
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 import os
@@ -6,6 +7,7 @@ import sys
 
 # Import your models
 from backend.database.models import Base  # Make sure to import Base and all your models
+from backend.database.engine import async_url, create_async_sqlite_engine, create_sqlite_engine
 
 def resource_path(relative_path):
     """ Get absolute path to resource, works for dev and for PyInstaller """
@@ -29,12 +31,16 @@ if not db_exists:
 # Use SQLite as the database
 DATABASE_PATH = f"sqlite:///{db_file}"
 
-# Create the SQLAlchemy engine for SQLite
-engine = create_engine(DATABASE_PATH, connect_args={"check_same_thread": False})
+# Create the SQLAlchemy engine for SQLite (WAL and tuning PRAGMAs, see engine.py)
+engine = create_sqlite_engine(DATABASE_PATH)
 
 # Create a sessionmaker
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine on the same file for async routes (aiosqlite)
+async_engine = create_async_sqlite_engine(async_url(DATABASE_PATH))
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
 # Function to get a database session
 def get_db():
     db = SessionLocal()
@@ -43,6 +49,25 @@ def get_db():
     finally:
         db.close()
 
+
+@contextmanager
+def session_scope():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# For handlers that open their own sessions after returning, e.g. streams
+def get_session_scope():
+    return session_scope
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
 # If the database didn't exist, create all tables
 if not db_exists:
     print("Creating tables...")
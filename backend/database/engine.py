@@ -0,0 +1,86 @@
+"""SQLite engine factory with connection tuning.
+
+Every new DB-API connection gets the PRAGMAs in ``DEFAULT_PRAGMAS``. WAL lets
+the UI keep reading while the timer and sync worker write, and
+``busy_timeout`` makes a second writer wait instead of failing with
+"database is locked". The async (aiosqlite) engine gets the same tuning.
+Any PRAGMA can be overridden per engine or through an
+``SQLITE_<NAME>`` environment variable, e.g. ``SQLITE_SYNCHRONOUS=FULL``.
+"""
+import logging
+import os
+from typing import Dict, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    # Safe with WAL: a crash can lose the last commits but never corrupts
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,  # ms
+    "cache_size": -20000,  # negative means KiB, so ~20 MB
+    "mmap_size": 268435456,  # 256 MB
+    "temp_store": "MEMORY",
+}
+
+
+def pragmas_from_env(pragmas: Dict[str, object]) -> Dict[str, object]:
+    return {
+        name: os.getenv(f"SQLITE_{name.upper()}", value)
+        for name, value in pragmas.items()
+    }
+
+
+def apply_pragmas(dbapi_connection, pragmas: Dict[str, object]) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def _tune_connections(engine: Engine, pragmas: Dict[str, object]) -> None:
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        apply_pragmas(dbapi_connection, pragmas)
+
+
+def create_sqlite_engine(
+    url: str,
+    pragmas: Optional[Dict[str, object]] = None,
+    **kwargs,
+) -> Engine:
+    """Create an engine whose connections are tuned with ``pragmas``.
+
+    ``pragmas`` defaults to ``DEFAULT_PRAGMAS``; pass ``{}`` for SQLite's own
+    defaults. Extra keyword arguments go to ``create_engine``.
+    """
+    pragmas = pragmas_from_env(DEFAULT_PRAGMAS if pragmas is None else pragmas)
+    connect_args = {"check_same_thread": False, **kwargs.pop("connect_args", {})}
+    engine = create_engine(url, connect_args=connect_args, **kwargs)
+    _tune_connections(engine, pragmas)
+    logger.debug(f"SQLite engine for {url} with pragmas {pragmas}")
+    return engine
+
+
+def create_async_sqlite_engine(
+    url: str,
+    pragmas: Optional[Dict[str, object]] = None,
+    **kwargs,
+) -> AsyncEngine:
+    """Async counterpart of ``create_sqlite_engine`` for ``sqlite+aiosqlite`` URLs."""
+    pragmas = pragmas_from_env(DEFAULT_PRAGMAS if pragmas is None else pragmas)
+    engine = create_async_engine(url, **kwargs)
+    _tune_connections(engine.sync_engine, pragmas)
+    logger.debug(f"Async SQLite engine for {url} with pragmas {pragmas}")
+    return engine
+
+
+def async_url(url: str) -> str:
+    """Turn a ``sqlite:///`` URL into its ``sqlite+aiosqlite:///`` form."""
+    return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
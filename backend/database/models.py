@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Date, Time, Boolean, ForeignKey, Interval, Text, ARRAY, Float
+from sqlalchemy import Column, Integer, String, DateTime, Date, Time, Boolean, ForeignKey, Interval, Text, ARRAY, Float, Index, UniqueConstraint, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.dialects.postgresql import UUID
@@ -31,6 +31,11 @@ class Journal(Base):
 
 class DayPlan(Base):
     __tablename__ = 'day_plans'
+    __table_args__ = (
+        # Timeline of a day: WHERE date = ? ORDER BY start_time, end time included
+        Index("ix_day_plans_date_start_end", "date", "start_time", "end_time"),
+        Index("ix_day_plans_google_event_id", "google_event_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True)
@@ -56,8 +61,88 @@ class DayPlan(Base):
     @attendees.setter
     def attendees(self, value):
         self._attendees = json.dumps(value) if value else '[]'
+
+
+class RecurringPlan(Base):
+    """Template for a DayPlan that repeats; occurrences are expanded on read."""
+
+    __tablename__ = "recurring_plans"
+    __table_args__ = (Index("ix_recurring_plans_dtstart_ends_on", "dtstart", "ends_on"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    title = Column(String)
+    mode = Column(String)
+    rrule = Column(String, nullable=False)  # RFC 5545 RRULE value, e.g. "FREQ=WEEKLY;BYDAY=MO"
+    dtstart = Column(Date, nullable=False)  # Date of the first occurrence
+    ends_on = Column(Date, nullable=True)  # Date of the last occurrence; None repeats forever
+    start_time = Column(Time)
+    end_time = Column(Time)
+    location = Column(String)
+    description = Column(String)
+    _attendees = Column(String)  # Store as JSON string
+    google_event_id = Column(String, nullable=True, index=True)
+
+    exceptions = relationship(
+        "RecurringPlanException",
+        back_populates="recurring_plan",
+        cascade="all, delete-orphan",
+    )
+
+    @property
+    def attendees(self):
+        return json.loads(self._attendees) if self._attendees else []
+
+    @attendees.setter
+    def attendees(self, value):
+        self._attendees = json.dumps(value) if value else '[]'
+
+
+class RecurringPlanException(Base):
+    """An occurrence removed from its series (cancelled, or replaced by a DayPlan)."""
+
+    __tablename__ = "recurring_plan_exceptions"
+    __table_args__ = (UniqueConstraint("recurring_plan_id", "occurrence_date"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    recurring_plan_id = Column(Integer, ForeignKey("recurring_plans.id"), nullable=False)
+    occurrence_date = Column(Date, nullable=False)
+
+    recurring_plan = relationship("RecurringPlan", back_populates="exceptions")
+
+
+class CalendarSyncState(Base):
+    __tablename__ = "calendar_sync_state"
+
+    calendar_id = Column(String, primary_key=True)
+    sync_token = Column(String, nullable=True)  # Google Calendar nextSyncToken
+    last_synced_at = Column(DateTime, nullable=True)
+
+
+class CalendarOutbox(Base):
+    """Pending Google Calendar mutation, drained by the background sync worker."""
+
+    __tablename__ = "calendar_outbox"
+    __table_args__ = (
+        # The worker polls WHERE status = 'pending' AND next_attempt_at <= ?
+        Index("ix_calendar_outbox_status_next_attempt", "status", "next_attempt_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    # No foreign keys: delete operations outlive the plan row. Exactly one is set.
+    day_plan_id = Column(Integer, index=True, nullable=True)
+    recurring_plan_id = Column(Integer, index=True, nullable=True)
+    google_event_id = Column(String, nullable=True)
+    operation = Column(String, nullable=False)  # 'create', 'update' or 'delete'
+    status = Column(String, default="pending")  # 'pending', 'in_flight' or 'failed'
+    attempts = Column(Integer, default=0)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow)
+    last_error = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
 class Reminder(Base):
     __tablename__ = "reminders"
+    __table_args__ = (Index("ix_reminders_last_updated_id", "last_updated", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     content = Column(String)
@@ -65,6 +150,7 @@ class Reminder(Base):
 
 class Goal(Base):
     __tablename__ = "goals"
+    __table_args__ = (Index("ix_goals_date_id", "date", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     content = Column(String)
@@ -73,6 +159,10 @@ class Goal(Base):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Only the (few) open tasks, so queue lookups skip completed history
+        Index("ix_tasks_incomplete", "id", sqlite_where=text("is_complete = 0")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True)
@@ -82,6 +172,7 @@ class Task(Base):
     time_remaining_seconds = Column(Float)  # Store as seconds
     is_complete = Column(Boolean, default=False)
     completed_at = Column(DateTime, nullable=True)
+    running_since = Column(DateTime, nullable=True)  # Set while the timer runs
 
     subtasks = relationship(
         "SubTask",
@@ -164,7 +255,7 @@ class SubTask(Base):
     id = Column(Integer, primary_key=True, index=True)
     description = Column(String)
     completed = Column(Boolean, default=False)
-    task_id = Column(Integer, ForeignKey("tasks.id"))
+    task_id = Column(Integer, ForeignKey("tasks.id"), index=True)
 
     parent_task = relationship("Task", back_populates="subtasks")
 
@@ -173,7 +264,7 @@ class TaskExtension(Base):
     __tablename__ = "task_extensions"
 
     id = Column(Integer, primary_key=True, index=True)
-    task_id = Column(Integer, ForeignKey("tasks.id"))
+    task_id = Column(Integer, ForeignKey("tasks.id"), index=True)
     extension_length_seconds = Column(Float)  # Store as seconds
     extension_time = Column(DateTime, default=datetime.utcnow)
 
@@ -197,6 +288,7 @@ class TaskExtension(Base):
 
 class TaskOrder(Base):
     __tablename__ = "task_order"
+    __table_args__ = (Index("ix_task_order_order_task_id", "order", "task_id"),)
 
     task_id = Column(Integer, ForeignKey("tasks.id"), primary_key=True)
     order = Column(Integer, nullable=False)
@@ -229,6 +321,7 @@ class DailyProgress(Base):
 
 class JournalSection(Base):
     __tablename__ = "journal_sections"
+    __table_args__ = (Index("ix_journal_sections_journal_id_order", "journal_id", "order"),)
 
     id = Column(Integer, primary_key=True, index=True)
     journal_id = Column(Integer, ForeignKey("journals.id"))
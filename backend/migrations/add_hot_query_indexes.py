@@ -0,0 +1,33 @@
+from alembic import op
+import sqlalchemy as sa
+
+# (name, table, columns); see the __table_args__ in backend/database/models.py
+INDEXES = [
+    ("ix_day_plans_date_start_end", "day_plans", ["date", "start_time", "end_time"]),
+    ("ix_day_plans_google_event_id", "day_plans", ["google_event_id"]),
+    ("ix_task_order_order_task_id", "task_order", ["order", "task_id"]),
+    ("ix_subtasks_task_id", "subtasks", ["task_id"]),
+    ("ix_task_extensions_task_id", "task_extensions", ["task_id"]),
+    ("ix_journal_sections_journal_id_order", "journal_sections", ["journal_id", "order"]),
+    ("ix_reminders_last_updated_id", "reminders", ["last_updated", "id"]),
+    ("ix_goals_date_id", "goals", ["date", "id"]),
+    ("ix_calendar_outbox_status_next_attempt", "calendar_outbox", ["status", "next_attempt_at"]),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+    op.create_index(
+        "ix_tasks_incomplete", "tasks", ["id"], sqlite_where=sa.text("is_complete = 0")
+    )
+    # Superseded by ix_calendar_outbox_status_next_attempt
+    op.execute("DROP INDEX IF EXISTS ix_calendar_outbox_status")
+    op.execute("ANALYZE")
+
+
+def downgrade():
+    op.create_index("ix_calendar_outbox_status", "calendar_outbox", ["status"])
+    op.drop_index("ix_tasks_incomplete", table_name="tasks")
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
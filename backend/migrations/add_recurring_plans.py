@@ -0,0 +1,57 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.create_table(
+        "recurring_plans",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("title", sa.String()),
+        sa.Column("mode", sa.String()),
+        sa.Column("rrule", sa.String(), nullable=False),
+        sa.Column("dtstart", sa.Date(), nullable=False),
+        sa.Column("ends_on", sa.Date(), nullable=True),
+        sa.Column("start_time", sa.Time()),
+        sa.Column("end_time", sa.Time()),
+        sa.Column("location", sa.String()),
+        sa.Column("description", sa.String()),
+        sa.Column("_attendees", sa.String()),
+        sa.Column("google_event_id", sa.String(), nullable=True),
+    )
+    op.create_index("ix_recurring_plans_id", "recurring_plans", ["id"])
+    op.create_index(
+        "ix_recurring_plans_dtstart_ends_on", "recurring_plans", ["dtstart", "ends_on"]
+    )
+    op.create_index(
+        "ix_recurring_plans_google_event_id", "recurring_plans", ["google_event_id"]
+    )
+
+    op.create_table(
+        "recurring_plan_exceptions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "recurring_plan_id",
+            sa.Integer(),
+            sa.ForeignKey("recurring_plans.id"),
+            nullable=False,
+        ),
+        sa.Column("occurrence_date", sa.Date(), nullable=False),
+        sa.UniqueConstraint("recurring_plan_id", "occurrence_date"),
+    )
+    op.create_index(
+        "ix_recurring_plan_exceptions_id", "recurring_plan_exceptions", ["id"]
+    )
+
+    op.add_column(
+        "calendar_outbox", sa.Column("recurring_plan_id", sa.Integer(), nullable=True)
+    )
+    op.create_index(
+        "ix_calendar_outbox_recurring_plan_id", "calendar_outbox", ["recurring_plan_id"]
+    )
+
+
+def downgrade():
+    op.drop_index("ix_calendar_outbox_recurring_plan_id", table_name="calendar_outbox")
+    op.drop_column("calendar_outbox", "recurring_plan_id")
+    op.drop_table("recurring_plan_exceptions")
+    op.drop_table("recurring_plans")
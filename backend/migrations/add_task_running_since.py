@@ -0,0 +1,10 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.add_column("tasks", sa.Column("running_since", sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column("tasks", "running_since")
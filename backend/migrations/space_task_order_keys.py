@@ -0,0 +1,28 @@
+from alembic import op
+import sqlalchemy as sa
+
+# Must match backend.services.task_order.ORDER_GAP
+ORDER_GAP = 1024
+
+
+def _renumber(step):
+    bind = op.get_bind()
+    task_ids = [
+        row.task_id
+        for row in bind.execute(
+            sa.text('SELECT task_id FROM task_order ORDER BY "order", task_id')
+        )
+    ]
+    for rank, task_id in enumerate(task_ids, start=1):
+        bind.execute(
+            sa.text('UPDATE task_order SET "order" = :order WHERE task_id = :task_id'),
+            {"order": rank * step, "task_id": task_id},
+        )
+
+
+def upgrade():
+    _renumber(ORDER_GAP)
+
+
+def downgrade():
+    _renumber(1)
@@ -1,18 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from backend.database.database import get_db
-from backend.database.models import DayPlan, DailyRecord
-from typing import List, Optional
+from backend.database.database import get_async_db, get_db
+from backend.database.models import DayPlan, DailyRecord, RecurringPlan, RecurringPlanException
+from backend.services import recurrence
+from backend.services.activity_timeline import invalidate_timeline
+from backend.services.calendar_outbox import calendar_worker, enqueue
+from typing import Annotated, Dict, List, Literal, Optional, Union
 from pydantic import BaseModel, Field
-from datetime import date, time, datetime
-from sqlalchemy import func
+from datetime import date, time, datetime, timedelta
+import datetime as dt
+from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
 import logging
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-from zoneinfo import ZoneInfo
-import json
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -20,20 +20,10 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# If modifying these scopes, delete the file token.json.
-SCOPES = ["https://www.googleapis.com/auth/calendar"]
-
-CLIENT_SECRETS_FILE = "credentials.env"
-
-
-def get_calendar_service():
-    try:
-        with open("token.json", "r") as token_file:
-            creds_data = json.load(token_file)
-        creds = Credentials.from_authorized_user_file("token.json", SCOPES)
-        return build("calendar", "v3", credentials=creds)
-    except FileNotFoundError:
-        raise HTTPException(status_code=401, detail="Authentication required")
+# Widest span a single GET /dayplans may ask for
+MAX_RANGE_DAYS = 62
+# Most operations accepted by one POST /dayplans/batch
+MAX_BATCH_OPERATIONS = 200
 
 
 class DayPlanBase(BaseModel):
@@ -51,6 +41,8 @@ class DayPlanBase(BaseModel):
 class DayPlanCreate(BaseModel):
     title: str
     mode: str
+    # dt.date: a bare ``date`` here would resolve to the field's None default
+    date: Optional[dt.date] = None  # Defaults to today
     start_time: time
     end_time: time
     location: Optional[str] = None
@@ -65,7 +57,7 @@ class DayPlanCreate(BaseModel):
 class DayPlanUpdate(BaseModel):
     title: Optional[str] = None
     mode: Optional[str] = None
-    date: Optional[date] = None
+    date: Optional[dt.date] = None
     start_time: Optional[time] = None
     end_time: Optional[time] = None
     location: Optional[str] = None
@@ -75,113 +67,117 @@ class DayPlanUpdate(BaseModel):
 
 
 class DayPlanResponse(DayPlanBase):
-    id: int
-    daily_record_id: int
+    # Occurrences of a recurring plan have no row, so no id or daily record
+    id: Optional[int] = None
+    daily_record_id: Optional[int] = None
+    recurring_plan_id: Optional[int] = None
     mode: str  # Make this required
 
     class Config:
         orm_mode = True
 
 
-def sync_with_google_calendar(
-    db: Session, day_plan: DayPlan, service, operation="create"
-):
-    time_zone = "America/Los_Angeles"  # Replace with your desired time zone
-    event = {
-        "summary": day_plan.title,
-        "location": day_plan.location,
-        "description": day_plan.description,
-        "start": {
-            "dateTime": datetime.combine(day_plan.date, day_plan.start_time)
-            .replace(tzinfo=ZoneInfo(time_zone))
-            .isoformat(),
-            "timeZone": time_zone,
-        },
-        "end": {
-            "dateTime": datetime.combine(day_plan.date, day_plan.end_time)
-            .replace(tzinfo=ZoneInfo(time_zone))
-            .isoformat(),
-            "timeZone": time_zone,
-        },
-        "attendees": [{"email": attendee} for attendee in (day_plan.attendees or [])],
-        "extendedProperties": {"private": {"mode": day_plan.mode}},
-    }
+class RecurringPlanCreate(BaseModel):
+    title: str
+    mode: str
+    rrule: str  # RFC 5545 RRULE value, e.g. "FREQ=WEEKLY;BYDAY=MO,WE,FR"
+    start_date: Optional[date] = None  # First possible occurrence; defaults to today
+    start_time: time
+    end_time: time
+    location: Optional[str] = None
+    description: Optional[str] = None
+    attendees: Optional[List[str]] = Field(default_factory=list)
 
-    try:
-        if operation == "create":
-            created_event = (
-                service.events().insert(calendarId="primary", body=event).execute()
-            )
-            day_plan.google_event_id = created_event["id"]
-            db.commit()
-            logger.info(
-                f"Created Google Calendar event with ID: {created_event['id']} and mode: {day_plan.mode}"
-            )
-        elif operation == "update":
-            if not day_plan.google_event_id:
-                logger.error(
-                    f"Attempted to update event without google_event_id: {day_plan.id}"
-                )
-                raise ValueError("Cannot update event: missing google_event_id")
-            service.events().update(
-                calendarId="primary",
-                eventId=day_plan.google_event_id,
-                body=event,
-            ).execute()
-            logger.info(
-                f"Updated Google Calendar event with ID: {day_plan.google_event_id} and mode: {day_plan.mode}"
-            )
-        elif operation == "delete":
-            if not day_plan.google_event_id:
-                logger.error(
-                    f"Attempted to delete event without google_event_id: {day_plan.id}"
-                )
-                raise ValueError("Cannot delete event: missing google_event_id")
-            service.events().delete(
-                calendarId="primary", eventId=day_plan.google_event_id
-            ).execute()
-            logger.info(
-                f"Deleted Google Calendar event with ID: {day_plan.google_event_id}"
-            )
-    except HttpError as error:
-        logger.error(f"An error occurred with Google Calendar API: {error}")
-        raise HTTPException(
-            status_code=500, detail=f"Google Calendar API error: {str(error)}"
-        )
+    class Config:
+        extra = "forbid"
+
+
+class RecurringPlanResponse(BaseModel):
+    id: int
+    title: str
+    mode: str
+    rrule: str
+    dtstart: date
+    ends_on: Optional[date] = None
+    start_time: time
+    end_time: time
+    location: Optional[str] = None
+    description: Optional[str] = None
+    attendees: List[str] = []
+
+    class Config:
+        orm_mode = True
+
+
+def get_or_create_daily_record(
+    db: Session, day: date, cache: Optional[Dict[date, DailyRecord]] = None
+) -> DailyRecord:
+    if cache is not None and day in cache:
+        return cache[day]
+    daily_record = db.query(DailyRecord).filter(DailyRecord.date == day).first()
+    if not daily_record:
+        daily_record = DailyRecord(date=day)
+        db.add(daily_record)
+        db.flush()
+    if cache is not None:
+        cache[day] = daily_record
+    return daily_record
+
+
+def create_plan(db: Session, day_plan: DayPlanCreate, daily_records=None) -> DayPlan:
+    plan_date = day_plan.date or date.today()
+    new_day_plan = DayPlan(
+        title=day_plan.title,
+        mode=day_plan.mode,
+        description=day_plan.description,
+        date=plan_date,
+        start_time=day_plan.start_time,
+        end_time=day_plan.end_time,
+        location=day_plan.location,
+        attendees=day_plan.attendees,
+        status=day_plan.status,
+        daily_record_id=get_or_create_daily_record(db, plan_date, daily_records).id,
+    )
+    db.add(new_day_plan)
+    db.flush()
+    # Pushed to Google Calendar by the background worker
+    enqueue(db, "create", new_day_plan)
+    return new_day_plan
+
+
+def update_plan(
+    db: Session, db_day_plan: DayPlan, day_plan_update: DayPlanUpdate, daily_records=None
+) -> DayPlan:
+    update_data = day_plan_update.dict(exclude_unset=True)
+    if "attendees" in update_data:
+        update_data["attendees"] = update_data["attendees"] or []
+    if update_data.get("date") and update_data["date"] != db_day_plan.date:
+        db_day_plan.daily_record_id = get_or_create_daily_record(
+            db, update_data["date"], daily_records
+        ).id
+    for key, value in update_data.items():
+        setattr(db_day_plan, key, value)
+    enqueue(db, "update", db_day_plan)
+    return db_day_plan
+
+
+def delete_plan(db: Session, db_day_plan: DayPlan) -> None:
+    # Queue the Google Calendar deletion (a no-op if the event was never pushed)
+    enqueue(db, "delete", db_day_plan)
+    db.delete(db_day_plan)
 
 
 @router.post("/dayplans", response_model=DayPlanResponse)
 def add_day_plan(day_plan: DayPlanCreate, db: Session = Depends(get_db)):
     try:
-        today = date.today()
-        daily_record = db.query(DailyRecord).filter(DailyRecord.date == today).first()
-        if not daily_record:
-            daily_record = DailyRecord(date=today)
-            db.add(daily_record)
-            db.commit()
-
-        new_day_plan = DayPlan(
-            title=day_plan.title,
-            mode=day_plan.mode,
-            description=day_plan.description,
-            date=today,
-            start_time=day_plan.start_time,
-            end_time=day_plan.end_time,
-            location=day_plan.location,
-            attendees=day_plan.attendees,
-            status=day_plan.status,
-            daily_record_id=daily_record.id,
-        )
-        db.add(new_day_plan)
+        new_day_plan = create_plan(db, day_plan)
         db.commit()
         db.refresh(new_day_plan)
+        invalidate_timeline()
+        calendar_worker.wake()
 
         logger.info(f"Adding day plan with mode: {day_plan.mode}")
 
-        # Sync with Google Calendar
-        service = get_calendar_service()
-        sync_with_google_calendar(db, new_day_plan, service, "create")
-
         return new_day_plan
     except SQLAlchemyError as e:
         db.rollback()
@@ -198,22 +194,13 @@ def update_day_plan(
         if db_day_plan is None:
             raise HTTPException(status_code=404, detail="Day plan not found")
 
-        update_data = day_plan_update.dict(exclude_unset=True)
-        if "attendees" in update_data:
-            update_data["attendees"] = update_data["attendees"] or []
-        for key, value in update_data.items():
-            setattr(db_day_plan, key, value)
-
+        update_plan(db, db_day_plan, day_plan_update)
         db.commit()
         db.refresh(db_day_plan)
+        invalidate_timeline()
+        calendar_worker.wake()
 
-        logger.info(
-            f"Updating day plan {day_plan_id} with mode: {update_data.get('mode', 'unchanged')}"
-        )
-
-        # Sync with Google Calendar
-        service = get_calendar_service()
-        sync_with_google_calendar(db, db_day_plan, service, "update")
+        logger.info(f"Updating day plan {day_plan_id} with mode: {db_day_plan.mode}")
 
         return db_day_plan
     except SQLAlchemyError as e:
@@ -223,77 +210,44 @@ def update_day_plan(
 
 
 @router.get("/dayplans", response_model=List[DayPlanResponse])
-def get_day_plans(db: Session = Depends(get_db)):
+async def get_day_plans(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Plans from ``start`` to ``end`` inclusive, ordered by date and start time.
+
+    Both default to today; with only ``start`` a single day is returned.
+    Occurrences of recurring plans are expanded into the range.
+    """
+    today = date.today()
+    start = start or today
+    end = end or start
+    if end < start:
+        raise HTTPException(status_code=422, detail="end must not be before start")
+    if end - start >= timedelta(days=MAX_RANGE_DAYS):
+        raise HTTPException(
+            status_code=422, detail=f"A range may span at most {MAX_RANGE_DAYS} days"
+        )
+
     try:
-        today = date.today()
-        logger.info(f"Fetching day plans for today: {today}")
+        logger.info(f"Fetching day plans from {start} to {end}")
 
         # Ensure we have a DailyRecord for today
-        daily_record = db.query(DailyRecord).filter(DailyRecord.date == today).first()
-        if not daily_record:
-            daily_record = DailyRecord(date=today)
-            db.add(daily_record)
-            db.commit()
-            db.refresh(daily_record)
-
-        day_plans = (
-            db.query(DayPlan)
-            .filter(func.date(DayPlan.date) == today)
-            .order_by(DayPlan.start_time)
-            .all()
-        )
-
-        # Sync with Google Calendar
-        service = get_calendar_service()
-        start_of_day = datetime.combine(today, time.min).isoformat() + "Z"
-        end_of_day = datetime.combine(today, time.max).isoformat() + "Z"
-        events_result = (
-            service.events()
-            .list(
-                calendarId="primary",
-                timeMin=start_of_day,
-                timeMax=end_of_day,
-                singleEvents=True,
-                orderBy="startTime",
+        if start <= today <= end:
+            daily_record = await db.scalar(
+                select(DailyRecord).filter(DailyRecord.date == today)
             )
-            .execute()
-        )
-        events = events_result.get("items", [])
+            if not daily_record:
+                db.add(DailyRecord(date=today))
+                await db.commit()
 
-        # Update local database with new events from Google Calendar
-        for event in events:
-            existing_plan = next(
-                (plan for plan in day_plans if plan.google_event_id == event["id"]),
-                None,
-            )
-            if not existing_plan:
-                # Retrieve the mode from extended properties
-                mode = (
-                    event.get("extendedProperties", {})
-                    .get("private", {})
-                    .get("mode", "event")
-                )
-                new_plan = DayPlan(
-                    title=event["summary"],
-                    description=event.get("description", ""),
-                    date=today,
-                    start_time=datetime.fromisoformat(
-                        event["start"]["dateTime"]
-                    ).time(),
-                    end_time=datetime.fromisoformat(event["end"]["dateTime"]).time(),
-                    location=event.get("location", ""),
-                    attendees=[
-                        attendee["email"] for attendee in event.get("attendees", [])
-                    ],
-                    google_event_id=event["id"],
-                    daily_record_id=daily_record.id,
-                    mode=mode,  # Set the mode here
-                )
-                db.add(new_plan)
-                day_plans.append(new_plan)
+        # Google Calendar changes are pulled by the background worker; this
+        # request only reads local rows
+        calendar_worker.request_pull()
 
-        db.commit()
-        logger.info(f"Found {len(day_plans)} day plans for today")
+        day_plans = await db.run_sync(recurrence.schedule_between, start, end)
+        logger.info(f"Found {len(day_plans)} day plans")
 
         return day_plans
     except SQLAlchemyError as e:
@@ -313,20 +267,10 @@ def delete_day_plan(day_plan_id: int, db: Session = Depends(get_db)):
         if db_day_plan is None:
             raise HTTPException(status_code=404, detail="Day plan not found")
 
-        # Sync with Google Calendar only if google_event_id exists
-        if db_day_plan.google_event_id:
-            try:
-                service = get_calendar_service()
-                sync_with_google_calendar(db, db_day_plan, service, "delete")
-            except ValueError as e:
-                logger.warning(f"Failed to delete Google Calendar event: {str(e)}")
-        else:
-            logger.info(
-                f"Day plan {day_plan_id} has no associated Google Calendar event. Skipping Google Calendar sync."
-            )
-
-        db.delete(db_day_plan)
+        delete_plan(db, db_day_plan)
         db.commit()
+        invalidate_timeline()
+        calendar_worker.wake()
         return {"message": "Day plan deleted successfully"}
     except SQLAlchemyError as e:
         db.rollback()
@@ -339,6 +283,120 @@ def delete_day_plan(day_plan_id: int, db: Session = Depends(get_db)):
         )
 
 
+class BatchCreate(BaseModel):
+    op: Literal["create"]
+    plan: DayPlanCreate
+
+
+class BatchUpdate(BaseModel):
+    op: Literal["update"]
+    id: int
+    changes: DayPlanUpdate
+
+
+class BatchDelete(BaseModel):
+    op: Literal["delete"]
+    id: int
+
+
+class DayPlanBatch(BaseModel):
+    operations: List[
+        Annotated[Union[BatchCreate, BatchUpdate, BatchDelete], Field(discriminator="op")]
+    ]
+    # Apply nothing unless every operation succeeds
+    atomic: bool = False
+
+
+class BatchResult(BaseModel):
+    index: int
+    op: str
+    status: int  # HTTP-style status of this operation
+    id: Optional[int] = None
+    plan: Optional[DayPlanResponse] = None
+    error: Optional[str] = None
+
+
+class DayPlanBatchResponse(BaseModel):
+    results: List[BatchResult]
+
+
+@router.post("/dayplans/batch", response_model=DayPlanBatchResponse)
+def batch_day_plans(batch: DayPlanBatch, db: Session = Depends(get_db)):
+    """Apply creates, updates and deletes in one transaction.
+
+    Each operation gets its own result; a missing plan fails only that
+    operation unless ``atomic`` is set. DailyRecords are looked up once per
+    date, and the calendar worker is woken once to push every change in a
+    single Google batch request.
+    """
+    if len(batch.operations) > MAX_BATCH_OPERATIONS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"A batch may contain at most {MAX_BATCH_OPERATIONS} operations",
+        )
+
+    ids = {op.id for op in batch.operations if op.op != "create"}
+    existing = {p.id: p for p in db.query(DayPlan).filter(DayPlan.id.in_(ids))} if ids else {}
+    daily_records = {}
+    results = []
+    applied = []
+    try:
+        for index, operation in enumerate(batch.operations):
+            if operation.op == "create":
+                plan = create_plan(db, operation.plan, daily_records)
+                applied.append((index, plan))
+                results.append(BatchResult(index=index, op="create", status=200, id=plan.id))
+                continue
+
+            plan = existing.get(operation.id)
+            if plan is None:
+                results.append(
+                    BatchResult(
+                        index=index,
+                        op=operation.op,
+                        status=404,
+                        id=operation.id,
+                        error="Day plan not found",
+                    )
+                )
+                continue
+            if operation.op == "update":
+                update_plan(db, plan, operation.changes, daily_records)
+                applied.append((index, plan))
+            else:
+                delete_plan(db, plan)
+                del existing[operation.id]
+            results.append(BatchResult(index=index, op=operation.op, status=200, id=plan.id))
+
+        failed = [r for r in results if r.status != 200]
+        if batch.atomic and failed:
+            db.rollback()
+            raise HTTPException(
+                status_code=409,
+                detail={
+                    "message": "Batch rolled back",
+                    "results": [r.model_dump() for r in results],
+                },
+            )
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Database error in batch_day_plans: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+    for index, plan in applied:
+        if plan in db:
+            db.refresh(plan)
+            results[index].plan = DayPlanResponse.model_validate(plan, from_attributes=True)
+    if len(failed) < len(results):
+        invalidate_timeline()
+        calendar_worker.wake()
+    logger.info(
+        f"Applied day plan batch: {len(results) - len(failed)} of {len(results)} operations"
+    )
+    return DayPlanBatchResponse(results=results)
+
+
 class IsWorkingResponse(BaseModel):
     is_working: bool
     current_plan: Optional[DayPlanResponse] = None
@@ -351,17 +409,7 @@ def get_current_event(db: Session = Depends(get_db)):
         today = now.date()
         current_time = now.time()
 
-        current_event = (
-            db.query(DayPlan)
-            .filter(
-                func.date(DayPlan.date) == today,
-                DayPlan.start_time <= current_time,
-                DayPlan.end_time > current_time,
-            )
-            .first()
-        )
-
-        return current_event
+        return recurrence.schedule_at(db, today, current_time)
     except SQLAlchemyError as e:
         logger.error(f"Database error in get_current_event: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
@@ -370,3 +418,133 @@ def get_current_event(db: Session = Depends(get_db)):
         raise HTTPException(
             status_code=500, detail=f"An unexpected error occurred: {str(e)}"
         )
+
+
+@router.post("/recurring-plans", response_model=RecurringPlanResponse)
+def add_recurring_plan(plan: RecurringPlanCreate, db: Session = Depends(get_db)):
+    dtstart = plan.start_date or date.today()
+    try:
+        ends_on = recurrence.last_occurrence(plan.rrule, dtstart)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid rrule: {e}")
+
+    recurring_plan = RecurringPlan(
+        title=plan.title,
+        mode=plan.mode,
+        rrule=plan.rrule.strip().removeprefix("RRULE:"),
+        dtstart=dtstart,
+        ends_on=ends_on,
+        start_time=plan.start_time,
+        end_time=plan.end_time,
+        location=plan.location,
+        description=plan.description,
+        attendees=plan.attendees,
+    )
+    db.add(recurring_plan)
+    db.flush()
+    # Pushed as a single recurring Google Calendar event
+    enqueue(db, "create", recurring_plan)
+    db.commit()
+    db.refresh(recurring_plan)
+    invalidate_timeline()
+    calendar_worker.wake()
+    logger.info(f"Adding recurring plan {recurring_plan.id}: {recurring_plan.rrule}")
+    return recurring_plan
+
+
+@router.get("/recurring-plans", response_model=List[RecurringPlanResponse])
+def get_recurring_plans(db: Session = Depends(get_db)):
+    return db.query(RecurringPlan).order_by(RecurringPlan.id).all()
+
+
+def get_recurring_plan_or_404(db: Session, recurring_plan_id: int) -> RecurringPlan:
+    recurring_plan = db.get(RecurringPlan, recurring_plan_id)
+    if recurring_plan is None:
+        raise HTTPException(status_code=404, detail="Recurring plan not found")
+    return recurring_plan
+
+
+def skip_occurrence(db: Session, recurring_plan: RecurringPlan, occurrence_date: date):
+    """Remove one occurrence from the series (idempotent)."""
+    if not recurrence.is_occurrence(recurring_plan, occurrence_date):
+        raise HTTPException(
+            status_code=404, detail=f"No occurrence on {occurrence_date.isoformat()}"
+        )
+    if all(e.occurrence_date != occurrence_date for e in recurring_plan.exceptions):
+        recurring_plan.exceptions.append(
+            RecurringPlanException(occurrence_date=occurrence_date)
+        )
+    enqueue(db, "update", recurring_plan)
+
+
+@router.delete("/recurring-plans/{recurring_plan_id}", response_model=dict)
+def delete_recurring_plan(recurring_plan_id: int, db: Session = Depends(get_db)):
+    recurring_plan = get_recurring_plan_or_404(db, recurring_plan_id)
+    enqueue(db, "delete", recurring_plan)
+    db.delete(recurring_plan)
+    db.commit()
+    invalidate_timeline()
+    calendar_worker.wake()
+    return {"message": "Recurring plan deleted successfully"}
+
+
+@router.delete(
+    "/recurring-plans/{recurring_plan_id}/occurrences/{occurrence_date}", response_model=dict
+)
+def cancel_occurrence(
+    recurring_plan_id: int, occurrence_date: date, db: Session = Depends(get_db)
+):
+    recurring_plan = get_recurring_plan_or_404(db, recurring_plan_id)
+    skip_occurrence(db, recurring_plan, occurrence_date)
+    db.commit()
+    invalidate_timeline()
+    calendar_worker.wake()
+    return {"message": "Occurrence cancelled successfully"}
+
+
+@router.put(
+    "/recurring-plans/{recurring_plan_id}/occurrences/{occurrence_date}",
+    response_model=DayPlanResponse,
+)
+def update_occurrence(
+    recurring_plan_id: int,
+    occurrence_date: date,
+    day_plan_update: DayPlanUpdate,
+    db: Session = Depends(get_db),
+):
+    """Edit one occurrence: it leaves the series and becomes a one-off DayPlan."""
+    recurring_plan = get_recurring_plan_or_404(db, recurring_plan_id)
+    if any(e.occurrence_date == occurrence_date for e in recurring_plan.exceptions):
+        # Detaching it again would duplicate the block
+        raise HTTPException(
+            status_code=409,
+            detail=(
+                f"The occurrence on {occurrence_date.isoformat()} has already left the "
+                "series; edit its DayPlan instead"
+            ),
+        )
+    skip_occurrence(db, recurring_plan, occurrence_date)
+
+    fields = {
+        "title": recurring_plan.title,
+        "mode": recurring_plan.mode,
+        "date": occurrence_date,
+        "start_time": recurring_plan.start_time,
+        "end_time": recurring_plan.end_time,
+        "location": recurring_plan.location,
+        "description": recurring_plan.description,
+        "attendees": recurring_plan.attendees,
+    }
+    fields.update(day_plan_update.dict(exclude_unset=True))
+    fields["attendees"] = fields["attendees"] or []
+    day_plan = DayPlan(
+        daily_record_id=get_or_create_daily_record(db, fields["date"]).id, **fields
+    )
+    db.add(day_plan)
+    db.flush()
+    enqueue(db, "create", day_plan)
+    db.commit()
+    db.refresh(day_plan)
+    invalidate_timeline()
+    calendar_worker.wake()
+    return day_plan
@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from backend.database.database import get_db
 from backend.database.models import Journal, JournalSection, DailyRecord
-from typing import List, Dict
+from backend.services.pagination import NDJSON_MEDIA_TYPE, iter_ndjson, paginate
+from typing import List, Dict, Optional
+import json
 from pydantic import BaseModel
 from datetime import datetime, date
 
@@ -24,6 +28,28 @@ class JournalDetailResponse(BaseModel):
 class JournalCreate(BaseModel):
     sections: List[Dict[str, str]]
 
+JOURNALS_KEY = (Journal.exact_time, Journal.id)
+
+
+def journal_sort_key(journal: Journal):
+    return journal.exact_time, journal.id
+
+
+@router.get("/journals/export")
+def export_journals(db: Session = Depends(get_db)):
+    """Every journal (newest first) as NDJSON; declared before /journals/{journal_id}."""
+    return StreamingResponse(
+        iter_ndjson(
+            db.get_bind(),
+            select(Journal),
+            JOURNALS_KEY,
+            journal_sort_key,
+            lambda j: json.dumps({"id": j.id, "date": j.exact_time.isoformat()}),
+            descending=True,
+        ),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
 @router.get("/journals/{journal_id}", response_model=JournalDetailResponse)
 def get_journal(journal_id: int, db: Session = Depends(get_db)):
     journal = db.query(Journal).filter(Journal.id == journal_id).first()
@@ -41,8 +67,24 @@ def get_journal(journal_id: int, db: Session = Depends(get_db)):
     }
 
 @router.get("/journals", response_model=List[JournalResponse])
-def get_all_journals(db: Session = Depends(get_db)):
-    journals = db.query(Journal).order_by(Journal.exact_time.desc()).all()
+def get_all_journals(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    db: Session = Depends(get_db),
+):
+    """Newest journals first; the next page's cursor is in ``X-Next-Cursor``."""
+    journals = paginate(
+        db,
+        select(Journal),
+        JOURNALS_KEY,
+        journal_sort_key,
+        (datetime.fromisoformat, int),
+        cursor,
+        limit,
+        response,
+        descending=True,
+    )
     return [{"id": j.id, "date": j.exact_time} for j in journals]
 
 @router.post("/journals")
@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from backend.database.database import get_db
+from backend.services.calendar_service import calendar_service_stats
+from backend.services.query_profiler import SLOW_QUERY_MS, route_stats
+
+router = APIRouter()
+
+
+@router.get("/health")
+def get_health(db: Session = Depends(get_db)):
+    """Readiness check: the app has started and the database answers."""
+    db.execute(text("SELECT 1"))
+    return {"status": "ok"}
+
+
+@router.get("/_metrics")
+def get_metrics():
+    """SQL statement counts and timings per route, plus client cache stats."""
+    return {
+        "slow_query_ms": SLOW_QUERY_MS,
+        "routes": route_stats(),
+        "calendar_service_cache": calendar_service_stats(),
+    }
@@ -1,12 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, select
 from datetime import datetime, date
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel
 
 from backend.database.database import get_db
 from backend.database.models import Reminder, Goal
+from backend.services.pagination import NDJSON_MEDIA_TYPE, iter_ndjson, paginate
 
 
 router = APIRouter()
@@ -68,19 +70,77 @@ def get_latest_notes(db: Session = Depends(get_db)):
     }
 
 
+REMINDERS_KEY = (Reminder.last_updated, Reminder.id)
+GOALS_KEY = (Goal.date, Goal.id)
+
+
 @router.get("/reminders", response_model=List[ReminderResponse])
-def get_Reminders(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
-    Reminders = (
-        db.query(Reminder)
-        .order_by(desc(Reminder.last_updated))
-        .offset(skip)
-        .limit(limit)
-        .all()
+def get_Reminders(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = 10,
+    db: Session = Depends(get_db),
+):
+    """Newest reminders first; the next page's cursor is in ``X-Next-Cursor``."""
+    return paginate(
+        db,
+        select(Reminder),
+        REMINDERS_KEY,
+        lambda r: (r.last_updated, r.id),
+        (datetime.fromisoformat, int),
+        cursor,
+        limit,
+        response,
+        descending=True,
+    )
+
+
+@router.get("/reminders/export")
+def export_reminders(db: Session = Depends(get_db)):
+    return StreamingResponse(
+        iter_ndjson(
+            db.get_bind(),
+            select(Reminder),
+            REMINDERS_KEY,
+            lambda r: (r.last_updated, r.id),
+            lambda r: ReminderResponse.from_orm(r).json(),
+            descending=True,
+        ),
+        media_type=NDJSON_MEDIA_TYPE,
     )
-    return Reminders
 
 
 @router.get("/goals", response_model=List[GoalResponse])
-def get_goals(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
-    goals = db.query(Goal).order_by(desc(Goal.date)).offset(skip).limit(limit).all()
-    return goals
+def get_goals(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = 10,
+    db: Session = Depends(get_db),
+):
+    """Newest goals first; the next page's cursor is in ``X-Next-Cursor``."""
+    return paginate(
+        db,
+        select(Goal),
+        GOALS_KEY,
+        lambda g: (g.date, g.id),
+        (date.fromisoformat, int),
+        cursor,
+        limit,
+        response,
+        descending=True,
+    )
+
+
+@router.get("/goals/export")
+def export_goals(db: Session = Depends(get_db)):
+    return StreamingResponse(
+        iter_ndjson(
+            db.get_bind(),
+            select(Goal),
+            GOALS_KEY,
+            lambda g: (g.date, g.id),
+            lambda g: GoalResponse.from_orm(g).json(),
+            descending=True,
+        ),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
@@ -1,10 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from backend.database.database import get_db
-from backend.database.models import DailyProgress, DayPlan, Task, TaskOrder
-from datetime import date, datetime, time
+from backend.database.database import get_async_db, get_db, get_session_scope
+from backend.database.models import DailyProgress, Task, TaskOrder
+from backend.services.activity_events import activity_changed, notify_activity_changed
+from backend.services.activity_timeline import get_timeline
+from backend.services import task_order
+from datetime import date, datetime, time, timedelta
 from pydantic import BaseModel
 from typing import Optional, List
+import asyncio
 import logging
 from tzlocal import get_localzone
 
@@ -13,6 +20,10 @@ logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger("uvicorn")
 logger.setLevel(logging.DEBUG)
 
+# Streams send an SSE comment at least this often so clients can tell a quiet
+# connection from a dead one.
+HEARTBEAT_SECONDS = 15
+
 
 class CurrentActivityResponse(BaseModel):
     activity_type: str  # 'event', 'habit_page', 'queue', or 'schedule'
@@ -25,7 +36,7 @@ class SetPageRequest(BaseModel):
 
 
 class DayPlanResponse(BaseModel):
-    id: int
+    id: Optional[int] = None  # None for an occurrence of a recurring plan
     title: str
     mode: str
     date: date
@@ -35,25 +46,21 @@ class DayPlanResponse(BaseModel):
     status: Optional[str] = None
     description: Optional[str] = None
     attendees: Optional[List[str]] = None
+    recurring_plan_id: Optional[int] = None
 
 
 @router.get("/current-activity", response_model=CurrentActivityResponse)
-def get_current_activity(db: Session = Depends(get_db)):
-    local_tz = get_localzone()
-    now = datetime.now(local_tz)
+async def get_current_activity(db: AsyncSession = Depends(get_async_db)):
+    # Runs the sync logic on the event loop over aiosqlite, not in the threadpool
+    return await db.run_sync(compute_current_activity, datetime.now(get_localzone()))
+
+
+def compute_current_activity(db: Session, now: datetime) -> CurrentActivityResponse:
     current_date = now.date()
     current_time = now.time()
     logger.info(f"Current time: {current_time}")
 
-    current_day_plan = (
-        db.query(DayPlan)
-        .filter(
-            DayPlan.date == current_date,
-            DayPlan.start_time <= current_time,
-            DayPlan.end_time > current_time,
-        )
-        .first()
-    )
+    current_day_plan = get_timeline(db, current_date).block_at(current_time)
 
     if current_day_plan and current_day_plan.mode != "work":
         logger.debug(f"Current event exists: {current_day_plan.title}")
@@ -99,6 +106,7 @@ def create_event_response(day_plan):
             status=day_plan.status,
             description=day_plan.description,
             attendees=day_plan.attendees,
+            recurring_plan_id=day_plan.recurring_plan_id,
         ).dict(),
     )
 
@@ -110,28 +118,94 @@ def set_current_page(request: SetPageRequest, db: Session = Depends(get_db)):
     daily_progress.current_page = request.page_number
     db.commit()
     db.refresh(daily_progress)
+    notify_activity_changed()
 
     return CurrentActivityResponse(
         activity_type="habit_page", page_number=daily_progress.current_page
     )
 
 
-def process_event(db: Session, day_plan: DayPlan, now: datetime):
+def next_activity_transition(db: Session, now: datetime) -> datetime:
+    """Return the next moment the current DayPlan block changes (or midnight)."""
+    next_time = get_timeline(db, now.date()).next_transition(now.time())
+    if next_time is None:
+        return datetime.combine(now.date() + timedelta(days=1), time.min, now.tzinfo)
+    return datetime.combine(now.date(), next_time, now.tzinfo)
+
+
+def evaluate_activity(session_scope):
+    with session_scope() as db:
+        now = datetime.now(get_localzone())
+        activity = compute_current_activity(db, now)
+        return activity, next_activity_transition(db, now)
+
+
+async def activity_event_stream(session_scope, is_disconnected):
+    """Yield an SSE event whenever the current activity changes.
+
+    The activity is re-evaluated only when a DayPlan boundary is crossed or
+    a handler reports a change through ``notify_activity_changed``.
+    """
+    changed = activity_changed.subscribe()
+    last_payload = None
+    try:
+        while not await is_disconnected():
+            changed.clear()
+            activity, next_transition = await run_in_threadpool(
+                evaluate_activity, session_scope
+            )
+            payload = activity.json()
+            if payload != last_payload:
+                last_payload = payload
+                yield f"event: activity\ndata: {payload}\n\n"
+
+            while True:
+                until_transition = (
+                    next_transition - datetime.now(next_transition.tzinfo)
+                ).total_seconds()
+                if until_transition <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(
+                        changed.wait(), min(HEARTBEAT_SECONDS, until_transition)
+                    )
+                    break
+                except asyncio.TimeoutError:
+                    if until_transition > HEARTBEAT_SECONDS:
+                        yield ": keep-alive\n\n"
+                        if await is_disconnected():
+                            return
+    finally:
+        activity_changed.unsubscribe(changed)
+
+
+@router.get("/current-activity/stream")
+async def stream_current_activity(
+    request: Request, session_scope=Depends(get_session_scope)
+):
+    return StreamingResponse(
+        activity_event_stream(session_scope, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+def process_event(db: Session, day_plan, now: datetime):
     existing_task = db.query(Task).filter(Task.title == day_plan.title).first()
     if not existing_task:
+        start = datetime.combine(day_plan.date, day_plan.start_time, now.tzinfo)
+        end = datetime.combine(day_plan.date, day_plan.end_time, now.tzinfo)
         new_task = Task(
             title=day_plan.title,
             description=day_plan.description or "",
-            original_length=(day_plan.end_time - day_plan.start_time).seconds,
-            time_remaining=(day_plan.end_time - now.time()).seconds,
+            original_length=end - start,
+            time_remaining=end - now,
             time_created=now,
         )
         db.add(new_task)
         db.flush()
 
-        max_order = db.query(TaskOrder).count()
-        db_task_order = TaskOrder(task_id=new_task.id, order=max_order + 1)
-        db.add(db_task_order)
+        db.add(TaskOrder(task_id=new_task.id, order=task_order.append_key(db)))
         db.commit()
 
 
@@ -1,17 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import case, func, select
 from datetime import datetime, timedelta
 from typing import List, Optional
 from pydantic import BaseModel, validator
-from backend.database.database import get_db
+from backend.database.database import get_async_db, get_db
 from backend.database.models import Task, SubTask, TaskExtension, TaskOrder
+from backend.services import task_order as task_order_service
+from backend.services import timer
+from backend.services.activity_events import notify_activity_changed
+from backend.services.pagination import NDJSON_MEDIA_TYPE, iter_ndjson, paginate
 import logging
 from datetime import datetime, timedelta
 from tzlocal import get_localzone
-from sqlalchemy import func
-from sqlalchemy.exc import IntegrityError
-from pydantic import BaseModel, field_serializer, ConfigDict
+from pydantic import BaseModel, field_serializer, model_validator, ConfigDict
 
 
 
@@ -106,6 +110,18 @@ class TaskResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+    @model_validator(mode="before")
+    @classmethod
+    def live_time_remaining(cls, data):
+        """A running task stores the time left when it was started; report it as of now."""
+        if isinstance(data, Task) and timer.is_running(data):
+            fields = {name: getattr(data, name) for name in cls.model_fields}
+            fields["time_remaining"] = timedelta(
+                seconds=timer.remaining_seconds(data, timer.utcnow())
+            )
+            return fields
+        return data
+
     @field_serializer('time_created', 'completed_at')
     def serialize_datetime(self, value: Optional[datetime]) -> Optional[str]:
         return value.isoformat() if value else None
@@ -114,10 +130,20 @@ class TaskResponse(BaseModel):
     def serialize_timedelta(self, value: timedelta) -> str:
         return timedelta_to_string(value)
 
+class QueueSummaryResponse(BaseModel):
+    count: int
+    time_remaining_seconds: int
+
+
 class TaskOrderUpdate(BaseModel):
     task_ids: List[int]
 
 
+class TaskMove(BaseModel):
+    after_id: Optional[int] = None  # Task directly above the new position
+    before_id: Optional[int] = None  # Task directly below the new position
+
+
 @router.post("/tasks", response_model=TaskResponse)
 def create_task(task: TaskCreate, db: Session = Depends(get_db)):
     original_length = string_to_timedelta(task.original_length)
@@ -137,21 +163,11 @@ def create_task(task: TaskCreate, db: Session = Depends(get_db)):
         db.add(db_subtask)
 
     # Add the new task to the end of the order
-    max_order = db.query(func.coalesce(func.max(TaskOrder.order), 0)).scalar()
-    db_task_order = TaskOrder(task_id=db_task.id, order=max_order + 1)
-    db.add(db_task_order)
-
-    try:
-        db.commit()
-    except IntegrityError:
-        db.rollback()
-        # If there's a conflict, query for the highest order again and use that
-        max_order = db.query(func.coalesce(func.max(TaskOrder.order), 0)).scalar()
-        db_task_order.order = max_order + 1
-        db.add(db_task_order)
-        db.commit()
+    db.add(TaskOrder(task_id=db_task.id, order=task_order_service.append_key(db)))
+    db.commit()
 
     db.refresh(db_task)
+    notify_activity_changed()
     return db_task
 
 
@@ -161,44 +177,128 @@ def delete_task(task_id: int, db: Session = Depends(get_db)):
     if not db_task:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    # Remove the task from the order
-    db_task_order = db.query(TaskOrder).filter(TaskOrder.task_id == task_id).first()
-    if db_task_order:
-        db.delete(db_task_order)
-        # Reorder the remaining tasks
-        db.query(TaskOrder).filter(TaskOrder.order > db_task_order.order).update(
-            {"order": TaskOrder.order - 1}
-        )
-
+    # Its TaskOrder row goes with it; gap-based keys need no renumbering
     db.delete(db_task)
     db.commit()
+    notify_activity_changed()
     return {"detail": "Task deleted successfully"}
 
 
 @router.put("/tasks/reorder", status_code=200)
 def reorder_tasks(task_order: TaskOrderUpdate, db: Session = Depends(get_db)):
-    for index, task_id in enumerate(task_order.task_ids, start=1):
-        db_task_order = db.query(TaskOrder).filter(TaskOrder.task_id == task_id).first()
-        if db_task_order:
-            db_task_order.order = index
-        else:
-            db.add(TaskOrder(task_id=task_id, order=index))
+    task_order_service.set_order(db, task_order.task_ids)
     db.commit()
     return {"detail": "Tasks reordered successfully"}
 
 
+@router.put("/tasks/{task_id}/move", status_code=200)
+def move_task(
+    task_id: int,
+    move: TaskMove,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
+    try:
+        order, needs_rebalance = task_order_service.move_task(
+            db, task_id, move.after_id, move.before_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except task_order_service.MoveConflict as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=str(e))
+    db.commit()
+    if needs_rebalance:
+        background_tasks.add_task(rebalance_task_order, db.get_bind())
+    return {"detail": "Task moved successfully", "order": order}
+
+
+def rebalance_task_order(bind):
+    # Own session: the request's session may be closed by the time this runs
+    with Session(bind=bind) as db:
+        task_order_service.rebalance(db)
+        db.commit()
+    logger.info("Rebalanced task order keys")
+
+
+INCOMPLETE_TASKS_KEY = (TaskOrder.order, Task.id)
+
+
+def incomplete_tasks_query():
+    return select(Task).join(TaskOrder).filter(Task.is_complete == False)
+
+
+def incomplete_task_sort_key(task: Task):
+    return task.task_order.order, task.id
+
+
 @router.get("/tasks/incomplete", response_model=List[TaskResponse])
-def get_incomplete_tasks(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
-    tasks = (
-        db.query(Task)
+async def get_incomplete_tasks(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = 10,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """One page of the queue; the next page's cursor is in ``X-Next-Cursor``."""
+    return await db.run_sync(
+        lambda session: paginate(
+            session,
+            incomplete_tasks_query(),
+            INCOMPLETE_TASKS_KEY,
+            incomplete_task_sort_key,
+            (int, int),
+            cursor,
+            limit,
+            response,
+        )
+    )
+
+
+def queue_summary(db: Session, now: datetime) -> QueueSummaryResponse:
+    """Size and total remaining time of the whole queue, not just a page of it."""
+    count, stopped_seconds = db.execute(
+        select(
+            func.count(Task.id),
+            func.coalesce(
+                func.sum(
+                    case((Task.running_since.is_(None), Task.time_remaining_seconds), else_=0)
+                ),
+                0,
+            ),
+        )
         .join(TaskOrder)
         .filter(Task.is_complete == False)
-        .order_by(TaskOrder.order)
-        .offset(skip)
-        .limit(limit)
-        .all()
+    ).one()
+    # At most a task or two runs at a time; their time left is derived on read
+    running = db.scalars(
+        incomplete_tasks_query().filter(Task.running_since.is_not(None))
+    ).unique()
+    running_seconds = sum(timer.remaining_seconds(task, now) for task in running)
+    return QueueSummaryResponse(
+        count=count, time_remaining_seconds=int(stopped_seconds + running_seconds)
+    )
+
+
+@router.get("/tasks/incomplete/summary", response_model=QueueSummaryResponse)
+async def get_queue_summary(db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(queue_summary, timer.utcnow())
+
+
+@router.get("/tasks/incomplete/export")
+def export_incomplete_tasks(db: Session = Depends(get_db)):
+    """Every incomplete task in queue order, streamed as NDJSON."""
+    return StreamingResponse(
+        iter_ndjson(
+            db.get_bind(),
+            incomplete_tasks_query(),
+            INCOMPLETE_TASKS_KEY,
+            incomplete_task_sort_key,
+            lambda task: TaskResponse.model_validate(task).model_dump_json(),
+        ),
+        media_type=NDJSON_MEDIA_TYPE,
     )
-    return tasks
 
 
 @router.put("/tasks/{task_id}/update-time", response_model=TaskResponse)
@@ -208,30 +308,16 @@ def update_task_time(task_id: int, time_elapsed: str, db: Session = Depends(get_
         raise HTTPException(status_code=404, detail="Task not found")
 
     elapsed = string_to_timedelta(time_elapsed)
+    timer.checkpoint(db_task, timer.utcnow())
     db_task.time_remaining -= elapsed
     if db_task.time_remaining <= timedelta(0):
-        db_task.is_complete = True
-        db_task.completed_at = datetime.now(get_localzone())
-        db_task.time_remaining = timedelta(0)
+        timer.complete(db_task)
 
     db.commit()
     db.refresh(db_task)
     return db_task
 
 
-@router.get("/tasks/incomplete", response_model=List[TaskResponse])
-def get_incomplete_tasks(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
-    tasks = (
-        db.query(Task)
-        .filter(Task.is_complete == False)
-        .order_by(desc(Task.time_created))
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
-    return tasks
-
-
 @router.get("/tasks/{task_id}", response_model=TaskResponse)
 def get_task_by_id(task_id: int, db: Session = Depends(get_db)):
     task = db.query(Task).filter(Task.id == task_id).first()
@@ -255,6 +341,7 @@ def extend_task(
         extension_time=datetime.utcnow(),
     )
     db.add(db_extension)
+    timer.checkpoint(db_task, timer.utcnow())
     db_task.time_remaining += extension_length
 
     db.commit()
@@ -2,10 +2,12 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
 from pydantic import BaseModel
-from typing import List, Dict
+from typing import List, Dict, Optional
 from datetime import datetime
 from backend.database.database import get_db
 from backend.database.models import Task
+from backend.services import timer
+from backend.services.activity_events import notify_activity_changed
 from datetime import timedelta
 
 router = APIRouter()
@@ -28,6 +30,75 @@ class TaskTimeResponse(BaseModel):
         json_encoders = {timedelta: lambda v: int(v.total_seconds())}
 
 
+class TimerStateResponse(BaseModel):
+    id: int
+    title: str
+    time_remaining: int  # seconds
+    total_time: int  # seconds
+    is_running: bool
+    is_complete: bool
+    running_since: Optional[datetime] = None
+
+
+def get_task_or_404(db: Session, task_id: int) -> Task:
+    task = db.query(Task).filter(Task.id == task_id).first()
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task
+
+
+def timer_state(task: Task, now: datetime) -> TimerStateResponse:
+    return TimerStateResponse(
+        id=task.id,
+        title=task.title,
+        time_remaining=int(round(timer.remaining_seconds(task, now))),
+        total_time=int(timer.total_seconds(task)),
+        is_running=timer.is_running(task),
+        is_complete=bool(task.is_complete),
+        running_since=task.running_since,
+    )
+
+
+@router.get("/tasks/{task_id}/timer", response_model=TimerStateResponse)
+def get_timer(task_id: int, db: Session = Depends(get_db)):
+    task = get_task_or_404(db, task_id)
+    now = timer.utcnow()
+    # Completion is the only state change a read can trigger
+    if timer.settle(task, now):
+        db.commit()
+        notify_activity_changed()
+    return timer_state(task, now)
+
+
+@router.put("/tasks/{task_id}/timer/start", response_model=TimerStateResponse)
+def start_timer(task_id: int, db: Session = Depends(get_db)):
+    task = get_task_or_404(db, task_id)
+    if task.is_complete:
+        raise HTTPException(status_code=400, detail="Task is already completed")
+    now = timer.utcnow()
+    timer.start(task, now)
+    db.commit()
+    return timer_state(task, now)
+
+
+@router.put("/tasks/{task_id}/timer/pause", response_model=TimerStateResponse)
+def pause_timer(task_id: int, db: Session = Depends(get_db)):
+    task = get_task_or_404(db, task_id)
+    now = timer.utcnow()
+    completed = timer.settle(task, now)
+    if not completed:
+        timer.pause(task, now)
+    db.commit()
+    if completed:
+        notify_activity_changed()
+    return timer_state(task, now)
+
+
+@router.put("/tasks/{task_id}/timer/resume", response_model=TimerStateResponse)
+def resume_timer(task_id: int, db: Session = Depends(get_db)):
+    return start_timer(task_id, db)
+
+
 @router.put("/tasks/{task_id}/decrement-time", response_model=TaskTimeResponse)
 def decrement_task_time(task_id: int, db: Session = Depends(get_db)):
     task = db.query(Task).filter(Task.id == task_id).first()
@@ -36,13 +107,18 @@ def decrement_task_time(task_id: int, db: Session = Depends(get_db)):
     if task.is_complete:
         raise HTTPException(status_code=400, detail="Task is already completed")
 
+    # Fold in the running interval first, or it would be subtracted twice
+    now = timer.utcnow()
+    timer.checkpoint(task, now)
+
     # Decrement by 1 second
     task.time_remaining = max(
         timedelta(seconds=0), task.time_remaining - timedelta(seconds=1)
     )
 
-    if task.time_remaining == timedelta(seconds=0):
-        task.is_complete = True
+    completed = task.time_remaining == timedelta(seconds=0)
+    if completed:
+        timer.complete(task)
 
     # Calculate total time including extensions
     extension_time = sum((ext.duration for ext in task.extensions), timedelta())
@@ -50,6 +126,8 @@ def decrement_task_time(task_id: int, db: Session = Depends(get_db)):
 
     db.commit()
     db.refresh(task)
+    if completed:
+        notify_activity_changed()
 
     # Create a dictionary with task attributes and add the calculated total_time
     response_data = {
@@ -74,7 +152,5 @@ def get_total_time(task_id: int, db: Session = Depends(get_db)):
 
 @router.get("/tasks/{task_id}/time-remaining", response_model=Dict[str, int])
 def get_time_remaining(task_id: int, db: Session = Depends(get_db)):
-    task = db.query(Task).filter(Task.id == task_id).first()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    return {"time_remaining": task.time_remaining}
+    task = get_task_or_404(db, task_id)
+    return {"time_remaining": int(round(timer.remaining_seconds(task, timer.utcnow())))}
@@ -0,0 +1,45 @@
+"""In-process notifications for current-activity changes.
+
+Route handlers run in Starlette's threadpool while activity streams are
+async generators on the event loop, so ``notify`` hands the wake-up to each
+subscriber's loop with ``call_soon_threadsafe``.
+"""
+import asyncio
+import threading
+
+
+class ActivityBroadcaster:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+
+    def subscribe(self) -> asyncio.Event:
+        """Register an event that is set whenever the activity may have changed.
+
+        Must be called from the event loop that will wait on the event.
+        """
+        event = asyncio.Event()
+        with self._lock:
+            self._subscribers.add((asyncio.get_running_loop(), event))
+        return event
+
+    def unsubscribe(self, event: asyncio.Event) -> None:
+        with self._lock:
+            self._subscribers = {s for s in self._subscribers if s[1] is not event}
+
+    def notify(self) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for loop, event in subscribers:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # The subscriber's loop has already shut down
+                self.unsubscribe(event)
+
+
+activity_changed = ActivityBroadcaster()
+
+
+def notify_activity_changed() -> None:
+    activity_changed.notify()
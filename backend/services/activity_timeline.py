@@ -0,0 +1,122 @@
+"""In-memory timeline of today's DayPlans.
+
+The timeline is built once per day from the database and rebuilt only after
+``invalidate_timeline`` is called (day plan created, updated, deleted or
+synced). Lookups of the current block and of the next transition are binary
+searches over precomputed segments, with no database round-trip.
+"""
+import threading
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import date, time
+from typing import Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from backend.database.models import DayPlan
+from backend.services import recurrence
+from backend.services.activity_events import notify_activity_changed
+
+
+@dataclass(frozen=True)
+class TimelineBlock:
+    """Detached snapshot of a DayPlan or recurring occurrence, safe to share between sessions."""
+
+    id: Optional[int]
+    title: str
+    mode: str
+    date: date
+    start_time: time
+    end_time: time
+    location: Optional[str] = None
+    status: Optional[str] = None
+    description: Optional[str] = None
+    attendees: Tuple[str, ...] = ()
+    recurring_plan_id: Optional[int] = None
+
+    @classmethod
+    def from_plan(cls, plan: DayPlan) -> "TimelineBlock":
+        return cls(
+            id=plan.id,
+            title=plan.title,
+            mode=plan.mode,
+            date=plan.date,
+            start_time=plan.start_time,
+            end_time=plan.end_time,
+            location=plan.location,
+            status=plan.status,
+            description=plan.description,
+            attendees=tuple(plan.attendees),
+            recurring_plan_id=getattr(plan, "recurring_plan_id", None),
+        )
+
+
+class ActivityTimeline:
+    def __init__(self, day: date, blocks):
+        self.day = day
+        blocks = sorted(
+            (b for b in blocks if b.start_time < b.end_time),
+            key=lambda b: (b.start_time, b.id is None, b.id or 0),
+        )
+        boundaries = sorted({b.start_time for b in blocks} | {b.end_time for b in blocks})
+
+        # Split the day into segments that each have a single owning block
+        # (the earliest-starting block covering it), merging neighbours with
+        # the same owner so every stored start is a real transition.
+        self._starts = []
+        self._owners = []
+        for boundary in boundaries:
+            owner = next(
+                (b for b in blocks if b.start_time <= boundary < b.end_time), None
+            )
+            if self._owners and self._owners[-1] is owner:
+                continue
+            self._starts.append(boundary)
+            self._owners.append(owner)
+
+    def block_at(self, at: time) -> Optional[TimelineBlock]:
+        index = bisect_right(self._starts, at) - 1
+        return self._owners[index] if index >= 0 else None
+
+    def next_transition(self, at: time) -> Optional[time]:
+        """Return the next time the current block changes, or None for the rest of the day."""
+        index = bisect_right(self._starts, at)
+        return self._starts[index] if index < len(self._starts) else None
+
+
+_lock = threading.Lock()
+_timelines = {}
+_generation = 0
+
+
+def build_timeline(db: Session, day: date) -> ActivityTimeline:
+    """Timeline of ``day``'s DayPlans and recurring occurrences."""
+    plans = recurrence.schedule_between(db, day, day)
+    return ActivityTimeline(day, [TimelineBlock.from_plan(p) for p in plans])
+
+
+def get_timeline(db: Session, day: date) -> ActivityTimeline:
+    key = (db.get_bind(), day)
+    with _lock:
+        timeline = _timelines.get(key)
+        generation = _generation
+    if timeline is not None:
+        return timeline
+
+    timeline = build_timeline(db, day)
+    with _lock:
+        # Don't cache a timeline that was invalidated while it was being built
+        if generation == _generation:
+            for stale in [k for k in _timelines if k[1] != day]:
+                del _timelines[stale]
+            _timelines[key] = timeline
+    return timeline
+
+
+def invalidate_timeline() -> None:
+    """Drop cached timelines after DayPlans change and wake activity streams."""
+    global _generation
+    with _lock:
+        _generation += 1
+        _timelines.clear()
+    notify_activity_changed()
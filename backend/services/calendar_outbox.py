@@ -0,0 +1,377 @@
+"""Durable outbox of Google Calendar mutations and the worker that drains it.
+
+Request handlers record the mutation in ``calendar_outbox`` inside their own
+transaction and return at local-SQLite speed. ``CalendarSyncWorker`` runs in
+a background thread of the FastAPI process, pushes due entries to Google in
+batch requests of up to ``BATCH_SIZE`` calls and retries failures with
+exponential backoff. Each call in a batch succeeds or fails on its own.
+The same thread runs the incremental pull sync when a request asks for it,
+so no request handler waits on Google.
+"""
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from googleapiclient.errors import HttpError
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+
+from backend.database.models import CalendarOutbox, DayPlan, RecurringPlan
+from backend.services.calendar_sync import sync_if_stale
+
+logger = logging.getLogger(__name__)
+
+CALENDAR_ID = "primary"
+TIME_ZONE = "America/Los_Angeles"  # Replace with your desired time zone
+
+# Google recommends at most 50 calls per Calendar batch request
+BATCH_SIZE = 50
+MAX_ATTEMPTS = 10
+BACKOFF_BASE = timedelta(seconds=5)
+BACKOFF_MAX = timedelta(minutes=15)
+IDLE_POLL_SECONDS = 30
+
+
+def build_event_body(day_plan, day=None) -> dict:
+    day = day or day_plan.date
+    return {
+        "summary": day_plan.title,
+        "location": day_plan.location,
+        "description": day_plan.description,
+        "start": {
+            "dateTime": datetime.combine(day, day_plan.start_time)
+            .replace(tzinfo=ZoneInfo(TIME_ZONE))
+            .isoformat(),
+            "timeZone": TIME_ZONE,
+        },
+        "end": {
+            "dateTime": datetime.combine(day, day_plan.end_time)
+            .replace(tzinfo=ZoneInfo(TIME_ZONE))
+            .isoformat(),
+            "timeZone": TIME_ZONE,
+        },
+        "attendees": [{"email": attendee} for attendee in (day_plan.attendees or [])],
+        "extendedProperties": {"private": {"mode": day_plan.mode}},
+    }
+
+
+def build_recurring_event_body(recurring_plan: RecurringPlan) -> dict:
+    """One recurring event; removed occurrences are sent as EXDATEs."""
+    body = build_event_body(recurring_plan, recurring_plan.dtstart)
+    recurrence = [f"RRULE:{recurring_plan.rrule.strip().removeprefix('RRULE:')}"]
+    for exception in sorted(recurring_plan.exceptions, key=lambda e: e.occurrence_date):
+        excluded = datetime.combine(exception.occurrence_date, recurring_plan.start_time)
+        recurrence.append(f"EXDATE;TZID={TIME_ZONE}:{excluded:%Y%m%dT%H%M%S}")
+    body["recurrence"] = recurrence
+    return body
+
+
+def _describe(entry: CalendarOutbox) -> str:
+    if entry.recurring_plan_id is not None:
+        return f"recurring plan {entry.recurring_plan_id}"
+    return f"day plan {entry.day_plan_id}"
+
+
+def enqueue(db: Session, operation: str, plan) -> Optional[CalendarOutbox]:
+    """Record a calendar mutation for a DayPlan or RecurringPlan in the caller's transaction.
+
+    Repeated mutations of the same plan coalesce into one pending entry. The
+    event body is built when the entry is sent, so a pending create or update
+    always pushes the plan's latest state.
+    """
+    if isinstance(plan, RecurringPlan):
+        key_column, key = CalendarOutbox.recurring_plan_id, {"recurring_plan_id": plan.id}
+    else:
+        key_column, key = CalendarOutbox.day_plan_id, {"day_plan_id": plan.id}
+    pending = (
+        db.query(CalendarOutbox)
+        .filter(key_column == plan.id, CalendarOutbox.status == "pending")
+        .first()
+    )
+
+    if operation == "delete":
+        if pending is not None and pending.operation == "create":
+            # The event never reached Google; nothing to delete
+            db.delete(pending)
+            return None
+        if not plan.google_event_id:
+            return None
+        if pending is not None:
+            pending.operation = "delete"
+            pending.google_event_id = plan.google_event_id
+            pending.attempts = 0
+            pending.next_attempt_at = datetime.utcnow()
+            return pending
+    elif pending is not None:
+        return pending
+    elif operation == "update" and not plan.google_event_id:
+        operation = "create"
+
+    entry = CalendarOutbox(
+        **key,
+        google_event_id=plan.google_event_id,
+        operation=operation,
+        next_attempt_at=datetime.utcnow(),
+    )
+    db.add(entry)
+    return entry
+
+
+def backoff_delay(attempts: int) -> timedelta:
+    return min(BACKOFF_BASE * (2 ** (attempts - 1)), BACKOFF_MAX)
+
+
+def _is_gone(error: HttpError) -> bool:
+    return error.resp.status in (404, 410)
+
+
+class CalendarSyncWorker:
+    def __init__(self, session_factory=None, service_factory=None):
+        self._session_factory = session_factory
+        self._service_factory = service_factory
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._pull_requested = threading.Event()
+        self._thread = None
+
+    @property
+    def session_factory(self):
+        if self._session_factory is None:
+            from backend.database.database import SessionLocal
+
+            self._session_factory = SessionLocal
+        return self._session_factory
+
+    @property
+    def service_factory(self):
+        if self._service_factory is None:
+            from backend.services.calendar_service import get_calendar_service
+
+            self._service_factory = get_calendar_service
+        return self._service_factory
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="calendar-sync-worker", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def wake(self):
+        """Ask the worker to drain the outbox now instead of at its next poll."""
+        self._wake.set()
+
+    def request_pull(self):
+        """Ask the worker to pull Google Calendar changes unless it did so recently."""
+        self._pull_requested.set()
+        self._wake.set()
+
+    def _run(self):
+        recovered = False
+        while not self._stop.is_set():
+            self._wake.clear()
+            wait = IDLE_POLL_SECONDS
+            try:
+                if not recovered:
+                    self.recover_in_flight()
+                    recovered = True
+                self.drain_once()
+                if self._pull_requested.is_set():
+                    self._pull_requested.clear()
+                    self.pull_once()
+                wait = self._seconds_until_next_due()
+            except Exception as e:
+                logger.error(f"Calendar sync worker error: {e}")
+            self._wake.wait(wait)
+
+    def _seconds_until_next_due(self) -> float:
+        with self.session_factory() as db:
+            next_due = (
+                db.query(CalendarOutbox.next_attempt_at)
+                .filter(CalendarOutbox.status == "pending")
+                .order_by(CalendarOutbox.next_attempt_at)
+                .limit(1)
+                .scalar()
+            )
+        if next_due is None:
+            return IDLE_POLL_SECONDS
+        wait = (next_due - datetime.utcnow()).total_seconds()
+        return min(max(wait, 0.1), IDLE_POLL_SECONDS)
+
+    def recover_in_flight(self):
+        """Requeue entries left in flight by a previous process."""
+        with self.session_factory() as db:
+            db.query(CalendarOutbox).filter(CalendarOutbox.status == "in_flight").update(
+                {"status": "pending"}
+            )
+            db.commit()
+
+    def pull_once(self) -> int:
+        """Run the incremental pull sync if it is due; return the change count."""
+        with self.session_factory() as db:
+            try:
+                return sync_if_stale(db, self.service_factory)
+            except HttpError as error:
+                logger.error(f"Google Calendar sync failed, serving local plans: {error}")
+                return 0
+
+    def drain_once(self, now: Optional[datetime] = None) -> int:
+        """Send up to ``BATCH_SIZE`` due entries in one batch; return how many succeeded."""
+        now = now or datetime.utcnow()
+        with self.session_factory() as db:
+            due = (
+                db.query(CalendarOutbox)
+                .filter(
+                    CalendarOutbox.status == "pending",
+                    CalendarOutbox.next_attempt_at <= now,
+                )
+                .order_by(CalendarOutbox.id)
+                .limit(BATCH_SIZE)
+                .all()
+            )
+            # A plan edited while its create was in flight can have a second
+            # entry; send it in a later batch, once the first has the event id
+            seen, first_per_plan = set(), []
+            for entry in due:
+                key = (entry.day_plan_id, entry.recurring_plan_id)
+                if key not in seen:
+                    seen.add(key)
+                    first_per_plan.append(entry)
+            due = first_per_plan
+            if not due:
+                return 0
+            for entry in due:
+                entry.status = "in_flight"
+            db.commit()
+
+            try:
+                service = self.service_factory()
+                results = self._send_batch(db, service, due)
+            except Exception as e:
+                for entry in due:
+                    self._record_failure(entry, e, now)
+                db.commit()
+                return 0
+
+            succeeded = 0
+            for entry in due:
+                try:
+                    if entry.id not in results:
+                        raise RuntimeError("No response for this call in the batch reply")
+                    operation, response, error = results[entry.id]
+                    if error is not None and not (
+                        operation == "delete" and isinstance(error, HttpError) and _is_gone(error)
+                    ):
+                        raise error
+                    self._apply_result(db, service, entry, operation, response)
+                    db.delete(entry)
+                    db.commit()
+                    succeeded += 1
+                except Exception as e:
+                    db.rollback()
+                    self._record_failure(entry, e, now)
+                    db.commit()
+            return succeeded
+
+    def _record_failure(self, entry: CalendarOutbox, error: Exception, now: datetime):
+        entry.attempts = (entry.attempts or 0) + 1
+        entry.last_error = str(error)
+        if entry.attempts >= MAX_ATTEMPTS:
+            entry.status = "failed"
+            logger.error(
+                f"Giving up on calendar {entry.operation} for {_describe(entry)}: {error}"
+            )
+        else:
+            entry.status = "pending"
+            entry.next_attempt_at = now + backoff_delay(entry.attempts)
+            logger.warning(
+                f"Calendar {entry.operation} for {_describe(entry)} failed "
+                f"(attempt {entry.attempts}), retrying at {entry.next_attempt_at}: {error}"
+            )
+
+    def _send_batch(self, db: Session, service, entries) -> dict:
+        """Send ``entries`` as one Google batch request.
+
+        Returns ``{entry id: (operation sent, response, exception)}``; entries
+        with nothing to send map to ``(None, None, None)``.
+        """
+        events = service.events()
+        operations = {}
+        results = {}
+
+        def callback(request_id, response, exception):
+            entry_id = int(request_id)
+            results[entry_id] = (operations[entry_id], response, exception)
+
+        batch = service.new_batch_http_request(callback=callback)
+        for entry in entries:
+            request = self._build_request(db, events, entry)
+            if request is None:
+                results[entry.id] = (None, None, None)
+                continue
+            operations[entry.id], request = request
+            batch.add(request, request_id=str(entry.id))
+        if operations:
+            batch.execute()
+            logger.info(f"Sent {len(operations)} calendar changes in one batch request")
+        return results
+
+    def _build_request(self, db: Session, events, entry: CalendarOutbox):
+        """Return ``(operation, request)`` for an entry, or None if there is nothing to send."""
+        if entry.operation == "delete":
+            return "delete", events.delete(calendarId=CALENDAR_ID, eventId=entry.google_event_id)
+
+        plan = self._plan_for(db, entry)
+        if plan is None:
+            return None  # Deleted locally before it was pushed
+        if isinstance(plan, RecurringPlan):
+            body = build_recurring_event_body(plan)
+        else:
+            body = build_event_body(plan)
+        # An entry queued as a create while an earlier create was in flight
+        # finds the event already made; inserting again would duplicate it
+        if plan.google_event_id:
+            return "update", events.update(
+                calendarId=CALENDAR_ID, eventId=plan.google_event_id, body=body
+            )
+        return "create", events.insert(calendarId=CALENDAR_ID, body=body)
+
+    @staticmethod
+    def _plan_for(db: Session, entry: CalendarOutbox):
+        if entry.recurring_plan_id is not None:
+            return db.get(RecurringPlan, entry.recurring_plan_id)
+        return db.get(DayPlan, entry.day_plan_id)
+
+    def _apply_result(self, db: Session, service, entry: CalendarOutbox, operation, response):
+        if operation == "delete":
+            logger.info(f"Deleted Google Calendar event with ID: {entry.google_event_id}")
+        elif operation == "update":
+            logger.info(f"Updated Google Calendar event for {_describe(entry)}")
+        elif operation == "create":
+            plan = self._plan_for(db, entry)
+            if plan is not None:
+                plan.google_event_id = response["id"]
+                try:
+                    db.flush()
+                    logger.info(
+                        f"Created Google Calendar event with ID: {response['id']} and mode: {plan.mode}"
+                    )
+                    return
+                except StaleDataError:
+                    db.rollback()
+            # The plan was deleted while the insert was in flight
+            service.events().delete(calendarId=CALENDAR_ID, eventId=response["id"]).execute()
+
+
+calendar_worker = CalendarSyncWorker()
@@ -0,0 +1,130 @@
+"""Process-wide cache of Google Calendar credentials and service clients.
+
+Credentials are loaded from ``token.json`` once and reloaded only when the
+file's mtime changes; an expired access token is refreshed in place and
+written back. The discovery document is parsed once per credential
+generation. ``googleapiclient`` resources wrap an ``httplib2.Http`` that is
+not thread-safe, so each thread of FastAPI's threadpool (and the outbox
+worker) gets its own service built from the shared document.
+
+``googleapiclient.discovery`` and Google's ``requests`` transport are
+imported on first use rather than at import time; together they are the
+bulk of this module's import cost and slow down backend startup.
+"""
+import logging
+import os
+import threading
+from dataclasses import dataclass
+
+from fastapi import HTTPException
+from google.auth.exceptions import RefreshError
+from google.oauth2.credentials import Credentials
+
+logger = logging.getLogger(__name__)
+
+# If modifying these scopes, delete the file token.json.
+SCOPES = ["https://www.googleapis.com/auth/calendar"]
+
+TOKEN_FILE = "token.json"
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    reloads: int = 0
+    refreshes: int = 0
+
+    def as_dict(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+            "refreshes": self.refreshes,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class CalendarServiceCache:
+    def __init__(self, token_file: str = TOKEN_FILE, scopes=SCOPES):
+        self.token_file = token_file
+        self.scopes = scopes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._credentials = None
+        self._token_mtime = None
+        self._document = None
+        self._generation = 0
+
+    def get(self):
+        """Return a Calendar v3 service for the calling thread."""
+        with self._lock:
+            credentials, generation = self._current_credentials()
+            cached = getattr(self._local, "entry", None)
+            if cached is not None and cached[0] == generation:
+                self.stats.hits += 1
+                return cached[1]
+            self.stats.misses += 1
+            document = self._document
+
+        from googleapiclient.discovery import build, build_from_document
+
+        if document is None:
+            service = build("calendar", "v3", credentials=credentials)
+            with self._lock:
+                if generation == self._generation:
+                    self._document = service._rootDesc
+        else:
+            service = build_from_document(document, credentials=credentials)
+        self._local.entry = (generation, service)
+        return service
+
+    def invalidate(self):
+        with self._lock:
+            self._credentials = None
+            self._token_mtime = None
+            self._generation += 1
+
+    def _current_credentials(self):
+        """Return (credentials, generation), reloading or refreshing as needed.
+
+        Must be called with ``_lock`` held.
+        """
+        mtime = os.stat(self.token_file).st_mtime_ns
+        if self._credentials is None or mtime != self._token_mtime:
+            self._credentials = Credentials.from_authorized_user_file(
+                self.token_file, self.scopes
+            )
+            self._token_mtime = mtime
+            self._generation += 1
+            self.stats.reloads += 1
+            logger.info(f"Loaded Google credentials from {self.token_file}")
+
+        if not self._credentials.valid and self._credentials.refresh_token:
+            from google.auth.transport.requests import Request
+
+            self._credentials.refresh(Request())
+            with open(self.token_file, "w") as token:
+                token.write(self._credentials.to_json())
+            self._token_mtime = os.stat(self.token_file).st_mtime_ns
+            self._generation += 1
+            self.stats.refreshes += 1
+            logger.info("Refreshed Google access token")
+        return self._credentials, self._generation
+
+
+service_cache = CalendarServiceCache()
+
+
+def get_calendar_service():
+    try:
+        return service_cache.get()
+    except (FileNotFoundError, RefreshError):
+        service_cache.invalidate()
+        raise HTTPException(status_code=401, detail="Authentication required")
+
+
+def calendar_service_stats() -> dict:
+    return service_cache.stats.as_dict()
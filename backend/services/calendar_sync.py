@@ -0,0 +1,291 @@
+"""Incremental Google Calendar -> DayPlan sync.
+
+The first sync lists every event in a window around today and stores the
+returned ``nextSyncToken`` per calendar. Later syncs send that token and
+only receive events changed since, including cancellations. A 410 Gone
+response means the token expired and triggers a full resync.
+"""
+import logging
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Dict, Iterable, Optional
+
+from googleapiclient.errors import HttpError
+from sqlalchemy.orm import Session
+from tzlocal import get_localzone
+
+from backend.database.models import (
+    CalendarOutbox,
+    CalendarSyncState,
+    DailyRecord,
+    DayPlan,
+    RecurringPlan,
+    RecurringPlanException,
+)
+from backend.services.activity_timeline import invalidate_timeline
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CALENDAR_ID = "primary"
+
+# Window covered by a full sync (and therefore by its sync token)
+SYNC_WINDOW_PAST = timedelta(days=7)
+SYNC_WINDOW_FUTURE = timedelta(days=60)
+
+# GET /dayplans does not contact Google more often than this
+MIN_SYNC_INTERVAL = timedelta(seconds=60)
+
+# Stay well below SQLite's bound-parameter limit in IN (...) lookups
+_IN_CHUNK_SIZE = 500
+
+
+def _to_local(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(get_localzone()).replace(tzinfo=None)
+    return parsed
+
+
+def event_to_plan_fields(event: dict) -> Optional[dict]:
+    """Map a Calendar event to DayPlan column values.
+
+    All-day events carry a ``date`` instead of a ``dateTime`` and have no place
+    in a time-blocked day, so they map to None.
+    """
+    start = event.get("start", {}).get("dateTime")
+    end = event.get("end", {}).get("dateTime")
+    if not start or not end:
+        return None
+    start_dt, end_dt = _to_local(start), _to_local(end)
+    return {
+        "title": event.get("summary", ""),
+        "description": event.get("description", ""),
+        "date": start_dt.date(),
+        "start_time": start_dt.time(),
+        "end_time": end_dt.time(),
+        "location": event.get("location", ""),
+        "attendees": [a["email"] for a in event.get("attendees", []) if "email" in a],
+        "mode": event.get("extendedProperties", {})
+        .get("private", {})
+        .get("mode", "event"),
+    }
+
+
+def plans_by_event_id(db: Session, event_ids: Iterable[str]) -> Dict[str, DayPlan]:
+    event_ids = list(event_ids)
+    plans = {}
+    for i in range(0, len(event_ids), _IN_CHUNK_SIZE):
+        chunk = event_ids[i : i + _IN_CHUNK_SIZE]
+        for plan in db.query(DayPlan).filter(DayPlan.google_event_id.in_(chunk)):
+            plans[plan.google_event_id] = plan
+    return plans
+
+
+def recurring_plans_by_event_id(db: Session, event_ids: Iterable[str]) -> Dict[str, RecurringPlan]:
+    event_ids = list(event_ids)
+    templates = {}
+    for i in range(0, len(event_ids), _IN_CHUNK_SIZE):
+        chunk = event_ids[i : i + _IN_CHUNK_SIZE]
+        for template in db.query(RecurringPlan).filter(RecurringPlan.google_event_id.in_(chunk)):
+            templates[template.google_event_id] = template
+    return templates
+
+
+def _apply_series_event(db: Session, template: RecurringPlan, event: dict) -> int:
+    """Apply a change to a recurring event pushed from a RecurringPlan.
+
+    The list is requested with ``singleEvents``, so the series arrives as its
+    instances, which mirror the template and are not stored. A cancelled
+    instance becomes an exception; a cancelled series deletes the template.
+    """
+    if event.get("status") != "cancelled":
+        return 0
+    if event["id"] == template.google_event_id:
+        db.delete(template)
+        return 1
+    original = event.get("originalStartTime", {}).get("dateTime")
+    if not original:
+        return 0
+    occurrence_date = _to_local(original).date()
+    if any(e.occurrence_date == occurrence_date for e in template.exceptions):
+        return 0
+    template.exceptions.append(RecurringPlanException(occurrence_date=occurrence_date))
+    return 1
+
+
+class _DailyRecords:
+    """Per-sync cache of DailyRecord rows keyed by date."""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._records = {}
+
+    def get(self, day: date) -> DailyRecord:
+        record = self._records.get(day)
+        if record is None:
+            record = self.db.query(DailyRecord).filter(DailyRecord.date == day).first()
+            if record is None:
+                record = DailyRecord(date=day)
+                self.db.add(record)
+                self.db.flush()
+            self._records[day] = record
+        return record
+
+
+def apply_events(db: Session, events: list) -> int:
+    """Upsert or delete DayPlans for a batch of changed events.
+
+    Returns the number of DayPlans created, updated or deleted.
+    """
+    plans = plans_by_event_id(db, (e["id"] for e in events))
+    templates = recurring_plans_by_event_id(
+        db, {e.get("recurringEventId") or e["id"] for e in events}
+    )
+    # Local edits still waiting in the outbox (a handful of rows at most) win
+    # over the remote copy
+    outbox = db.query(CalendarOutbox.day_plan_id, CalendarOutbox.recurring_plan_id).filter(
+        CalendarOutbox.status != "failed"
+    )
+    unpushed, unpushed_series = set(), set()
+    for day_plan_id, recurring_plan_id in outbox:
+        unpushed.add(day_plan_id)
+        unpushed_series.add(recurring_plan_id)
+    daily_records = _DailyRecords(db)
+    changed = 0
+    for event in events:
+        template = templates.get(event.get("recurringEventId") or event["id"])
+        if template is not None:
+            if template.id not in unpushed_series:
+                changed += _apply_series_event(db, template, event)
+            continue
+        plan = plans.get(event["id"])
+        if plan is not None and plan.id in unpushed:
+            continue
+        if event.get("status") == "cancelled":
+            if plan is not None:
+                db.delete(plan)
+                del plans[event["id"]]
+                changed += 1
+            continue
+
+        fields = event_to_plan_fields(event)
+        if fields is None:
+            continue
+        if plan is None:
+            plan = DayPlan(
+                google_event_id=event["id"],
+                daily_record_id=daily_records.get(fields["date"]).id,
+                **fields,
+            )
+            db.add(plan)
+            plans[event["id"]] = plan
+            changed += 1
+        elif any(getattr(plan, key) != value for key, value in fields.items()):
+            if plan.date != fields["date"]:
+                plan.daily_record_id = daily_records.get(fields["date"]).id
+            for key, value in fields.items():
+                setattr(plan, key, value)
+            changed += 1
+    return changed
+
+
+def _list_events(service, calendar_id: str, sync_token: Optional[str], window_start, window_end):
+    """Fetch every page of an events().list call; return (events, nextSyncToken)."""
+    params = {"calendarId": calendar_id, "singleEvents": True}
+    if sync_token:
+        params["syncToken"] = sync_token
+    else:
+        params["timeMin"] = window_start.isoformat()
+        params["timeMax"] = window_end.isoformat()
+
+    events = []
+    page_token = None
+    while True:
+        if page_token:
+            params["pageToken"] = page_token
+        result = service.events().list(**params).execute()
+        events.extend(result.get("items", []))
+        page_token = result.get("nextPageToken")
+        if not page_token:
+            return events, result.get("nextSyncToken")
+
+
+def _remove_missing(db: Session, seen_event_ids: set, window_start: date, window_end: date) -> int:
+    """After a full sync, delete synced plans whose events no longer exist."""
+    removed = 0
+    stale = db.query(DayPlan).filter(
+        DayPlan.google_event_id.isnot(None),
+        DayPlan.date >= window_start,
+        DayPlan.date <= window_end,
+    )
+    for plan in stale:
+        if plan.google_event_id not in seen_event_ids:
+            db.delete(plan)
+            removed += 1
+    return removed
+
+
+def sync_calendar(
+    db: Session,
+    service,
+    calendar_id: str = DEFAULT_CALENDAR_ID,
+    now: Optional[datetime] = None,
+) -> int:
+    """Pull changes from Google Calendar into DayPlans; return the change count."""
+    now = now or datetime.now(get_localzone())
+    state = db.get(CalendarSyncState, calendar_id)
+    if state is None:
+        state = CalendarSyncState(calendar_id=calendar_id)
+        db.add(state)
+
+    today = now.date()
+    window_start = datetime.combine(today - SYNC_WINDOW_PAST, time.min, now.tzinfo)
+    window_end = datetime.combine(today + SYNC_WINDOW_FUTURE, time.max, now.tzinfo)
+
+    full_sync = state.sync_token is None
+    try:
+        events, next_token = _list_events(
+            service, calendar_id, state.sync_token, window_start, window_end
+        )
+    except HttpError as error:
+        if full_sync or error.resp.status != 410:
+            raise
+        logger.warning(f"Sync token for calendar {calendar_id} expired; running a full sync")
+        full_sync = True
+        events, next_token = _list_events(service, calendar_id, None, window_start, window_end)
+
+    changed = apply_events(db, events)
+    if full_sync:
+        changed += _remove_missing(
+            db, {e["id"] for e in events}, window_start.date(), window_end.date()
+        )
+
+    state.sync_token = next_token
+    state.last_synced_at = now.replace(tzinfo=None)
+    db.commit()
+
+    logger.info(
+        f"{'Full' if full_sync else 'Incremental'} sync of calendar {calendar_id}: "
+        f"{len(events)} events received, {changed} day plans changed"
+    )
+    if changed:
+        invalidate_timeline()
+    return changed
+
+
+def sync_if_stale(
+    db: Session,
+    service_factory: Callable,
+    calendar_id: str = DEFAULT_CALENDAR_ID,
+    min_interval: timedelta = MIN_SYNC_INTERVAL,
+) -> int:
+    """Run ``sync_calendar`` unless the calendar was synced within ``min_interval``."""
+    now = datetime.now(get_localzone())
+    state = db.get(CalendarSyncState, calendar_id)
+    if (
+        state is not None
+        and state.sync_token
+        and state.last_synced_at is not None
+        and now.replace(tzinfo=None) - state.last_synced_at < min_interval
+    ):
+        return 0
+    return sync_calendar(db, service_factory(), calendar_id, now)
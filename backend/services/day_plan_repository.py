@@ -0,0 +1,84 @@
+"""Day plan lookups by date, as sargable range predicates.
+
+Every query filters with ``date >= :start AND date < :end`` rather than
+``date(day_plans.date) = :day``, so SQLite can seek
+``ix_day_plans_date_start_end`` instead of evaluating a function on every
+row.
+
+Statements are built with ``lambda_stmt``: SQLAlchemy caches the
+constructed statement and its compiled SQL keyed on the lambda's code, and
+only the closed-over dates and times become bound parameters on each call.
+"""
+from datetime import date, time, timedelta
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import lambda_stmt, or_, select
+from sqlalchemy.orm import Session
+
+from backend.database.models import DayPlan, RecurringPlan, RecurringPlanException
+
+
+def plans_between(db: Session, start: date, end: date) -> List[DayPlan]:
+    """Plans dated ``start`` up to and including ``end``, in time order."""
+    end_exclusive = end + timedelta(days=1)
+    stmt = lambda_stmt(
+        lambda: select(DayPlan)
+        .where(DayPlan.date >= start, DayPlan.date < end_exclusive)
+        .order_by(DayPlan.date, DayPlan.start_time, DayPlan.id)
+    )
+    return db.scalars(stmt).all()
+
+
+def plans_on(db: Session, day: date) -> List[DayPlan]:
+    """Plans of a single day, ordered by start time."""
+    return plans_between(db, day, day)
+
+
+def plan_at(db: Session, day: date, at: time) -> Optional[DayPlan]:
+    """The earliest-starting plan on ``day`` that is running at ``at``."""
+    next_day = day + timedelta(days=1)
+    stmt = lambda_stmt(
+        lambda: select(DayPlan)
+        .where(
+            DayPlan.date >= day,
+            DayPlan.date < next_day,
+            DayPlan.start_time <= at,
+            DayPlan.end_time > at,
+        )
+        .order_by(DayPlan.start_time, DayPlan.id)
+        .limit(1)
+    )
+    return db.scalars(stmt).first()
+
+
+def recurring_plans_between(db: Session, start: date, end: date) -> List[RecurringPlan]:
+    """Recurring templates that may have an occurrence from ``start`` to ``end``."""
+    stmt = lambda_stmt(
+        lambda: select(RecurringPlan).where(
+            RecurringPlan.dtstart <= end,
+            or_(RecurringPlan.ends_on.is_(None), RecurringPlan.ends_on >= start),
+        )
+    )
+    return db.scalars(stmt).all()
+
+
+def skipped_dates(
+    db: Session, plan_ids: List[int], start: date, end: date
+) -> Dict[int, Set[date]]:
+    """Occurrence dates removed from each series within ``start`` to ``end``."""
+    if not plan_ids:
+        return {}
+    stmt = lambda_stmt(
+        lambda: select(
+            RecurringPlanException.recurring_plan_id,
+            RecurringPlanException.occurrence_date,
+        ).where(
+            RecurringPlanException.recurring_plan_id.in_(plan_ids),
+            RecurringPlanException.occurrence_date >= start,
+            RecurringPlanException.occurrence_date <= end,
+        )
+    )
+    skipped = {}
+    for plan_id, occurrence_date in db.execute(stmt):
+        skipped.setdefault(plan_id, set()).add(occurrence_date)
+    return skipped
@@ -0,0 +1,152 @@
+"""Per-request SQL statement counts and timings.
+
+``QueryProfilerMiddleware`` opens a ``RequestProfile`` for every HTTP
+request. SQLAlchemy cursor-execute hooks (installed on all engines by
+``install_query_profiler``) add each statement's duration to the profile of
+the request running it; contextvars carry the profile into threadpool
+endpoints and aiosqlite greenlets. When the response starts, the totals are
+added as ``X-DB-Query-Count`` / ``X-DB-Query-Time-Ms`` headers and folded
+into the per-route stats served by ``/api/_metrics``. Statements slower than
+``SLOW_QUERY_MS`` are logged wherever they run.
+"""
+import logging
+import os
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Query-Time-Ms"
+
+
+@dataclass
+class RequestProfile:
+    statements: int = 0
+    query_ms: float = 0.0
+
+
+@dataclass
+class RouteStats:
+    requests: int = 0
+    statements: int = 0
+    query_ms: float = 0.0
+    max_statements: int = 0
+    max_query_ms: float = 0.0
+
+    def add(self, profile: RequestProfile):
+        self.requests += 1
+        self.statements += profile.statements
+        self.query_ms += profile.query_ms
+        self.max_statements = max(self.max_statements, profile.statements)
+        self.max_query_ms = max(self.max_query_ms, profile.query_ms)
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "statements": self.statements,
+            "query_ms": round(self.query_ms, 3),
+            "avg_statements": round(self.statements / self.requests, 2),
+            "avg_query_ms": round(self.query_ms / self.requests, 3),
+            "max_statements": self.max_statements,
+            "max_query_ms": round(self.max_query_ms, 3),
+        }
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar(
+    "current_query_profile", default=None
+)
+_route_stats: Dict[str, RouteStats] = {}
+_stats_lock = threading.Lock()
+_installed = False
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["query_start_time"].pop()) * 1000
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.statements += 1
+        profile.query_ms += elapsed_ms
+    if elapsed_ms >= SLOW_QUERY_MS:
+        logger.warning(
+            f"Slow query ({elapsed_ms:.1f} ms): {' '.join(statement.split())} "
+            f"params={parameters!r:.200}"
+        )
+
+
+def install_query_profiler():
+    """Hook statement timing into every SQLAlchemy engine (idempotent)."""
+    global _installed
+    if _installed:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    _installed = True
+
+
+def record_route(route: str, profile: RequestProfile):
+    with _stats_lock:
+        _route_stats.setdefault(route, RouteStats()).add(profile)
+
+
+def route_stats() -> Dict[str, dict]:
+    with _stats_lock:
+        return {route: stats.as_dict() for route, stats in sorted(_route_stats.items())}
+
+
+def reset_route_stats():
+    with _stats_lock:
+        _route_stats.clear()
+
+
+def _header(name: str, value: str):
+    return name.lower().encode("latin-1"), value.encode("latin-1")
+
+
+def _route_name(scope) -> str:
+    route = scope.get("route")
+    path = route.path if route is not None else "<unmatched>"
+    return f"{scope['method']} {path}"
+
+
+class QueryProfilerMiddleware:
+    """Pure ASGI middleware, so streaming responses are passed through untouched."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                # The route has been matched and the endpoint has run (or,
+                # for streams, started) by now
+                record_route(_route_name(scope), profile)
+                headers = list(message.get("headers", []))
+                headers.append(_header(QUERY_COUNT_HEADER, str(profile.statements)))
+                headers.append(_header(QUERY_TIME_HEADER, f"{profile.query_ms:.3f}"))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current_profile.reset(token)
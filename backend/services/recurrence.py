@@ -0,0 +1,117 @@
+"""Recurring DayPlans: one template row, occurrences expanded on read.
+
+A ``RecurringPlan`` stores an RFC 5545 RRULE and the first occurrence's
+date. Reads ask for a date range and get the stored DayPlans merged with the
+occurrences of every template that overlaps it. Occurrences are generated by
+``dateutil.rrule`` only inside the range and are never written to
+``day_plans``. An occurrence can be removed from its series with a
+``RecurringPlanException``, either on its own (cancelled) or together with a
+one-off DayPlan that replaces it (edited).
+"""
+from dataclasses import dataclass, field
+from datetime import date, datetime, time
+from typing import List, Optional
+
+from dateutil.rrule import rrulestr
+from sqlalchemy.orm import Session
+
+from backend.database.models import RecurringPlan
+from backend.services import day_plan_repository
+
+
+@dataclass
+class Occurrence:
+    """One expanded occurrence, shaped like a DayPlan (but with no id)."""
+
+    recurring_plan_id: int
+    title: str
+    mode: str
+    date: date
+    start_time: time
+    end_time: time
+    location: Optional[str] = None
+    description: Optional[str] = None
+    attendees: List[str] = field(default_factory=list)
+    status: Optional[str] = None
+    id: Optional[int] = None
+    daily_record_id: Optional[int] = None
+
+
+def parse_rule(rule: str, dtstart: date, start_time: time = time.min):
+    """Parse an RRULE value anchored at ``dtstart``; raises ValueError if invalid."""
+    rule = rule.strip()
+    if rule.upper().startswith("RRULE:"):
+        rule = rule[len("RRULE:"):]
+    if not rule or "\n" in rule or "DTSTART" in rule.upper():
+        raise ValueError("Expected a single RRULE value without DTSTART")
+    return rrulestr(rule, dtstart=datetime.combine(dtstart, start_time))
+
+
+def last_occurrence(rule: str, dtstart: date) -> Optional[date]:
+    """Date of a bounded rule's final occurrence, or None if it repeats forever."""
+    parsed = parse_rule(rule, dtstart)
+    parts = {part.split("=", 1)[0].strip().upper() for part in rule.split(";")}
+    if not parts & {"COUNT", "UNTIL"}:
+        return None
+    last = None
+    for last in parsed:
+        pass
+    return last.date() if last is not None else dtstart
+
+
+def is_occurrence(template: RecurringPlan, day: date) -> bool:
+    rule = parse_rule(template.rrule, template.dtstart, template.start_time)
+    when = datetime.combine(day, template.start_time)
+    return rule.after(when, inc=True) == when
+
+
+def expand(template: RecurringPlan, start: date, end: date, skipped=()) -> List[Occurrence]:
+    """Occurrences of ``template`` dated ``start`` through ``end``, minus ``skipped``."""
+    rule = parse_rule(template.rrule, template.dtstart, template.start_time)
+    occurrences = []
+    for when in rule.xafter(datetime.combine(start, time.min), inc=True):
+        if when.date() > end:
+            break
+        if when.date() in skipped:
+            continue
+        occurrences.append(
+            Occurrence(
+                recurring_plan_id=template.id,
+                title=template.title,
+                mode=template.mode,
+                date=when.date(),
+                start_time=template.start_time,
+                end_time=template.end_time,
+                location=template.location,
+                description=template.description,
+                attendees=template.attendees,
+            )
+        )
+    return occurrences
+
+
+def occurrences_between(db: Session, start: date, end: date) -> List[Occurrence]:
+    templates = day_plan_repository.recurring_plans_between(db, start, end)
+    skipped = day_plan_repository.skipped_dates(db, [t.id for t in templates], start, end)
+    occurrences = []
+    for template in templates:
+        occurrences.extend(expand(template, start, end, skipped.get(template.id, ())))
+    return occurrences
+
+
+def schedule_between(db: Session, start: date, end: date) -> list:
+    """Stored DayPlans and recurring occurrences, by date and start time."""
+    plans = list(day_plan_repository.plans_between(db, start, end))
+    plans.extend(occurrences_between(db, start, end))
+    return sorted(plans, key=lambda p: (p.date, p.start_time, p.id is None, p.id or 0))
+
+
+def schedule_at(db: Session, day: date, at: time):
+    """The earliest-starting plan or occurrence running on ``day`` at ``at``."""
+    candidates = [
+        o for o in occurrences_between(db, day, day) if o.start_time <= at < o.end_time
+    ]
+    plan = day_plan_repository.plan_at(db, day, at)
+    if plan is not None:
+        candidates.append(plan)
+    return min(candidates, key=lambda p: (p.start_time, p.id is None), default=None)
@@ -0,0 +1,118 @@
+"""Gap-based ordering keys for the task queue (``task_order`` table).
+
+Tasks are sorted by an integer ``order`` key spaced ``ORDER_GAP`` apart, so
+appending, deleting or moving a task writes exactly one row: a moved task
+takes the midpoint between its new neighbours. When repeated moves into the
+same spot leave a gap narrower than ``MIN_GAP`` the caller schedules
+``rebalance`` (a single upsert that re-spaces every key) in the background;
+if a gap is fully used up, ``move_task`` rebalances inline first.
+"""
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from backend.database.models import TaskOrder
+
+ORDER_GAP = 1024
+MIN_GAP = 16
+
+# Two bound parameters per row; stay well below SQLite's parameter limit
+_UPSERT_CHUNK_SIZE = 400
+
+
+class MoveConflict(Exception):
+    """The neighbours sent by the client are not adjacent in the stored order."""
+
+
+def set_order(db: Session, task_ids: List[int]) -> None:
+    """Store ``task_ids`` as the queue order with one upsert per chunk."""
+    rows = [
+        {"task_id": task_id, "order": index * ORDER_GAP}
+        for index, task_id in enumerate(task_ids, start=1)
+    ]
+    for i in range(0, len(rows), _UPSERT_CHUNK_SIZE):
+        stmt = insert(TaskOrder).values(rows[i : i + _UPSERT_CHUNK_SIZE])
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[TaskOrder.task_id], set_={"order": stmt.excluded.order}
+            )
+        )
+
+
+def rebalance(db: Session) -> None:
+    """Re-space every key ``ORDER_GAP`` apart, keeping the current order."""
+    task_ids = db.scalars(
+        select(TaskOrder.task_id).order_by(TaskOrder.order, TaskOrder.task_id)
+    ).all()
+    set_order(db, task_ids)
+
+
+def append_key(db: Session) -> int:
+    """Key for a task added at the end of the queue."""
+    return (db.scalar(select(func.max(TaskOrder.order))) or 0) + ORDER_GAP
+
+
+def _order_of(db: Session, task_id: int) -> Optional[int]:
+    return db.scalar(select(TaskOrder.order).where(TaskOrder.task_id == task_id))
+
+
+def _neighbour_key(db: Session, task_id: int, key: int, above: bool) -> Optional[int]:
+    """Key of the task directly above (or below) ``key``, ignoring ``task_id``."""
+    stmt = select(TaskOrder.order).where(TaskOrder.task_id != task_id)
+    if above:
+        stmt = stmt.where(TaskOrder.order < key).order_by(TaskOrder.order.desc())
+    else:
+        stmt = stmt.where(TaskOrder.order > key).order_by(TaskOrder.order)
+    return db.scalar(stmt.limit(1))
+
+
+def _new_key(db: Session, task_id: int, after_id, before_id) -> Tuple[int, int]:
+    """Return (new key, smallest gap left beside it)."""
+    after = _order_of(db, after_id) if after_id is not None else None
+    before = _order_of(db, before_id) if before_id is not None else None
+    if (after_id is not None and after is None) or (before_id is not None and before is None):
+        raise LookupError("Task not found in the queue")
+
+    if after is not None and before is not None:
+        if _neighbour_key(db, task_id, after, above=False) != before:
+            raise MoveConflict(f"Tasks {after_id} and {before_id} are not adjacent")
+    elif after is not None:
+        before = _neighbour_key(db, task_id, after, above=False)
+    else:
+        after = _neighbour_key(db, task_id, before, above=True)
+
+    if after is None:
+        return before - ORDER_GAP, ORDER_GAP
+    if before is None:
+        return after + ORDER_GAP, ORDER_GAP
+    new = (after + before) // 2
+    return new, min(new - after, before - new)
+
+
+def move_task(
+    db: Session,
+    task_id: int,
+    after_id: Optional[int] = None,
+    before_id: Optional[int] = None,
+) -> Tuple[int, bool]:
+    """Place a task directly below ``after_id`` and/or above ``before_id``.
+
+    Only the moved task's row is written. Raises ``LookupError`` for unknown
+    ids and ``MoveConflict`` when both neighbours are given but are no
+    longer adjacent. Returns ``(new key, needs_rebalance)``.
+    """
+    if after_id is None and before_id is None:
+        raise ValueError("A move needs at least one neighbour")
+    row = db.get(TaskOrder, task_id)
+    if row is None:
+        raise LookupError("Task not found in the queue")
+
+    new, gap = _new_key(db, task_id, after_id, before_id)
+    if gap < 1:
+        rebalance(db)
+        db.expire(row)
+        new, gap = _new_key(db, task_id, after_id, before_id)
+    row.order = new
+    return new, gap < MIN_GAP
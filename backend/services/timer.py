@@ -0,0 +1,87 @@
+"""Server-side countdown engine for task timers.
+
+A running task only stores the moment it was (re)started in
+``Task.running_since``. The remaining time is derived on read, so the
+database is written when the timer changes state (start, pause, completion)
+instead of once per second.
+"""
+from datetime import datetime
+
+from tzlocal import get_localzone
+
+from backend.database.models import Task
+
+
+def utcnow() -> datetime:
+    return datetime.utcnow()
+
+
+def local_now() -> datetime:
+    """Wall-clock time in the local zone, as every other ``completed_at`` is stored."""
+    return datetime.now(get_localzone())
+
+
+def is_running(task: Task) -> bool:
+    return task.running_since is not None
+
+
+def elapsed_seconds(task: Task, now: datetime) -> float:
+    """Seconds the timer has been running since it was last started."""
+    if not is_running(task):
+        return 0.0
+    return max(0.0, (now - task.running_since).total_seconds())
+
+
+def remaining_seconds(task: Task, now: datetime) -> float:
+    stored = task.time_remaining_seconds or 0.0
+    return max(0.0, stored - elapsed_seconds(task, now))
+
+
+def total_seconds(task: Task) -> float:
+    """Original length plus every extension granted so far."""
+    extensions = sum(ext.extension_length_seconds or 0.0 for ext in task.extensions)
+    return (task.original_length_seconds or 0.0) + extensions
+
+
+def checkpoint(task: Task, now: datetime) -> None:
+    """Fold the elapsed running time into ``time_remaining_seconds``.
+
+    Call this before anything else modifies the stored remaining time so the
+    running interval is not counted twice.
+    """
+    if not is_running(task):
+        return
+    task.time_remaining_seconds = remaining_seconds(task, now)
+    task.running_since = now
+
+
+def start(task: Task, now: datetime) -> None:
+    if is_running(task) or task.is_complete:
+        return
+    task.running_since = now
+
+
+def pause(task: Task, now: datetime) -> None:
+    if not is_running(task):
+        return
+    task.time_remaining_seconds = remaining_seconds(task, now)
+    task.running_since = None
+
+
+def settle(task: Task, now: datetime) -> bool:
+    """Mark a running task complete once its countdown has reached zero.
+
+    Returns True when the task changed and needs to be committed.
+    """
+    if not is_running(task) or remaining_seconds(task, now) > 0:
+        return False
+    complete(task)
+    return True
+
+
+def complete(task: Task) -> None:
+    """Stop the timer and mark the task complete with nothing left."""
+    task.time_remaining_seconds = 0.0
+    task.running_since = None
+    task.is_complete = True
+    task.completed_at = local_now()
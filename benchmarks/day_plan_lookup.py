@@ -0,0 +1,114 @@
+"""Lookup of one day's plans among a large history, before and after the range rewrite.
+
+Seeds a database with ``--plans`` historical DayPlans spread over past days
+and times how long it takes to fetch a single day's plans with:
+
+- ``func.date``: the old ``date(day_plans.date) = :day`` filter, which
+  cannot use the date index and scans every row;
+- ``range``: the same query as a ``date >= :day AND date < :next`` range,
+  built as a fresh ``select()`` on every call;
+- ``repository``: ``day_plan_repository.plans_on``, the range query as a
+  cached ``lambda_stmt``.
+
+Run from the repository root:
+
+    python -m benchmarks.day_plan_lookup [--plans 100000] [--lookups 500]
+"""
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, time as dtime, timedelta
+from pathlib import Path
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from backend.database.engine import create_sqlite_engine
+from backend.database.models import Base, DayPlan
+from backend.services import day_plan_repository
+
+PLANS_PER_DAY = 12
+
+
+def seed(engine, plan_count, today):
+    rows = []
+    for i in range(plan_count):
+        day = today - timedelta(days=i // PLANS_PER_DAY)
+        hour = 8 + i % PLANS_PER_DAY
+        rows.append(
+            {
+                "title": f"Plan {i}",
+                "mode": "event",
+                "date": day,
+                "start_time": dtime(hour),
+                "end_time": dtime(hour, 45),
+            }
+        )
+    with engine.begin() as conn:
+        conn.execute(insert(DayPlan), rows)
+        conn.exec_driver_sql("ANALYZE")
+    return plan_count // PLANS_PER_DAY
+
+
+def by_func_date(db, day):
+    return db.scalars(
+        select(DayPlan).where(func.date(DayPlan.date) == day).order_by(DayPlan.start_time)
+    ).all()
+
+
+def by_range(db, day):
+    return db.scalars(
+        select(DayPlan)
+        .where(DayPlan.date >= day, DayPlan.date < day + timedelta(days=1))
+        .order_by(DayPlan.date, DayPlan.start_time, DayPlan.id)
+    ).all()
+
+
+def measure(session_factory, lookup, days, lookups, today):
+    rng = random.Random(0)
+    latencies = []
+    with session_factory() as db:
+        for _ in range(lookups):
+            day = today - timedelta(days=rng.randrange(days))
+            started = time.perf_counter()
+            plans = lookup(db, day)
+            latencies.append((time.perf_counter() - started) * 1000)
+            assert len(plans) == PLANS_PER_DAY
+            db.expunge_all()
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(len(latencies) * 0.95)],
+        "mean": statistics.fmean(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--plans", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=500)
+    args = parser.parse_args()
+
+    today = date.today()
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_sqlite_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        Base.metadata.create_all(bind=engine)
+        days = seed(engine, args.plans, today)
+        session_factory = sessionmaker(bind=engine)
+
+        print(f"{args.plans} plans over {days} days, {args.lookups} lookups")
+        print(f"{'query':<12}{'p50 ms':>9}{'p95 ms':>9}{'mean ms':>9}")
+        for name, lookup in (
+            ("func.date", by_func_date),
+            ("range", by_range),
+            ("repository", day_plan_repository.plans_on),
+        ):
+            r = measure(session_factory, lookup, days, args.lookups, today)
+            print(f"{name:<12}{r['p50']:>9.3f}{r['p95']:>9.3f}{r['mean']:>9.3f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
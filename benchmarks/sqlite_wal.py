@@ -0,0 +1,110 @@
+"""Read latency under a concurrent writer, with and without the engine PRAGMAs.
+
+A writer thread keeps updating task timers and committing (as the timer
+engine and calendar worker do) while the main thread times the incomplete
+task query the UI polls. Run from the repository root:
+
+    python -m benchmarks.sqlite_wal [--seconds 5] [--tasks 500]
+"""
+import argparse
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy import update
+from sqlalchemy.orm import sessionmaker
+
+from backend.database.engine import DEFAULT_PRAGMAS, create_sqlite_engine
+from backend.database.models import Base, Task
+
+
+def seed(session_factory, task_count):
+    with session_factory() as db:
+        db.add_all(
+            Task(
+                title=f"Task {i}",
+                description="benchmark",
+                original_length_seconds=1500,
+                time_remaining_seconds=1500,
+            )
+            for i in range(task_count)
+        )
+        db.commit()
+
+
+def writer(session_factory, task_count, stop, counts):
+    task_id = 0
+    while not stop.is_set():
+        task_id = task_id % task_count + 1
+        with session_factory() as db:
+            db.execute(
+                update(Task)
+                .where(Task.id == task_id)
+                .values(time_remaining_seconds=Task.time_remaining_seconds - 1)
+            )
+            db.commit()
+        counts["writes"] += 1
+
+
+def measure(pragmas, seconds, task_count):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_sqlite_engine(
+            f"sqlite:///{Path(tmp) / 'bench.db'}", pragmas=pragmas
+        )
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine)
+        seed(session_factory, task_count)
+
+        stop = threading.Event()
+        counts = {"writes": 0}
+        thread = threading.Thread(
+            target=writer, args=(session_factory, task_count, stop, counts)
+        )
+        thread.start()
+
+        latencies = []
+        errors = 0
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                with session_factory() as db:
+                    db.query(Task).filter(Task.is_complete == False).all()  # noqa: E712
+                latencies.append((time.perf_counter() - started) * 1000)
+            except Exception:
+                errors += 1
+
+        stop.set()
+        thread.join()
+        engine.dispose()
+
+    latencies.sort()
+    return {
+        "reads": len(latencies),
+        "writes": counts["writes"],
+        "errors": errors,
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(len(latencies) * 0.95)],
+        "p99": latencies[int(len(latencies) * 0.99)],
+        "max": latencies[-1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--tasks", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'config':<10}{'reads':>8}{'writes':>8}{'errors':>8}"
+          f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for name, pragmas in (("default", {}), ("tuned", DEFAULT_PRAGMAS)):
+        r = measure(pragmas, args.seconds, args.tasks)
+        print(f"{name:<10}{r['reads']:>8}{r['writes']:>8}{r['errors']:>8}"
+              f"{r['p50']:>9.2f}{r['p95']:>9.2f}{r['p99']:>9.2f}{r['max']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
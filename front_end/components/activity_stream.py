@@ -0,0 +1,126 @@
+import json
+import logging
+import socket
+import threading
+
+import requests
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from front_end.components import api_client
+
+logger = logging.getLogger(__name__)
+
+# The server sends a keep-alive comment every 15 seconds; anything much
+# longer than that without a line means the connection is gone.
+READ_TIMEOUT = 45
+MAX_RECONNECT_DELAY = 30
+
+
+def iter_sse_events(lines):
+    """Parse server-sent event lines into ``(event, data)`` tuples."""
+    event_type, data_lines = "message", []
+    for line in lines:
+        if line is None:
+            continue
+        if not line:
+            if data_lines:
+                yield event_type, "\n".join(data_lines)
+            event_type, data_lines = "message", []
+        elif line.startswith(":"):
+            continue  # Comment / keep-alive
+        else:
+            field, _, value = line.partition(":")
+            value = value[1:] if value.startswith(" ") else value
+            if field == "event":
+                event_type = value
+            elif field == "data":
+                data_lines.append(value)
+
+
+def stream_activities(api_base_url, stop_event=None, on_open=None):
+    """Yield current-activity payloads pushed by the backend until closed.
+
+    ``on_open`` is called with the streaming response once it is connected,
+    so another thread can ``abort`` it.
+    """
+    with api_client.shared_client().session.get(
+        f"{api_base_url}/current-activity/stream",
+        stream=True,
+        timeout=(5, READ_TIMEOUT),
+        headers={"Accept": "text/event-stream"},
+    ) as response:
+        if on_open is not None:
+            on_open(response)
+        response.raise_for_status()
+        for event_type, data in iter_sse_events(
+            response.iter_lines(decode_unicode=True)
+        ):
+            if stop_event is not None and stop_event.is_set():
+                return
+            if event_type == "activity":
+                yield json.loads(data)
+
+
+def abort(response):
+    """Unblock a read on ``response`` from another thread and close it."""
+    connection = getattr(response.raw, "connection", None)
+    sock = getattr(connection, "sock", None)
+    if sock is not None:
+        try:
+            # close() alone does not wake a recv() blocked in another thread
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass  # Already closed
+    response.close()
+
+
+class ActivityStream(QThread):
+    """Subscribes to the backend activity stream and re-emits it on the GUI thread."""
+
+    activity_received = pyqtSignal(dict)
+    connection_lost = pyqtSignal(str)
+
+    def __init__(self, api_base_url, parent=None):
+        super().__init__(parent)
+        self.api_base_url = api_base_url
+        self._stop_event = threading.Event()
+        self._response = None
+        self._response_lock = threading.Lock()
+
+    def _on_open(self, response):
+        with self._response_lock:
+            self._response = response
+            stopped = self._stop_event.is_set()
+        if stopped:
+            abort(response)  # stop() ran while we were connecting
+
+    def run(self):
+        delay = 1
+        while not self._stop_event.is_set():
+            try:
+                for activity in stream_activities(
+                    self.api_base_url, self._stop_event, self._on_open
+                ):
+                    delay = 1
+                    self.activity_received.emit(activity)
+                reason = "stream closed by server"
+            except (requests.RequestException, ValueError, OSError) as e:
+                reason = str(e)
+            finally:
+                with self._response_lock:
+                    self._response = None
+            if self._stop_event.is_set():
+                break
+            logger.warning(f"Activity stream lost ({reason}); reconnecting in {delay}s")
+            self.connection_lost.emit(reason)
+            self._stop_event.wait(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+    def stop(self):
+        """Close the stream and wait for the thread to finish."""
+        with self._response_lock:
+            self._stop_event.set()
+            response = self._response
+        if response is not None:
+            abort(response)
+        self.wait()
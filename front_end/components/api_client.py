@@ -0,0 +1,315 @@
+"""Non-blocking calls to the backend API for the Qt pages.
+
+Pages must not wait on the network on the GUI thread: a slow backend would
+freeze the window and the lock screen with it. Instead they start a request
+and connect to its signals::
+
+    request = api_client.get("/tasks/incomplete", owner=self)
+    request.succeeded.connect(self.on_tasks_loaded)
+    request.failed.connect(self.on_load_failed)
+
+Requests run on a small shared worker pool over one ``requests.Session``,
+so every page reuses the same keep-alive connections to the backend.
+Every request gets ``DEFAULT_TIMEOUT`` unless it passes its own. The
+session's adapter retries with exponential backoff when a connection
+cannot be made, which is safe for any method because nothing was sent.
+Only reads (GET and HEAD) are also retried on a failed read or a
+502/503/504: writes such as the habit toggle would be applied twice.
+The time each request takes, retries included, goes into a latency
+histogram for its endpoint; ``latency_stats()`` returns them and
+``log_latency_stats()`` logs them.
+``succeeded`` carries the decoded JSON body (None when the body is empty)
+and ``failed`` an error message; both are delivered on the GUI thread.
+Connecting right after the call is safe because results are only delivered
+once control returns to the event loop.
+
+A cancelled request never emits. ``cancel_for(owner)`` cancels the reads a
+page started, e.g. when the user navigates away from it. Writes are left
+to finish: dropping one that has not been sent yet would lose the change.
+"""
+import bisect
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import List
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+API_BASE_URL = "http://localhost:8000/api"
+MAX_WORKERS = 4
+DEFAULT_TIMEOUT = (3.05, 10)  # (connect, read) seconds
+RETRIES = 3
+RETRY_BACKOFF = 0.2  # Seconds; doubles with every retry
+RETRY_STATUSES = (502, 503, 504)
+# Methods re-sent after the request may have reached the server
+RETRY_METHODS = frozenset({"GET", "HEAD"})
+
+# Upper bounds of the latency histogram buckets, in milliseconds
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_ID_SEGMENT = re.compile(r"/(\d+|\d{4}-\d{2}-\d{2})(?=/|$)")
+
+
+def endpoint_name(method, path):
+    """``GET /tasks/{id}/timer`` for ``GET /tasks/12/timer``: one entry per route."""
+    path = path.split("?", 1)[0]
+    return f"{method} {_ID_SEGMENT.sub(lambda m: '/{date}' if '-' in m.group(1) else '/{id}', path)}"
+
+
+@dataclass
+class LatencyHistogram:
+    counts: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+    requests: int = 0
+    errors: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def add(self, elapsed_ms, failed=False):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+        self.requests += 1
+        self.errors += failed
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of requests."""
+        wanted = fraction * self.requests
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, self.counts):
+            seen += count
+            if seen >= wanted:
+                return bound
+        return self.max_ms
+
+    def as_dict(self) -> dict:
+        labels = [f"<={bound}" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}"]
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "avg_ms": round(self.total_ms / self.requests, 3),
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "max_ms": round(self.max_ms, 3),
+            "buckets_ms": dict(zip(labels, self.counts)),
+        }
+
+
+class ApiRequest(QObject):
+    """One request in flight; results are emitted on the GUI thread."""
+
+    succeeded = pyqtSignal(object)  # Decoded JSON body, or None if empty
+    failed = pyqtSignal(str)
+
+    # Emitted by the worker; queued to the GUI thread, where ``_deliver``
+    # drops the result if the request was cancelled in the meantime
+    _done = pyqtSignal(object, object, object)  # body, response, error
+
+    def __init__(self, client, method, path, kwargs, owner=None):
+        super().__init__()
+        self.client = client
+        self.method = method
+        self.path = path
+        self.kwargs = kwargs
+        self.owner = owner
+        self.status_code = None
+        self.headers = {}
+        self.cancelled = False
+        self.pending = True  # Until delivered or cancelled
+        self.runnable = None
+        self._done.connect(self._deliver)
+
+    @property
+    def is_read(self):
+        return self.method == "GET"
+
+    def cancel(self):
+        """Stop the request if it has not started, and never emit its result."""
+        if self.cancelled:
+            return
+        self.cancelled = True
+        if self.client.pool.tryTake(self.runnable):
+            self.client.finished(self)  # Never started, so _deliver won't run
+
+    def _deliver(self, body, response, error):
+        self.client.finished(self)
+        if self.cancelled:
+            return
+        if response is not None:
+            self.status_code = response.status_code
+            self.headers = response.headers
+        if error is not None:
+            self.failed.emit(error)
+        else:
+            self.succeeded.emit(body)
+
+
+class _Call(QRunnable):
+    def __init__(self, request):
+        super().__init__()
+        self.setAutoDelete(False)  # Owned by its ApiRequest, not the pool
+        self.request = request
+
+    def run(self):
+        request = self.request
+        if request.cancelled:
+            self._done(None, None, "cancelled")
+            return
+        try:
+            response = request.client.send(request.method, request.path, **request.kwargs)
+            body = response.json() if response.content else None
+        except (requests.RequestException, ValueError) as e:
+            # HTTP errors carry the response, so handlers can see the status
+            self._done(None, getattr(e, "response", None), str(e))
+            return
+        self._done(body, response, None)
+
+    def _done(self, body, response, error):
+        try:
+            self.request._done.emit(body, response, error)
+        except RuntimeError:
+            pass  # The request was destroyed, e.g. the application is exiting
+
+
+class ApiClient:
+    """A worker pool and a keep-alive session shared by every page."""
+
+    def __init__(self, base_url=API_BASE_URL, max_workers=MAX_WORKERS):
+        self.base_url = base_url
+        self.session = requests.Session()
+        retry = Retry(
+            total=RETRIES,
+            backoff_factor=RETRY_BACKOFF,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=RETRY_METHODS,
+            raise_on_status=False,  # Hand the last response to raise_for_status
+        )
+        # One connection per worker, plus one for the long-lived activity stream
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=max_workers + 1, max_retries=retry
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max_workers)
+        self.active = set()  # Keeps requests alive until they are delivered
+        self.latency = {}  # endpoint -> LatencyHistogram
+        self._latency_lock = threading.Lock()
+
+    def url(self, path):
+        return f"{self.base_url}{path}"
+
+    def request(self, method, path, owner=None, **kwargs):
+        """Start ``method path`` on the pool and return its ``ApiRequest``."""
+        request = ApiRequest(self, method.upper(), path, kwargs, owner)
+        request.runnable = _Call(request)
+        self.active.add(request)
+        self.pool.start(request.runnable)
+        return request
+
+    def get(self, path, owner=None, **kwargs):
+        return self.request("GET", path, owner, **kwargs)
+
+    def post(self, path, owner=None, **kwargs):
+        return self.request("POST", path, owner, **kwargs)
+
+    def put(self, path, owner=None, **kwargs):
+        return self.request("PUT", path, owner, **kwargs)
+
+    def delete(self, path, owner=None, **kwargs):
+        return self.request("DELETE", path, owner, **kwargs)
+
+    def send(self, method, path, **kwargs):
+        """Send a request and wait for it, recording its latency."""
+        kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+        started = time.perf_counter()
+        failed = True
+        try:
+            response = self.session.request(method, self.url(path), **kwargs)
+            response.raise_for_status()
+            failed = False
+            return response
+        finally:
+            self.record_latency(
+                endpoint_name(method, path), (time.perf_counter() - started) * 1000, failed
+            )
+
+    def call(self, method, path, **kwargs):
+        """Send a request and wait for it; only for code already off the GUI thread."""
+        return self.send(method.upper(), path, **kwargs)
+
+    def record_latency(self, endpoint, elapsed_ms, failed=False):
+        with self._latency_lock:
+            self.latency.setdefault(endpoint, LatencyHistogram()).add(elapsed_ms, failed)
+
+    def latency_stats(self):
+        with self._latency_lock:
+            return {name: h.as_dict() for name, h in sorted(self.latency.items())}
+
+    def log_latency_stats(self):
+        for name, stats in self.latency_stats().items():
+            logger.info(
+                f"{name}: {stats['requests']} requests, {stats['errors']} failed, "
+                f"p50 <={stats['p50_ms']} ms, p95 <={stats['p95_ms']} ms, "
+                f"max {stats['max_ms']} ms"
+            )
+
+    def cancel_for(self, owner):
+        """Cancel the reads started by ``owner`` or its children; writes still complete."""
+        for request in list(self.active):
+            if request.is_read and _owned_by(request.owner, owner):
+                request.cancel()
+
+    def finished(self, request):
+        if request in self.active:
+            self.active.discard(request)
+            request.pending = False
+            request.deleteLater()
+
+
+def _owned_by(obj, owner):
+    while obj is not None:
+        if obj is owner:
+            return True
+        obj = obj.parent()
+    return False
+
+
+_client = None
+
+
+def shared_client():
+    global _client
+    if _client is None:
+        _client = ApiClient()
+    return _client
+
+
+def get(path, owner=None, **kwargs):
+    return shared_client().get(path, owner, **kwargs)
+
+
+def post(path, owner=None, **kwargs):
+    return shared_client().post(path, owner, **kwargs)
+
+
+def put(path, owner=None, **kwargs):
+    return shared_client().put(path, owner, **kwargs)
+
+
+def delete(path, owner=None, **kwargs):
+    return shared_client().delete(path, owner, **kwargs)
+
+
+def call(method, path, **kwargs):
+    return shared_client().call(method, path, **kwargs)
+
+
+def cancel_for(owner):
+    shared_client().cancel_for(owner)
@@ -0,0 +1,135 @@
+"""Pages of a QStackedWidget built on first use.
+
+Every slot of the stack starts as an empty placeholder, so page indices stay
+fixed while the pages themselves are only constructed when they are first
+shown (or preloaded). Building a page also runs its ``connect`` hook, which
+wires its signals to the coordinator.
+
+``preload`` builds pages the user is likely to visit next, one per event
+loop turn, so input is handled between them. Pages registered with an
+``unload_after`` are dropped back to a placeholder once they have been
+hidden that long, unless they report ``has_unsaved_changes()``; they are
+built again on the next visit.
+"""
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from PyQt5.QtCore import QObject, QTimer
+from PyQt5.QtWidgets import QWidget
+
+from front_end.components import api_client
+
+logger = logging.getLogger(__name__)
+
+UNLOAD_CHECK_INTERVAL_MS = 60_000
+
+
+@dataclass
+class PageSpec:
+    build: Callable[[], QWidget]
+    connect: Optional[Callable[[QWidget], None]] = None
+    unload_after: Optional[float] = None  # Seconds hidden before it may be dropped
+
+
+class PageRegistry(QObject):
+    def __init__(self, stack, specs, prebuilt=None, parent=None):
+        super().__init__(parent)
+        self.stack = stack
+        self.specs = specs
+        self.pages = dict(prebuilt or {})  # index -> built page
+        self.hidden_since = {}  # index -> time.monotonic() when last hidden
+        self._preload_queue = []
+
+        for index in range(len(specs)):
+            if index not in self.pages:
+                self.stack.insertWidget(index, QWidget())
+        self.stack.currentChanged.connect(self._on_current_changed)
+
+        self._unload_timer = QTimer(self)
+        self._unload_timer.timeout.connect(self.unload_idle)
+        self._unload_timer.start(UNLOAD_CHECK_INTERVAL_MS)
+
+    def __len__(self):
+        return len(self.specs)
+
+    def is_built(self, index):
+        return index in self.pages
+
+    def get(self, index):
+        """The page at ``index``, built now if it has not been yet."""
+        page = self.pages.get(index)
+        if page is None:
+            page = self._build(index)
+        return page
+
+    def _build(self, index):
+        spec = self.specs[index]
+        started = time.perf_counter()
+        page = spec.build()
+        self._swap(index, page)
+        self.pages[index] = page
+        if index != self.stack.currentIndex():
+            self.hidden_since[index] = time.monotonic()  # Preloaded, not shown yet
+        if spec.connect is not None:
+            spec.connect(page)
+        logger.debug(
+            f"Built page {index} ({type(page).__name__}) in "
+            f"{(time.perf_counter() - started) * 1000:.1f} ms"
+        )
+        return page
+
+    def _swap(self, index, widget):
+        """Put ``widget`` in slot ``index`` without changing the current page."""
+        current = self.stack.currentIndex()
+        old = self.stack.widget(index)
+        self.stack.blockSignals(True)
+        self.stack.removeWidget(old)
+        self.stack.insertWidget(index, widget)
+        self.stack.setCurrentIndex(current)
+        self.stack.blockSignals(False)
+        old.deleteLater()
+
+    def preload(self, indices):
+        """Build the given pages in the background, one per event loop turn."""
+        for index in indices:
+            if 0 <= index < len(self) and index not in self.pages:
+                if index not in self._preload_queue:
+                    self._preload_queue.append(index)
+        if self._preload_queue:
+            QTimer.singleShot(0, self._preload_next)
+
+    def _preload_next(self):
+        while self._preload_queue:
+            index = self._preload_queue.pop(0)
+            if index not in self.pages:
+                self._build(index)
+                break
+        if self._preload_queue:
+            QTimer.singleShot(0, self._preload_next)
+
+    def _on_current_changed(self, index):
+        self.hidden_since.pop(index, None)
+        now = time.monotonic()
+        for built in self.pages:
+            if built != index:
+                self.hidden_since.setdefault(built, now)
+
+    def unload_idle(self):
+        """Drop pages that have been hidden longer than their ``unload_after``."""
+        now = time.monotonic()
+        current = self.stack.currentIndex()
+        for index, page in list(self.pages.items()):
+            unload_after = self.specs[index].unload_after
+            if unload_after is None or index == current:
+                continue
+            if now - self.hidden_since.get(index, now) < unload_after:
+                continue
+            if getattr(page, "has_unsaved_changes", lambda: False)():
+                continue
+            api_client.cancel_for(page)
+            self._swap(index, QWidget())
+            del self.pages[index]
+            self.hidden_since.pop(index, None)
+            logger.debug(f"Unloaded idle page {index} ({type(page).__name__})")
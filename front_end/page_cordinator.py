@@ -10,9 +10,9 @@ from PyQt5.QtWidgets import (
 )
 import multiprocessing
 from PyQt5.QtCore import Qt, QTimer, QObject, pyqtSignal
-from front_end.pages import welcome, schedule, queue_app, event_timer, completion_page, google_login
-from front_end.pages.journal import JournalApp
-import requests
+from front_end.components import api_client
+from front_end.components.activity_stream import ActivityStream
+from front_end.components.page_registry import PageRegistry, PageSpec
 from lock_screen import LockScreen
 import time
 import os
@@ -21,6 +21,63 @@ import os
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# Pages worth building in the background once a page is shown, because the
+# flow usually goes there next
+LIKELY_NEXT_PAGES = {
+    1: [2],  # Welcome -> journal
+    2: [3],  # Journal -> schedule
+    3: [4],  # Schedule -> queue
+    4: [5],  # Queue -> event timer
+    5: [6, 4],  # Event timer -> completion or back to the queue
+    6: [4],  # Completion -> queue
+}
+# Heavy pages are dropped after being hidden this long and rebuilt on return
+UNLOAD_AFTER_SECONDS = 10 * 60
+
+
+def build_google_login():
+    # QtWebEngine is slow to import and only needed before the first sign-in
+    from front_end.pages import google_login
+
+    return google_login.GoogleAuthView()
+
+
+def build_welcome():
+    from front_end.pages import welcome
+
+    return welcome.WelcomePage()
+
+
+def build_journal():
+    from front_end.pages.journal import JournalApp
+
+    return JournalApp()
+
+
+def build_schedule():
+    from front_end.pages import schedule
+
+    return schedule.TimeBlockingApp()
+
+
+def build_queue():
+    from front_end.pages import queue_app
+
+    return queue_app.TaskQueue()
+
+
+def build_event_timer():
+    from front_end.pages import event_timer
+
+    return event_timer.CircularTimer(lock_in_mode=False)
+
+
+def build_completion():
+    from front_end.pages import completion_page
+
+    return completion_page.CompletionForm()
+
+
 class PageCoordinator(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -37,19 +94,29 @@ class PageCoordinator(QMainWindow):
         self.stacked_widget = QStackedWidget()
         main_layout.addWidget(self.stacked_widget)
 
-        # Initialize only Google login page
-        self.google_auth_view = google_login.GoogleAuthView()
-        self.stacked_widget.addWidget(self.google_auth_view)
+        # Pages are built when first shown (or preloaded), not all up front
+        self.pages = PageRegistry(
+            self.stacked_widget,
+            [
+                PageSpec(build_google_login, self.connect_google_login),  # index 0
+                PageSpec(build_welcome, self.connect_welcome),  # index 1
+                PageSpec(build_journal, self.connect_journal),  # index 2
+                PageSpec(
+                    build_schedule, self.connect_schedule, unload_after=UNLOAD_AFTER_SECONDS
+                ),  # index 3
+                PageSpec(build_queue, self.connect_queue),  # index 4
+                PageSpec(build_event_timer, self.connect_event_timer),  # index 5
+                PageSpec(build_completion, self.connect_completion),  # index 6
+            ],
+            parent=self,
+        )
 
-        self.setup_initial_connections()
         self.check_google_token()
 
-    def setup_initial_connections(self):
-        self.google_auth_view.auth_finished.connect(self.on_google_login_success)
-
     def check_google_token(self):
         if not os.path.exists('token.json'):
             logger.debug("token.json not found. Showing Google Login page.")
+            self.pages.get(0)
             self.stacked_widget.setCurrentIndex(0)  # Show Google Login page
         else:
             logger.debug("token.json found. Initializing app.")
@@ -57,71 +124,61 @@ class PageCoordinator(QMainWindow):
 
     def on_google_login_success(self):
         logger.debug("Google Login successful. Initializing app.")
-        self.set_current_page(1)  # Set to the welcome page after login (index 1)
         self.initialize_app()
+        self.set_current_page(1)  # Set to the welcome page after login (index 1)
 
     def initialize_app(self):
-        # Import other modules here
-        from front_end.pages import welcome, schedule, queue_app, event_timer, completion_page
-        from front_end.pages.journal import JournalApp
         from lock_screen import LockScreen
-        import requests
-
-        # Initialize other pages
-        self.pages = [
-            self.google_auth_view,  # index 0
-            welcome.WelcomePage(),  # index 1
-            JournalApp(),  # index 2
-            schedule.TimeBlockingApp(),  # index 3
-            queue_app.TaskQueue(),  # index 4
-            event_timer.CircularTimer(lock_in_mode=False),  # index 5
-            completion_page.CompletionForm(),  # index 6
-        ]
-
-        # Add other pages to the stacked widget
-        for page in self.pages[1:]:
-            self.stacked_widget.addWidget(page)
 
         self.lock_screen = LockScreen(self)
         self.locked_pages = [1, 2, 3]  # Pages where Lock Screen should be active
 
-        self.setup_connections()
-        self.api_base_url = "http://localhost:8000/api"
-        self.check_activity_timer = QTimer(self)
-        self.check_activity_timer.timeout.connect(self.check_current_activity)
-        self.check_activity_timer.start(5000)  # Check every 5 seconds
+        self.api_base_url = api_client.API_BASE_URL
 
         # Store the last known activity
         self.current_activity = None
 
-        # Start by checking the current activity
-        self.check_current_activity()
-
-    def setup_connections(self):
-        self.pages[1].continue_button.clicked.connect(self.next_page)
-        self.pages[2].journal_completed.connect(self.next_page)
-        self.pages[3].complete_button.clicked.connect(self.next_page)
-        self.pages[4].get_to_work_button.clicked.connect(self.show_event_timer)
-        self.pages[5].timerComplete.connect(self.show_completion)
-        self.pages[5].changeActivityRequested.connect(self.show_queue)
-        self.pages[6].yes_button.clicked.connect(self.show_queue)
-    def check_current_activity(self):
-        try:
-            response = requests.get(f"{self.api_base_url}/current-activity")
-            if response.status_code == 200:
-                data = response.json()
-                if data != self.current_activity:
-                    logger.debug(f"Activity changed: {data}")
-                    self.current_activity = data
-                    self.handle_activity(data, from_check=True)
-                else:
-                    logger.debug("Activity unchanged, not handling.")
-            else:
-                logger.error(
-                    f"Failed to get current activity. Status code: {response.status_code}"
-                )
-        except requests.RequestException as e:
-            logger.error(f"Error checking current activity: {str(e)}")
+        # The backend pushes the current activity on connect and whenever it
+        # changes, so there is no need to poll.
+        self.activity_stream = ActivityStream(self.api_base_url, self)
+        self.activity_stream.activity_received.connect(self.on_activity_received)
+        self.activity_stream.start()
+
+    def connect_google_login(self, page):
+        page.auth_finished.connect(self.on_google_login_success)
+
+    def connect_welcome(self, page):
+        page.continue_button.clicked.connect(self.next_page)
+
+    def connect_journal(self, page):
+        page.journal_completed.connect(self.next_page)
+
+    def connect_schedule(self, page):
+        page.complete_button.clicked.connect(self.next_page)
+
+    def connect_queue(self, page):
+        page.get_to_work_button.clicked.connect(self.show_event_timer)
+
+    def connect_event_timer(self, page):
+        page.timerComplete.connect(self.show_completion)
+        page.changeActivityRequested.connect(self.show_queue)
+
+    def connect_completion(self, page):
+        page.yes_button.clicked.connect(self.show_queue)
+
+    def on_activity_received(self, data):
+        if data != self.current_activity:
+            logger.debug(f"Activity changed: {data}")
+            self.current_activity = data
+            self.handle_activity(data, from_check=True)
+        else:
+            logger.debug("Activity unchanged, not handling.")
+
+    def closeEvent(self, event):
+        if hasattr(self, "activity_stream"):
+            self.activity_stream.stop()
+        api_client.shared_client().log_latency_stats()
+        super().closeEvent(event)
 
     def handle_activity(self, activity_data, from_check=False):
         activity_type = activity_data["activity_type"]
@@ -146,7 +203,7 @@ class PageCoordinator(QMainWindow):
         logger.debug(f"Showing event: {event_info}")
         if self.stacked_widget.currentIndex() == 4:
             # If already on event timer, update the info
-            self.pages[4].fetch_task()
+            self.pages.get(4).fetch_task()
         else:
             # Otherwise, set the info and switch to event timer
             self.set_current_page(4, from_check)
@@ -186,7 +243,11 @@ class PageCoordinator(QMainWindow):
             logger.debug(f"Already on page {page_number}, not changing.")
             return
 
+        # Whatever the page we leave was still loading is no longer wanted
+        api_client.cancel_for(self.stacked_widget.currentWidget())
+        self.pages.get(page_number)
         self.stacked_widget.setCurrentIndex(page_number)
+        self.pages.preload(LIKELY_NEXT_PAGES.get(page_number, []))
 
         # Manage LockScreen state
         if page_number in self.locked_pages:
@@ -195,22 +256,19 @@ class PageCoordinator(QMainWindow):
             self.lock_screen.deactivate()
 
         if not from_check:
-            try:
-                response = requests.put(
-                    f"{self.api_base_url}/current-activity/set-page",
-                    json={"page_number": page_number},
-                    timeout=5,  # Add a timeout to prevent hanging
-                )
-                if response.status_code != 200:
-                    logger.error(
-                        f"Failed to set page. Status code: {response.status_code}"
-                    )
-                    self.show_error_message(
-                        "Failed to update the current activity on the server."
-                    )
-            except requests.RequestException as e:
-                logger.error(f"Error setting page: {str(e)}")
-                self.show_error_message("Failed to communicate with the server.")
+            request = api_client.put(
+                "/current-activity/set-page",
+                json={"page_number": page_number},
+                timeout=5,  # Add a timeout to prevent hanging
+            )
+            request.failed.connect(lambda error: self.on_set_page_failed(request, error))
+
+    def on_set_page_failed(self, request, error):
+        logger.error(f"Error setting page: {error}")
+        if request.status_code is not None:
+            self.show_error_message("Failed to update the current activity on the server.")
+        else:
+            self.show_error_message("Failed to communicate with the server.")
 
     def show_error_message(self, message):
         QMessageBox.critical(self, "Error", message)
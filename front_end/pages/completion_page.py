@@ -12,7 +12,8 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QFont
 import sys
-import requests
+
+from front_end.components import api_client
 
 
 class CompletionForm(QMainWindow):
@@ -21,6 +22,7 @@ class CompletionForm(QMainWindow):
 
     def __init__(self):
         super().__init__()
+        self.task_id = None  # The task being asked about, set by the caller
         self.init_ui()
 
     def init_ui(self):
@@ -121,29 +123,25 @@ class CompletionForm(QMainWindow):
             )
 
             # Make API request to extend the task
-            response = self.extend_task(extension_length)
+            request = self.extend_task(extension_length)
 
-            if response.status_code == 200:
+            def on_extended(_):
                 self.add_time.emit(additional_seconds)
                 self.close()
-            else:
-                QMessageBox.warning(
-                    self, "Error", f"Failed to extend task: {response.text}"
+
+            request.succeeded.connect(on_extended)
+            request.failed.connect(
+                lambda error: QMessageBox.warning(
+                    self, "Error", f"Failed to extend task: {error}"
                 )
+            )
         except ValueError:
             self.time_input.setText("Please enter a valid number")
             self.time_input.setStyleSheet("border: 2px solid red;")
 
     def extend_task(self, extension_length):
-        api_url = f"http://your-api-url/tasks/{self.task_id}/extend"  # Replace with your actual API URL
         payload = {"extension_length": extension_length}
-
-        try:
-            response = requests.post(api_url, json=payload)
-            return response
-        except requests.RequestException as e:
-            print(f"Error making API request: {e}")
-            return None
+        return api_client.post(f"/tasks/{self.task_id}/extend", json=payload)
 
 
 if __name__ == "__main__":
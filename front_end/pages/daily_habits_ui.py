@@ -1,7 +1,7 @@
 import sys
-import requests
 from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QLabel, QHBoxLayout
 from PyQt5.QtCore import Qt
+from front_end.components import api_client
 from front_end.components.table_components import (
     FlexibleTable,
     ActionButton,
@@ -9,25 +9,23 @@ from front_end.components.table_components import (
     run_app,
 )
 
-API_BASE_URL = (
-    "http://localhost:8000/api"  
-)
-
 
 class DailyHabitsUI(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.habits = self.load_habits()
+        self.habits = []
         self.init_ui()
+        self.load_habits()
 
     def load_habits(self):
-        try:
-            response = requests.get(f"{API_BASE_URL}/habits/today")
-            data = response.json()
-            return data["habits"]
-        except requests.RequestException as e:
-            print(f"Error loading habits: {e}")
-            return []
+        """Fetch today's habits and fill the table when they arrive."""
+        request = api_client.get("/habits/today", owner=self)
+        request.succeeded.connect(self.on_habits_loaded)
+        request.failed.connect(lambda error: print(f"Error loading habits: {error}"))
+
+    def on_habits_loaded(self, data):
+        self.habits = data["habits"]
+        self.populate_habit_table()
 
     def init_ui(self):
         layout = QVBoxLayout(self)
@@ -82,9 +80,8 @@ class DailyHabitsUI(QWidget):
         self.populate_habit_table()  # Refresh the table to show the updated status
 
     def refresh_habits(self):
-        self.habits = self.load_habits()
-        self.populate_habit_table()
-        print("Habits refreshed")
+        self.load_habits()
+        print("Habits refresh requested")
 
 
 def main():
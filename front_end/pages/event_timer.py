@@ -1,5 +1,5 @@
 import sys
-import requests
+import time
 from PyQt5.QtWidgets import (
     QApplication,
     QWidget,
@@ -20,7 +20,11 @@ from PyQt5.QtCore import (
 )
 from datetime import timedelta
 
-API_BASE_URL = "http://localhost:8000/api"
+from front_end.components import api_client
+
+# The countdown ticks locally; the server is only asked for the
+# authoritative remaining time every RECONCILE_INTERVAL seconds.
+RECONCILE_INTERVAL = 30
 
 
 class CircularProgressBar(QWidget):
@@ -75,6 +79,10 @@ class CircularTimer(QWidget):
         self.lock_in_mode = lock_in_mode
         self.task = None
         self.is_paused = True
+        self.total_seconds = 0
+        self.deadline = None  # time.monotonic() value at which the timer hits zero
+        self.ticks_since_reconcile = 0
+        self.timer_request = None  # Latest request for the task's timer state
         self.init_ui()
         self.fetch_task()
 
@@ -147,103 +155,120 @@ class CircularTimer(QWidget):
         self.setMinimumSize(350, 450)
         self.setWindowTitle("Work Mode Timer")
 
-    def fetch_task(self):
-        try:
-            response = requests.get(f"{API_BASE_URL}/tasks/incomplete")
-            response.raise_for_status()
-            tasks = response.json()
+    def fetch_task(self, on_loaded=None):
+        """Load the next task; ``on_loaded`` runs once there is one."""
+        request = api_client.get("/tasks/incomplete", owner=self)
+
+        def loaded(tasks):
             if tasks:
                 self.task = min(tasks, key=lambda x: x["id"])
                 self.task_label.setText(self.task["title"])
-
-                time_remaining = self.parse_time(self.task["time_remaining"])
-                self.time_label.setText(self.format_time(time_remaining))
-
-                # Calculate total time including extensions
-                original_length = self.parse_time(self.task["original_length"])
-                extension_time = sum(
-                    (
-                        self.parse_time(ext["extension_length"])
-                        for ext in self.task["extensions"]
-                    ),
-                    timedelta(),
-                )
-                total_time = original_length + extension_time
-
-                # Set initial progress
-                progress = 1 - (
-                    time_remaining.total_seconds() / total_time.total_seconds()
-                )
-                self.progress_bar.setValue(progress)
-
                 self.pause_button.setEnabled(True)
+                if on_loaded:
+                    on_loaded()  # Its response carries the timer state
+                else:
+                    self.reconcile()
             else:
+                self.task = None
                 self.taskFetchError.emit("No tasks available")
                 self.task_label.setText("No tasks available")
                 self.pause_button.setEnabled(False)
-        except requests.RequestException as e:
-            self.taskFetchError.emit(str(e))
+
+        def failed(error):
+            self.taskFetchError.emit(error)
             self.task_label.setText("Error fetching task")
             self.pause_button.setEnabled(False)
 
+        request.succeeded.connect(loaded)
+        request.failed.connect(failed)
+
+    def apply_timer_state(self, state):
+        """Adopt the server's view of the countdown."""
+        self.total_seconds = state["total_time"]
+        remaining = state["time_remaining"]
+        self.deadline = time.monotonic() + remaining
+        self.ticks_since_reconcile = 0
+        self.show_remaining(remaining)
+
+        if state["is_running"] and self.is_paused:
+            # The timer kept running on the server (e.g. after a relaunch)
+            self.timer.start(1000)
+            self.pause_button.setText("Pause")
+            self.is_paused = False
+        elif not state["is_running"] and not self.is_paused:
+            self.timer.stop()
+            self.is_paused = True
+
+        if state["is_complete"]:
+            self.timer.stop()
+            self.is_paused = True
+            self.pause_button.setText("Restart")
+            self.complete_task()
+            self.timerComplete.emit()
+
+    def send_timer_request(self, method, action=""):
+        task_id = self.task["id"]
+        path = f"/tasks/{task_id}/timer"
+        if action:
+            path = f"{path}/{action}"
+        request = api_client.shared_client().request(method, path, owner=self, timeout=5)
+
+        def on_state(state):
+            if self.task and self.task["id"] == task_id:
+                self.apply_timer_state(state)
+
+        request.succeeded.connect(on_state)
+        self.timer_request = request
+        return request
+
+    def reconcile(self):
+        if not self.task or (self.timer_request and self.timer_request.pending):
+            return
+        request = self.send_timer_request("GET")
+        # Keep ticking locally; the next reconcile will catch up
+        request.failed.connect(lambda error: print(f"Error reconciling task timer: {error}"))
+
+    def show_remaining(self, remaining_seconds):
+        remaining_seconds = max(0, remaining_seconds)
+        self.time_label.setText(self.format_time(timedelta(seconds=remaining_seconds)))
+        if self.total_seconds:
+            self.progress_bar.setValue(1 - remaining_seconds / self.total_seconds)
+
     def update_time(self):
-        if self.task and not self.is_paused:
-            try:
-                response = requests.put(
-                    f"{API_BASE_URL}/tasks/{self.task['id']}/decrement-time"
-                )
-                response.raise_for_status()
-                updated_task = response.json()
-                print(updated_task)  # For debugging
-
-                time_remaining = timedelta(seconds=updated_task["time_remaining"])
-                self.time_label.setText(self.format_time(time_remaining))
-
-                total_time = timedelta(seconds=updated_task["total_time"])
-                progress = 1 - (
-                    time_remaining.total_seconds() / total_time.total_seconds()
-                )
-                self.progress_bar.setValue(progress)
-
-                if time_remaining == timedelta(seconds=0):
-                    self.timer.stop()
-                    self.pause_button.setText("Restart")
-                    self.complete_task()
-                    self.timerComplete.emit()
-
-                # Update the task information
-                self.task = updated_task
-
-            except requests.RequestException as e:
-                print(f"Error decrementing task time: {e}")
-                self.timer.stop()
-                self.pause_button.setText("Resume")
-                self.is_paused = True
+        if not self.task or self.is_paused or self.deadline is None:
+            return
+        remaining = int(round(self.deadline - time.monotonic()))
+        self.show_remaining(remaining)
+        self.ticks_since_reconcile += 1
+        if remaining <= 0 or self.ticks_since_reconcile >= RECONCILE_INTERVAL:
+            self.reconcile()
 
     def toggle_pause(self):
+        # A reconcile still in flight would report the state before this change
+        api_client.cancel_for(self)
         if self.is_paused:
-            if not self.task:
-                self.fetch_task()
             if self.task:
-                self.timer.start(1000)
-                self.pause_button.setText("Pause")
-                self.is_paused = False
+                self.resume()
+            else:
+                self.fetch_task(on_loaded=self.resume)
         else:
             self.timer.stop()
             self.pause_button.setText("Resume")
             self.is_paused = True
+            request = self.send_timer_request("PUT", "pause")
+            request.failed.connect(lambda error: print(f"Error pausing task timer: {error}"))
+
+    def resume(self):
+        # The returned state is running, so apply_timer_state starts the countdown
+        request = self.send_timer_request("PUT", "resume")
+        request.failed.connect(lambda error: print(f"Error starting task timer: {error}"))
 
     def complete_task(self):
+        # The server marks the task complete once its countdown reaches zero;
+        # move on to the next task in the queue.
         if self.task:
-            try:
-                response = requests.put(
-                    f"{API_BASE_URL}/tasks/{self.task['id']}/complete"
-                )
-                response.raise_for_status()
-                print(f"Task {self.task['id']} completed successfully.")
-                self.fetch_task()
-            except requests.RequestException as e:
-                print(f"Error completing task: {e}")
+            print(f"Task {self.task['id']} completed successfully.")
+            self.fetch_task()
 
     def redirect_to_work_queue(self, event):
         self.changeActivityRequested.emit()
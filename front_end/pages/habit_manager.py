@@ -1,6 +1,4 @@
 import sys
-import requests
-import time
 from PyQt5.QtWidgets import (
     QApplication,
     QWidget,
@@ -13,6 +11,7 @@ from PyQt5.QtWidgets import (
     QInputDialog,
 )
 from PyQt5.QtCore import Qt
+from front_end.components import api_client
 from front_end.components.table_components import (
     FlexibleTable,
     COMMON_STYLES,
@@ -20,24 +19,25 @@ from front_end.components.table_components import (
     TableLineEdit,
 )
 
-API_BASE_URL = "http://localhost:8000/api"
-
 
 class HabitManagerUI(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.habits = self.load_habits()
+        self.habits = []
         self.init_ui()
+        self.load_habits()
 
     def load_habits(self):
-        try:
-            response = requests.get(f"{API_BASE_URL}/habits/today")
-            data = response.json()
-            print("API Response:", data)  # Add this line to print the response
-            return data.get("habits", [])  # Use .get() with a default value
-        except requests.RequestException as e:
-            print(f"Error loading habits: {e}")
-            return []
+        """Fetch today's habits and fill the table when they arrive."""
+        api_client.cancel_for(self)  # Only the latest load matters
+        request = api_client.get("/habits/today", owner=self)
+        request.succeeded.connect(self.on_habits_loaded)
+        request.failed.connect(lambda error: print(f"Error loading habits: {error}"))
+
+    def on_habits_loaded(self, data):
+        print("API Response:", data)  # Add this line to print the response
+        self.habits = data.get("habits", [])  # Use .get() with a default value
+        self.habit_table.populate_table(self.habits)
 
     def init_ui(self):
         layout = QVBoxLayout(self)
@@ -99,20 +99,22 @@ class HabitManagerUI(QWidget):
         name = self.new_habit_name.text().strip()
         associated_app = self.new_habit_app.text().strip()
         if name:
-            try:
-                response = requests.post(
-                    f"{API_BASE_URL}/habits",
-                    json={"name": name, "associated_app": associated_app},
-                )
-                response.raise_for_status()
+            request = api_client.post(
+                "/habits", json={"name": name, "associated_app": associated_app}
+            )
+
+            def on_added(_):
                 QMessageBox.information(self, "Success", "Habit added successfully.")
 
                 self.refresh_habits()
 
                 self.new_habit_name.clear()
                 self.new_habit_app.clear()
-            except requests.RequestException as e:
-                QMessageBox.critical(self, "Error", f"Failed to add habit: {str(e)}")
+
+            request.succeeded.connect(on_added)
+            request.failed.connect(
+                lambda error: QMessageBox.critical(self, "Error", f"Failed to add habit: {error}")
+            )
         else:
             QMessageBox.warning(self, "Invalid Input", "Habit name cannot be empty.")
 
@@ -132,16 +134,18 @@ class HabitManagerUI(QWidget):
             habit.get("associated_app", ""),
         )
         if ok1 and ok2 and new_name.strip():
-            try:
-                response = requests.put(
-                    f"{API_BASE_URL}/habits/{habit['id']}",
-                    json={"name": new_name.strip(), "associated_app": new_app.strip()},
+            request = api_client.put(
+                f"/habits/{habit['id']}",
+                json={"name": new_name.strip(), "associated_app": new_app.strip()},
+            )
+            request.succeeded.connect(
+                lambda _: self.on_habit_saved("Habit updated successfully.")
+            )
+            request.failed.connect(
+                lambda error: QMessageBox.critical(
+                    self, "Error", f"Failed to update habit: {error}"
                 )
-                response.raise_for_status()
-                QMessageBox.information(self, "Success", "Habit updated successfully.")
-                self.refresh_habits()
-            except requests.RequestException as e:
-                QMessageBox.critical(self, "Error", f"Failed to update habit: {str(e)}")
+            )
         elif not new_name.strip():
             QMessageBox.warning(self, "Invalid Input", "Habit name cannot be empty.")
 
@@ -154,33 +158,37 @@ class HabitManagerUI(QWidget):
             QMessageBox.No,
         )
         if reply == QMessageBox.Yes:
-            try:
-                response = requests.put(
-                    f"{API_BASE_URL}/habits/{habit['id']}",
-                    json={"delete": True},
+            request = api_client.put(f"/habits/{habit['id']}", json={"delete": True})
+            request.succeeded.connect(
+                lambda _: self.on_habit_saved("Habit deleted successfully.")
+            )
+            request.failed.connect(
+                lambda error: QMessageBox.critical(
+                    self, "Error", f"Failed to delete habit: {error}"
                 )
-                response.raise_for_status()
-                QMessageBox.information(self, "Success", "Habit deleted successfully.")
-                self.refresh_habits()
-            except requests.RequestException as e:
-                QMessageBox.critical(self, "Error", f"Failed to delete habit: {str(e)}")
+            )
+
+    def on_habit_saved(self, message):
+        QMessageBox.information(self, "Success", message)
+        self.refresh_habits()
 
     def toggle_habit_status(self, row, key, completed):
         habit = self.habits[row]
-        try:
-            response = requests.put(f"{API_BASE_URL}/habits/{habit['id']}/complete")
-            response.raise_for_status()
+        request = api_client.put(f"/habits/{habit['id']}/complete")
+
+        def on_toggled(_):
             habit[key] = completed
-            self.habits[row] = habit
-        except requests.RequestException as e:
-            QMessageBox.critical(
-                self, "Error", f"Failed to update habit status: {str(e)}"
+
+        request.succeeded.connect(on_toggled)
+        request.failed.connect(
+            lambda error: QMessageBox.critical(
+                self, "Error", f"Failed to update habit status: {error}"
             )
+        )
 
     def refresh_habits(self):
-        time.sleep(0.1)  # Small delay to ensure server-side updates are complete
-        self.habits = self.load_habits()
-        self.habit_table.populate_table(self.habits)
+        # The write has been answered before this runs, so no delay is needed
+        self.load_habits()
 
 
 def main():
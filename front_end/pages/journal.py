@@ -1,5 +1,4 @@
 import sys
-import requests
 from PyQt5.QtWidgets import (
     QWidget,
     QVBoxLayout,
@@ -19,7 +18,11 @@ from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QFont
 from datetime import datetime
 
-API_BASE_URL = "http://localhost:8000/api"
+from front_end.components import api_client
+
+JOURNAL_PAGE_SIZE = 30
+# Fetch the next page when the list is scrolled this close to the bottom
+LOAD_MORE_THRESHOLD = 3
 
 
 class DeleteButton(QPushButton):
@@ -84,6 +87,11 @@ class EntryList(QWidget):
         self.list_widget = QListWidget()
         self.list_widget.setSpacing(2)
         self.list_widget.itemClicked.connect(self.on_item_clicked)
+        scroll_bar = self.list_widget.verticalScrollBar()
+        scroll_bar.valueChanged.connect(self.load_more_if_needed)
+        # Also when the list grows or the window is resized
+        scroll_bar.rangeChanged.connect(self.load_more_if_needed)
+        self.next_cursor = None
         layout.addWidget(self.list_widget)
 
         button_layout = QHBoxLayout()
@@ -137,15 +145,42 @@ class EntryList(QWidget):
         self.fetch_journals()
 
     def fetch_journals(self):
-        try:
-            response = requests.get(f"{API_BASE_URL}/journals")
-            journals = response.json()
-            self.list_widget.clear()
-            if journals:
-                for journal in journals:
-                    self.add_entry(journal)
-        except requests.RequestException as e:
-            QMessageBox.critical(self, "Error", f"Failed to fetch journals: {str(e)}")
+        """Reload the list from the newest entry; older pages load on scroll."""
+        api_client.cancel_for(self)  # Pages of the old list are no longer wanted
+        self.list_widget.clear()
+        self.next_cursor = None
+        self.fetch_journal_page()
+
+    def fetch_journal_page(self, cursor=None):
+        params = {"limit": JOURNAL_PAGE_SIZE}
+        if cursor:
+            params["cursor"] = cursor
+        request = api_client.get("/journals", owner=self, params=params)
+
+        def on_loaded(journals):
+            self.next_cursor = request.headers.get("X-Next-Cursor")
+            for journal in journals or []:
+                self.add_entry(journal)
+            self.load_more_if_needed()
+
+        def on_failed(error):
+            self.next_cursor = cursor
+            QMessageBox.critical(self, "Error", f"Failed to fetch journals: {error}")
+
+        request.succeeded.connect(on_loaded)
+        request.failed.connect(on_failed)
+
+    def load_more_if_needed(self, *_):
+        """Fetch the next page near the bottom, or while the list has no scrollbar yet."""
+        if not self.next_cursor:
+            return
+        # Lay out entries just added so the scrollbar range is current; that
+        # can re-enter here through rangeChanged and start the fetch itself
+        self.list_widget.doItemsLayout()
+        scroll_bar = self.list_widget.verticalScrollBar()
+        if self.next_cursor and scroll_bar.value() >= scroll_bar.maximum() - LOAD_MORE_THRESHOLD:
+            cursor, self.next_cursor = self.next_cursor, None  # One fetch at a time
+            self.fetch_journal_page(cursor)
 
     def add_entry(self, entry):
         item = QListWidgetItem(self.list_widget)
@@ -168,26 +203,22 @@ class EntryList(QWidget):
         )
 
         if reply == QMessageBox.Yes:
-            try:
-                response = requests.delete(f"{API_BASE_URL}/journals/{journal_id}")
-                if response.status_code == 200:
-                    row = self.list_widget.row(item)
+            request = api_client.delete(f"/journals/{journal_id}")
+
+            def on_deleted(_):
+                row = self.list_widget.row(item)
+                if row >= 0:
                     self.list_widget.takeItem(row)
-                    QMessageBox.information(
-                        self, "Success", "Journal entry deleted successfully."
-                    )
-                else:
-                    QMessageBox.warning(
-                        self,
-                        "Error",
-                        f"Failed to delete journal entry. Server responded with status code {response.status_code}",
-                    )
-            except requests.RequestException as e:
-                QMessageBox.critical(
+                QMessageBox.information(self, "Success", "Journal entry deleted successfully.")
+
+            request.succeeded.connect(on_deleted)
+            request.failed.connect(
+                lambda error: QMessageBox.critical(
                     self,
                     "Error",
-                    f"An error occurred while trying to delete the journal entry: {str(e)}",
+                    f"An error occurred while trying to delete the journal entry: {error}",
                 )
+            )
 
     def on_item_clicked(self, item):
         entry = item.data(Qt.UserRole)
@@ -247,23 +278,21 @@ class JournalEditor(QWidget):
 
     def set_content(self, journal):
         self.current_journal_id = journal["id"]
-        try:
-            response = requests.get(
-                f"{API_BASE_URL}/journals/{self.current_journal_id}"
+        api_client.cancel_for(self)  # Only the latest selection is shown
+        request = api_client.get(f"/journals/{self.current_journal_id}", owner=self)
+        request.succeeded.connect(self.show_journal)
+        request.failed.connect(
+            lambda error: QMessageBox.critical(
+                self, "Error", f"Failed to fetch journal details: {error}"
             )
-            if response.status_code == 200:
-                journal_detail = response.json()
-                for section in journal_detail["sections"]:
-                    if section["header"] in self.editors:
-                        self.editors[section["header"]].setPlainText(section["content"])
-                    else:
-                        print(f"no secftions for {journal_detail}")
+        )
+
+    def show_journal(self, journal_detail):
+        for section in journal_detail["sections"]:
+            if section["header"] in self.editors:
+                self.editors[section["header"]].setPlainText(section["content"])
             else:
-                QMessageBox.warning(self, "Error", "Failed to fetch journal details.")
-        except requests.RequestException as e:
-            QMessageBox.critical(
-                self, "Error", f"Failed to fetch journal details: {str(e)}"
-            )
+                print(f"no secftions for {journal_detail}")
 
     def get_content(self):
         return [
@@ -311,44 +340,37 @@ class JournalApp(QMainWindow):
         self.journal_editor.set_content(entry)
 
     def create_new_entry(self):
-        try:
-            response = requests.post(f"{API_BASE_URL}/journals", json={"sections": []})
-            if response.status_code == 200:
-                new_journal = response.json()
-                self.entry_list.fetch_journals()  # Refresh the list to include the new entry
-                QMessageBox.information(
-                    self, "Success", "New journal entry created successfully!"
-                )
-            else:
-                QMessageBox.warning(
-                    self, "Error", "Failed to create new journal entry."
-                )
-        except requests.RequestException as e:
-            QMessageBox.critical(
-                self, "Error", f"Failed to create new journal entry: {str(e)}"
+        request = api_client.post("/journals", json={"sections": []})
+
+        def on_created(_):
+            self.entry_list.fetch_journals()  # Refresh the list to include the new entry
+            QMessageBox.information(self, "Success", "New journal entry created successfully!")
+
+        request.succeeded.connect(on_created)
+        request.failed.connect(
+            lambda error: QMessageBox.critical(
+                self, "Error", f"Failed to create new journal entry: {error}"
             )
+        )
 
     def save_changes(self):
 
         sections = self.journal_editor.get_content()
 
-        try:
-            # Note: The provided API doesn't have an update endpoint, so we're using POST here.
-            # In a real application, you'd want to implement a PUT or PATCH endpoint for updates.
-            response = requests.post(
-                f"{API_BASE_URL}/journals", json={"sections": sections}
-            )
-            if response.status_code == 200:
-                QMessageBox.information(
-                    self, "Success", "Journal entry updated successfully!"
-                )
-            else:
-                QMessageBox.warning(self, "Error", "Faileƒd to update journal entry.")
-        except requests.RequestException as e:
-            QMessageBox.critical(
-                self, "Error", f"Failed to update journal entry: {str(e)}"
-            )
-        self.journal_completed.emit()  # Emit the completion signal
+        # Note: The provided API doesn't have an update endpoint, so we're using POST here.
+        # In a real application, you'd want to implement a PUT or PATCH endpoint for updates.
+        request = api_client.post("/journals", json={"sections": sections})
+
+        def on_saved(_):
+            QMessageBox.information(self, "Success", "Journal entry updated successfully!")
+            self.journal_completed.emit()  # Emit the completion signal
+
+        def on_failed(error):
+            QMessageBox.critical(self, "Error", f"Failed to update journal entry: {error}")
+            self.journal_completed.emit()
+
+        request.succeeded.connect(on_saved)
+        request.failed.connect(on_failed)
 
 
 if __name__ == "__main__":
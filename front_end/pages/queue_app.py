@@ -1,5 +1,5 @@
+import logging
 import sys
-import requests
 from PyQt5.QtWidgets import (
     QApplication,
     QWidget,
@@ -10,18 +10,34 @@ from PyQt5.QtWidgets import (
     QLabel,
     QScrollArea,
     QTextEdit,
-    QListWidget,
-    QListWidgetItem,
+    QListView,
+    QAbstractItemView,
+    QStyledItemDelegate,
+    QStyle,
     QMessageBox,
 )
-from PyQt5.QtCore import Qt, QSize
-from PyQt5.QtGui import QFont
+from PyQt5.QtCore import (
+    Qt,
+    QSize,
+    QRect,
+    QEvent,
+    QModelIndex,
+    QAbstractListModel,
+    pyqtSignal,
+)
+from PyQt5.QtGui import QFont, QColor
 import datetime
 from datetime import timedelta
 from datetime import datetime
 import dateutil.parser
 
-API_BASE_URL = "http://localhost:8000/api"
+from front_end.components import api_client
+
+logger = logging.getLogger(__name__)
+
+TASK_PAGE_SIZE = 25
+# Fetch the next page when the list is scrolled this close to the bottom
+LOAD_MORE_THRESHOLD = 3
 
 
 class Task:
@@ -42,82 +58,207 @@ class Task:
         hours, minutes, seconds = map(int, time_str.split(":"))
         return timedelta(hours=hours, minutes=minutes, seconds=seconds)
 
-    def __str__(self):
+    def remaining_text(self):
         hours, remainder = divmod(self.time_remaining.seconds, 3600)
         minutes, _ = divmod(remainder, 60)
-        return f"{self.title} - {hours}h {minutes}m"
+        return f"{hours}h {minutes}m"
 
+    def __str__(self):
+        return f"{self.title} - {self.remaining_text()}"
 
-class TaskItem(QWidget):
-    def __init__(self, task, parent=None):
-        super().__init__(parent)
-        self.task = task
-        self.init_ui()
 
-    def init_ui(self):
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(10, 5, 10, 5)
+class TaskListModel(QAbstractListModel):
+    """The queued tasks, in queue order.
 
-        self.name_label = QLabel(self.task.title)
-        self.name_label.setStyleSheet(
-            """
-            font-size: 14px;
-            color: #D4D4D4;
-            background-color: transparent;
-            padding: 2px 0;
-            line-height: 1.4;
-            """
+    Changes go through ``append``, ``remove`` and ``move`` so the view only
+    lays out and repaints the rows involved, instead of every row being
+    rebuilt whenever one task changes.
+    """
+
+    TaskRole = Qt.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.tasks = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.tasks)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        task = self.tasks[index.row()]
+        if role == Qt.DisplayRole:
+            return str(task)
+        if role == self.TaskRole:
+            return task
+        return None
+
+    def flags(self, index):
+        flags = super().flags(index) | Qt.ItemIsDropEnabled
+        if index.isValid():
+            flags |= Qt.ItemIsDragEnabled
+        return flags
+
+    def supportedDropActions(self):
+        return Qt.MoveAction
+
+    def reset(self, tasks):
+        self.beginResetModel()
+        self.tasks = list(tasks)
+        self.endResetModel()
+
+    def append(self, tasks):
+        if not tasks:
+            return
+        first = len(self.tasks)
+        self.beginInsertRows(QModelIndex(), first, first + len(tasks) - 1)
+        self.tasks.extend(tasks)
+        self.endInsertRows()
+
+    def remove(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        task = self.tasks.pop(row)
+        self.endRemoveRows()
+        return task
+
+    def move(self, old_row, new_row):
+        """Move the task at ``old_row`` so that it ends up at ``new_row``."""
+        if old_row == new_row:
+            return False
+        # Qt wants the destination as the row the task is inserted before,
+        # counted before the move
+        destination = new_row + 1 if new_row > old_row else new_row
+        if not self.beginMoveRows(QModelIndex(), old_row, old_row, QModelIndex(), destination):
+            return False
+        self.tasks.insert(new_row, self.tasks.pop(old_row))
+        self.endMoveRows()
+        return True
+
+
+class TaskItemDelegate(QStyledItemDelegate):
+    """Paints a task row: title, remaining time and, on hover, a remove button."""
+
+    removeRequested = pyqtSignal(object)
+
+    ROW_HEIGHT = 30
+    BUTTON_SIZE = 16
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.title_font = QFont("Arial")
+        self.title_font.setPixelSize(14)
+        self.time_font = QFont("Arial")
+        self.time_font.setPixelSize(12)
+        self.button_font = QFont("Arial", 12, QFont.Bold)
+        self.title_color = QColor("#D4D4D4")
+        self.time_color = QColor("#569CD6")
+        self.background = QColor("#1E1E1E")
+        self.hover_background = QColor("#2A2A2A")
+        self.selected_background = QColor("#2D2D2D")
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def button_rect(self, rect):
+        return QRect(
+            rect.right() - 10 - self.BUTTON_SIZE,
+            rect.center().y() - self.BUTTON_SIZE // 2,
+            self.BUTTON_SIZE,
+            self.BUTTON_SIZE,
         )
-        layout.addWidget(self.name_label)
 
-        hours, remainder = divmod(self.task.time_remaining.seconds, 3600)
-        minutes, _ = divmod(remainder, 60)
-        time_str = f"{hours}h {minutes}m"
-        self.time_label = QLabel(time_str)
-        self.time_label.setStyleSheet(
-            """
-            font-size: 12px;
-            color: #569CD6;
-            background-color: transparent;
-            padding: 2px 0;
-            line-height: 1.4;
-            """
+    def paint(self, painter, option, index):
+        task = index.data(TaskListModel.TaskRole)
+        rect = option.rect
+        hovered = bool(option.state & QStyle.State_MouseOver)
+
+        painter.save()
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(rect, self.selected_background)
+        elif hovered:
+            painter.fillRect(rect, self.hover_background)
+        else:
+            painter.fillRect(rect, self.background)
+
+        text_rect = rect.adjusted(10, 0, -(20 + self.BUTTON_SIZE), 0)
+        painter.setFont(self.title_font)
+        painter.setPen(self.title_color)
+        title = painter.fontMetrics().elidedText(
+            task.title, Qt.ElideRight, text_rect.width() * 3 // 4
+        )
+        painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignVCenter, title)
+
+        title_width = painter.fontMetrics().horizontalAdvance(title)
+        painter.setFont(self.time_font)
+        painter.setPen(self.time_color)
+        painter.drawText(
+            text_rect.adjusted(title_width + 6, 0, 0, 0),
+            Qt.AlignLeft | Qt.AlignVCenter,
+            task.remaining_text(),
         )
-        layout.addWidget(self.time_label)
 
-        layout.addStretch()
+        if hovered:
+            painter.setFont(self.button_font)
+            painter.setPen(self.title_color)
+            painter.drawText(self.button_rect(rect), Qt.AlignCenter, "×")
+        painter.restore()
 
-        self.remove_button = QPushButton("×")
-        self.remove_button.setFixedSize(QSize(16, 16))
-        self.remove_button.setFont(QFont("Arial", 12, QFont.Bold))
-        self.remove_button.setStyleSheet(
-            """
-            QPushButton {
-                background-color: transparent;
-                color: #D4D4D4;
-                border: none;
-            }
-            QPushButton:hover {
-                background-color: rgba(255, 255, 255, 0.1);
-            }
-            """
-        )
-        self.remove_button.hide()
-        layout.addWidget(self.remove_button)
+    def editorEvent(self, event, model, option, index):
+        if (
+            event.type() == QEvent.MouseButtonRelease
+            and event.button() == Qt.LeftButton
+            and self.button_rect(option.rect).contains(event.pos())
+        ):
+            self.removeRequested.emit(index.data(TaskListModel.TaskRole))
+            return True
+        return super().editorEvent(event, model, option, index)
 
-        self.setStyleSheet("background-color: transparent;")
 
-    def enterEvent(self, event):
-        self.remove_button.show()
+class TaskListView(QListView):
+    """Drag-to-reorder list that moves rows in the model itself.
 
-    def leaveEvent(self, event):
-        self.remove_button.hide()
+    The default internal move drops a copy of the rows and then removes the
+    originals; here a drop is a single ``TaskListModel.move``, which
+    the model reports as one ``rowsMoved``.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setDragDropMode(QAbstractItemView.InternalMove)
+        self.setDefaultDropAction(Qt.MoveAction)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setUniformItemSizes(True)
+        self.setMouseTracking(True)
+        self.viewport().setAttribute(Qt.WA_Hover)
+
+    def dropEvent(self, event):
+        if event.source() is not self or not self.currentIndex().isValid():
+            event.ignore()
+            return
+        old_row = self.currentIndex().row()
+        target = self.indexAt(event.pos())
+        if not target.isValid():
+            new_row = self.model().rowCount() - 1
+        else:
+            new_row = target.row()
+            if self.dropIndicatorPosition() == QAbstractItemView.BelowItem:
+                new_row += 1
+            if new_row > old_row:
+                new_row -= 1
+        self.model().move(old_row, new_row)
+        # The rows are already moved; stop the drag from removing the source
+        event.setDropAction(Qt.IgnoreAction)
+        event.accept()
+        self.stopAutoScroll()
+        self.setState(QAbstractItemView.NoState)
+        self.viewport().update()
 
 
 class TaskQueue(QWidget):
     def __init__(self):
         super().__init__()
-        self.tasks = []
+        self.next_cursor = None
         self.initUI()
         self.load_tasks()
         self.load_latest_notes()
@@ -146,26 +287,18 @@ class TaskQueue(QWidget):
         input_layout.addWidget(self.add_button)
 
         # Task list
-        self.task_list = QListWidget()
-        self.task_list.setDragDropMode(QListWidget.InternalMove)
+        self.task_model = TaskListModel(self)
+        self.task_delegate = TaskItemDelegate(self)
+        self.task_delegate.removeRequested.connect(self.remove_task)
+        self.task_list = TaskListView()
+        self.task_list.setModel(self.task_model)
+        self.task_list.setItemDelegate(self.task_delegate)
         self.task_list.setStyleSheet(
             """
-            QListWidget {
+            QListView {
                 background-color: #252526;
                 border: 1px solid #3C3C3C;
             }
-            QListWidget::item {
-                background-color: #1E1E1E;
-                border-radius: 0px;
-                margin-bottom: 0px;
-                padding: 0px 0;
-            }
-            QListWidget::item:selected {
-                background-color: #2D2D2D;
-            }
-            QListWidget::item:hover {
-                background-color: #2A2A2A;
-            }
         """
         )
 
@@ -285,82 +418,122 @@ class TaskQueue(QWidget):
         """
         )
 
-        # Connect the model's row moved signal to update task order
-        self.task_list.model().rowsMoved.connect(self.update_task_order)
+        # A drag-and-drop inside the list ends in rowsMoved; send just that move
+        self.task_model.rowsMoved.connect(self.on_rows_moved)
+        scroll_bar = self.task_list.verticalScrollBar()
+        scroll_bar.valueChanged.connect(self.load_more_if_needed)
+        # Also when the list grows or the window is resized
+        scroll_bar.rangeChanged.connect(self.load_more_if_needed)
 
     def load_latest_notes(self):
-        try:
-            response = requests.get(f"{API_BASE_URL}/latest")
-            response.raise_for_status()
-            data = response.json()
-            print(data)
-
-            if data.get("latest_reminder"):
-                self.latest_reminder_text.setText(data["latest_reminder"]["content"])
-            else:
-                self.latest_reminder_text.setText("Add reminders here.")
-
-            if data.get("latest_goal"):
-                goal = data["latest_goal"]
-                self.latest_todo_text.setText(goal["content"])
-
-            else:
-                self.latest_todo_text.setText("Add your goals here.")
-        except requests.RequestException as e:
-            QMessageBox.critical(
-                self, "Error", f"Failed to load latest notes: {str(e)}"
+        request = api_client.get("/latest", owner=self)
+        request.succeeded.connect(self.show_latest_notes)
+        request.failed.connect(
+            lambda error: QMessageBox.critical(
+                self, "Error", f"Failed to load latest notes: {error}"
             )
+        )
+
+    def show_latest_notes(self, data):
+        if data.get("latest_reminder"):
+            self.latest_reminder_text.setText(data["latest_reminder"]["content"])
+        else:
+            self.latest_reminder_text.setText("Add reminders here.")
+
+        if data.get("latest_goal"):
+            goal = data["latest_goal"]
+            self.latest_todo_text.setText(goal["content"])
+
+        else:
+            self.latest_todo_text.setText("Add your goals here.")
 
     def save_notes(self, event):
         reminder_content = self.latest_reminder_text.toPlainText()
         todo_content = self.latest_todo_text.toPlainText()
-        print(reminder_content)
-        try:
-            # Update reminder
-            if reminder_content:
-                reminder_response = requests.post(
-                    f"{API_BASE_URL}/reminders", json={"content": reminder_content}
+        pending_saves = []
+        if reminder_content:
+            pending_saves.append(
+                api_client.post("/reminders", json={"content": reminder_content})
+            )
+        if todo_content:
+            pending_saves.append(api_client.post("/goals", json={"content": todo_content}))
+
+        def on_saved(_):
+            pending_saves.pop()
+            if not pending_saves:
+                QMessageBox.information(self, "Success", "Notes saved successfully!")
+
+        for request in pending_saves:
+            request.succeeded.connect(on_saved)
+            request.failed.connect(
+                lambda error: QMessageBox.critical(
+                    self, "Error", f"Failed to save notes: {error}"
                 )
-                reminder_response.raise_for_status()
+            )
+        # The saves finish in the background; closing never waits on them
+        event.accept()
 
-            # Update goal
-            if todo_content:
-                goal_response = requests.post(
-                    f"{API_BASE_URL}/goals",
-                    json={"content": todo_content},
-                )
-                goal_response.raise_for_status()
-
-            # If both updates are successful, accept the close event
-            QMessageBox.information(self, "Success", "Notes saved successfully!")
-            event.accept()
-        except requests.RequestException as e:
-            # If there's an error, show a message and ignore the close event
-            QMessageBox.critical(self, "Error", f"Failed to save notes: {str(e)}")
-            event.ignore()
+    @staticmethod
+    def parse_tasks(data):
+        return [
+            Task(
+                t["id"],
+                t["title"],
+                t["description"],
+                t["time_remaining"],
+                t["time_created"],
+                t.get("completed_at"),
+            )
+            for t in data
+        ]
 
-        event.accept()
+    def fetch_task_page(self, cursor=None):
+        params = {"limit": TASK_PAGE_SIZE}
+        if cursor:
+            params["cursor"] = cursor
+        return api_client.get("/tasks/incomplete", owner=self.task_list, params=params)
 
     def load_tasks(self):
-        try:
-            response = requests.get(f"{API_BASE_URL}/tasks/incomplete")
-            response.raise_for_status()
-            tasks_data = response.json()
-            self.tasks = [
-                Task(
-                    t["id"],
-                    t["title"],
-                    t["description"],
-                    t["time_remaining"],
-                    t["time_created"],
-                    t.get("completed_at"),
-                )
-                for t in tasks_data
-            ]
-            self.update_task_list()
+        api_client.cancel_for(self.task_list)  # A reload supersedes pages still loading
+        request = self.fetch_task_page()
+
+        def on_loaded(data):
+            self.next_cursor = request.headers.get("X-Next-Cursor")
+            self.task_model.reset(self.parse_tasks(data))
             self.update_total_time()
-        except requests.RequestException as e:
-            QMessageBox.critical(self, "Error", f"Failed to load tasks: {str(e)}")
+            self.load_more_if_needed()
+
+        request.succeeded.connect(on_loaded)
+        request.failed.connect(
+            lambda error: QMessageBox.critical(self, "Error", f"Failed to load tasks: {error}")
+        )
+
+    def load_more_tasks(self):
+        cursor, self.next_cursor = self.next_cursor, None  # One fetch at a time
+        request = self.fetch_task_page(cursor)
+
+        def on_loaded(data):
+            self.next_cursor = request.headers.get("X-Next-Cursor")
+            self.task_model.append(self.parse_tasks(data))
+            self.load_more_if_needed()
+
+        def on_failed(error):
+            self.next_cursor = cursor
+            QMessageBox.critical(self, "Error", f"Failed to load tasks: {error}")
+
+        request.succeeded.connect(on_loaded)
+        request.failed.connect(on_failed)
+
+    def load_more_if_needed(self, *_):
+        """Fetch the next page near the bottom, or while the list has no scrollbar yet."""
+        if not self.next_cursor:
+            return
+        # Lay out rows just added so the scrollbar range is current; that can
+        # re-enter here through rangeChanged and start the fetch itself
+        self.task_list.doItemsLayout()
+        scroll_bar = self.task_list.verticalScrollBar()
+        if self.next_cursor and scroll_bar.value() >= scroll_bar.maximum() - LOAD_MORE_THRESHOLD:
+            self.load_more_tasks()
 
     def add_task(self):
         title = self.task_input.text()
@@ -377,88 +550,80 @@ class TaskQueue(QWidget):
 
         if title and (hours > 0 or minutes > 0):
             original_length = f"{hours:02d}:{minutes:02d}:00"
-            try:
-                response = requests.post(
-                    f"{API_BASE_URL}/tasks",
-                    json={
-                        "title": title,
-                        "description": f"Task duration: {hours} hours and {minutes} minutes",
-                        "original_length": original_length,
-                    },
-                )
-                response.raise_for_status()
-                new_task = response.json()
-                self.tasks.append(
-                    Task(
-                        new_task["id"],
-                        new_task["title"],
-                        new_task["description"],
-                        new_task["time_remaining"],
-                        new_task["time_created"],
-                        new_task.get("completed_at"),
-                    )
-                )
-                self.update_task_list()
-                self.update_total_time()
+            request = api_client.post(
+                "/tasks",
+                json={
+                    "title": title,
+                    "description": f"Task duration: {hours} hours and {minutes} minutes",
+                    "original_length": original_length,
+                },
+            )
+            request.succeeded.connect(self.on_task_added)
+            request.failed.connect(
+                lambda error: QMessageBox.critical(self, "Error", f"Failed to add task: {error}")
+            )
 
-                self.task_input.clear()
-                self.hours_input.clear()
-                self.minutes_input.clear()
-            except requests.RequestException as e:
-                QMessageBox.critical(self, "Error", f"Failed to add task: {str(e)}")
+    def on_task_added(self, new_task):
+        # New tasks go to the end of the queue; while later pages are
+        # still unloaded it will show up with the last one
+        if not self.next_cursor:
+            self.task_model.append(self.parse_tasks([new_task]))
+        self.update_total_time()
 
-    def remove_task(self, list_item):
-        row = self.task_list.row(list_item)
-        task = self.tasks[row]
-        try:
-            response = requests.delete(f"{API_BASE_URL}/tasks/{task.id}")
-            response.raise_for_status()
-            self.tasks.pop(row)
-            self.task_list.takeItem(row)
-            self.update_total_time()
-            self.update_task_order()
-        except requests.RequestException as e:
-            QMessageBox.critical(self, "Error", f"Failed to remove task: {str(e)}")
+        self.task_input.clear()
+        self.hours_input.clear()
+        self.minutes_input.clear()
 
-    def update_task_order(self):
-        new_order = []
-        for i in range(self.task_list.count()):
-            item = self.task_list.item(i)
-            task_item = self.task_list.itemWidget(item)
-            new_order.append(task_item.task.id)
+    def remove_task(self, task):
+        request = api_client.delete(f"/tasks/{task.id}")
 
-        try:
-            response = requests.put(
-                f"{API_BASE_URL}/tasks/reorder", json={"task_ids": new_order}
-            )
-            response.raise_for_status()
-        except requests.RequestException as e:
-            QMessageBox.critical(
-                self, "Error", f"Failed to update task order: {str(e)}"
-            )
+        def on_removed(_):
+            # Look the row up now: rows above may have moved since the click
+            if task in self.task_model.tasks:
+                self.task_model.remove(self.task_model.tasks.index(task))
+                self.update_total_time()
 
-    def update_task_list(self):
-        self.task_list.clear()
-        for task in self.tasks:
-            item_widget = TaskItem(task)
-            list_item = QListWidgetItem(self.task_list)
-            list_item.setSizeHint(item_widget.sizeHint())
-            self.task_list.addItem(list_item)
-            self.task_list.setItemWidget(list_item, item_widget)
-            item_widget.remove_button.clicked.connect(
-                lambda: self.remove_task(list_item)
-            )
+        request.succeeded.connect(on_removed)
+        request.failed.connect(
+            lambda error: QMessageBox.critical(self, "Error", f"Failed to remove task: {error}")
+        )
+
+    def on_rows_moved(self, parent, start, end, destination, row):
+        # Qt reports the destination row as it was before the move
+        self.move_task(row if row < start else row - 1)
+
+    def move_task(self, new_index):
+        """Send a task the model just moved, and its new neighbours, to the backend."""
+        tasks = self.task_model.tasks
+        task = tasks[new_index]
+
+        neighbours = {}
+        if new_index > 0:
+            neighbours["after_id"] = tasks[new_index - 1].id
+        if new_index < len(tasks) - 1:
+            neighbours["before_id"] = tasks[new_index + 1].id
+        if not neighbours:
+            return
+
+        request = api_client.put(f"/tasks/{task.id}/move", json=neighbours)
+        request.failed.connect(self.on_move_failed)
+
+    def on_move_failed(self, error):
+        QMessageBox.critical(self, "Error", f"Failed to update task order: {error}")
+        # Our view of the queue is stale; show the server's order again
+        self.load_tasks()
 
     def update_total_time(self):
-        total_seconds = sum(task.time_remaining.total_seconds() for task in self.tasks)
-        hours, remainder = divmod(int(total_seconds), 3600)
+        # From the server: only some pages of the queue may be loaded here
+        request = api_client.get("/tasks/incomplete/summary", owner=self)
+        request.succeeded.connect(self.show_total_time)
+        request.failed.connect(lambda error: logger.error(f"Failed to load queue total: {error}"))
+
+    def show_total_time(self, summary):
+        hours, remainder = divmod(summary["time_remaining_seconds"], 3600)
         minutes, _ = divmod(remainder, 60)
         self.total_time_label.setText(f"Total time: {hours} hours {minutes} minutes")
 
-    def dropEvent(self, event):
-        super().dropEvent(event)
-        self.update_task_order()
-
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
@@ -1,5 +1,8 @@
 import sys
 import logging
+import time
+from bisect import bisect_right, insort
+from dataclasses import dataclass
 from PyQt5.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -15,29 +18,286 @@ from PyQt5.QtWidgets import (
     QScrollArea,
     QColorDialog,
     QFrame,
+    QStackedWidget,
+    QComboBox,
 )
 from PyQt5.QtCore import (
     Qt,
     QDate,
     QTime,
     QRect,
+    QObject,
+    QThread,
+    QTimer,
     pyqtSignal,
     QPropertyAnimation,
     QEasingCurve,
 )
-from PyQt5.QtGui import QPainter, QColor, QPen, QBrush, QFont
+from PyQt5.QtGui import QPainter, QColor, QPen, QBrush, QFont, QFontMetrics
 import requests
 
-API_BASE_URL = "http://localhost:8000/api"
+from front_end.components import api_client
 
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# Days on either side of the shown day kept loaded, so stepping between days
+# or opening the week view is served from memory
+PREFETCH_DAYS = 7
+# Cached days older than this are still shown, then refreshed in the background
+CACHE_TTL_SECONDS = 60
+
+# Moves are sent this long after the last change, so a burst of edits becomes
+# one request per block
+FLUSH_DELAY_MS = 400
+
+# Repeat choices offered when adding an activity, as RRULE values
+REPEAT_RULES = {
+    "Does not repeat": None,
+    "Every day": "FREQ=DAILY",
+    "Every weekday": "FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR",
+    "Every week": "FREQ=WEEKLY",
+}
+
+
+def format_activity(activity):
+    return {
+        "id": activity["id"],
+        "title": activity["title"],
+        "date": activity["date"],
+        "start_time": activity["start_time"],
+        "end_time": activity["end_time"],
+        "description": activity.get("description", ""),
+        "mode": activity.get("mode", "event"),
+        "status": activity.get("status", "pending"),
+        # Set for occurrences of a recurring plan, which have no id of their own
+        "recurring_plan_id": activity.get("recurring_plan_id"),
+    }
+
+
+def iso(qdate):
+    return qdate.toString(Qt.ISODate)
+
+
+def activity_key(activity):
+    """Identity of a block: its DayPlan id, or its series and date for an occurrence."""
+    if activity.get("id") is not None:
+        return ("plan", activity["id"])
+    return ("occurrence", activity["recurring_plan_id"], activity["date"])
+
+
+class DayPlanCache:
+    """Day plans by ISO date, with when each day was loaded."""
+
+    def __init__(self):
+        self._days = {}  # iso date -> (loaded_at, [plan, ...])
+        self._pending = set()
+
+    def get(self, day):
+        entry = self._days.get(day)
+        return entry[1] if entry else None
+
+    def is_fresh(self, day):
+        entry = self._days.get(day)
+        return entry is not None and time.monotonic() - entry[0] < CACHE_TTL_SECONDS
+
+    def needs_fetch(self, days):
+        return [d for d in days if d not in self._pending and not self.is_fresh(d)]
+
+    def mark_pending(self, days):
+        self._pending.update(days)
+
+    def store(self, days, plans):
+        """Replace every day in ``days``; days without plans are cached as empty."""
+        loaded_at = time.monotonic()
+        by_day = {day: [] for day in days}
+        for plan in plans:
+            by_day.setdefault(plan["date"], []).append(plan)
+        for day, day_plans in by_day.items():
+            self._days[day] = (loaded_at, day_plans)
+        self._pending.difference_update(days)
+
+    def discard_pending(self, days):
+        self._pending.difference_update(days)
+
+    def clear(self):
+        """Forget every loaded day, e.g. after a change that spans many days."""
+        self._days.clear()
+
+    def update_times(self, activity):
+        """Copy an activity's start and end time into the cached plan it came from."""
+        key = activity_key(activity)
+        for plan in self.get(activity["date"]) or []:
+            if activity_key(plan) == key:
+                plan["start_time"] = activity["start_time"]
+                plan["end_time"] = activity["end_time"]
+
+
+class PlanEditSender(QThread):
+    """Sends one flush of coalesced edits off the GUI thread.
+
+    DayPlan edits go out together in one POST /dayplans/batch; an edited
+    occurrence of a recurring plan is detached with its own PUT, which
+    returns the DayPlan that replaces it.
+    """
+
+    done = pyqtSignal(list)  # [(key, error or None, id of the detached DayPlan or None), ...]
+
+    def __init__(self, edits, parent=None):
+        super().__init__(parent)
+        self.edits = edits  # key -> changes
+
+    def run(self):
+        outcomes = []
+        updates = [(key, changes) for key, changes in self.edits.items() if key[0] == "plan"]
+        if updates:
+            try:
+                response = api_client.call(
+                    "POST",
+                    "/dayplans/batch",
+                    json={
+                        "operations": [
+                            {"op": "update", "id": key[1], "changes": changes}
+                            for key, changes in updates
+                        ]
+                    },
+                    timeout=10,
+                )
+                for (key, _), result in zip(updates, response.json()["results"]):
+                    error = None if result["status"] == 200 else result.get("error") or f"HTTP {result['status']}"
+                    outcomes.append((key, error, None))
+            except (requests.RequestException, ValueError, KeyError) as e:
+                outcomes.extend((key, str(e), None) for key, _ in updates)
+
+        for key, changes in self.edits.items():
+            if key[0] != "occurrence":
+                continue
+            _, recurring_plan_id, day = key
+            try:
+                response = api_client.call(
+                    "PUT",
+                    f"/recurring-plans/{recurring_plan_id}/occurrences/{day}",
+                    json=changes,
+                    timeout=10,
+                )
+                outcomes.append((key, None, response.json()["id"]))
+            except (requests.RequestException, ValueError, KeyError) as e:
+                outcomes.append((key, str(e), None))
+        self.done.emit(outcomes)
+
+
+class ScheduleEditSession(QObject):
+    """Optimistic, coalesced edits of block times.
+
+    The caller has already moved the block on screen; ``move`` only records
+    the new times against the block's last confirmed ones. Repeated moves of
+    the same block overwrite each other, and FLUSH_DELAY_MS after the last
+    move everything pending is sent in one go. Edits the server rejects are
+    reported through ``rolled_back`` with the times to restore.
+
+    Once an occurrence has been detached into a DayPlan, ``detached``
+    reports the new id, and later moves of it are saved as DayPlan edits.
+    """
+
+    rolled_back = pyqtSignal(object, dict, str)  # key, confirmed times, error
+    detached = pyqtSignal(object, int)  # occurrence key, id of the DayPlan replacing it
+    committed = pyqtSignal(list)  # keys saved by the last flush
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pending = {}  # key -> {"changes": {...}, "original": {...}}
+        self._in_flight = {}
+        self._sender = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(FLUSH_DELAY_MS)
+        self._timer.timeout.connect(self.flush)
+
+    def move(self, activity, original, start_time, end_time):
+        """Record that ``activity`` moved from ``original`` times to new ones."""
+        key = activity_key(activity)
+        entry = self._pending.setdefault(key, {"original": dict(original)})
+        entry["changes"] = {"start_time": start_time, "end_time": end_time}
+        self._timer.start()  # Restart the debounce window
+
+    def has_pending(self):
+        return bool(self._pending or self._in_flight)
+
+    def overlay(self, activity):
+        """Apply unconfirmed times to an activity freshly loaded from the server."""
+        key = activity_key(activity)
+        entry = self._pending.get(key) or self._in_flight.get(key)
+        if entry is not None:
+            activity.update(entry["changes"])
+        return activity
+
+    def flush(self):
+        if not self._pending:
+            return
+        if self._sender is not None:
+            self._timer.start()  # One request at a time; retry after this one
+            return
+        self._in_flight, self._pending = self._pending, {}
+        self._sender = PlanEditSender(
+            {key: entry["changes"] for key, entry in self._in_flight.items()}, self
+        )
+        self._sender.done.connect(self._on_done)
+        self._sender.finished.connect(self._sender.deleteLater)
+        self._sender.start()
+
+    def _on_done(self, outcomes):
+        saved = []
+        for key, error, plan_id in outcomes:
+            entry = self._in_flight.get(key)
+            if entry is None:
+                continue
+            if error is None:
+                saved.append(key)
+                if plan_id is not None:
+                    # Detaching it again would duplicate the block, so moves
+                    # made meanwhile go out as edits of the new DayPlan
+                    if key in self._pending:
+                        self._pending[("plan", plan_id)] = self._pending.pop(key)
+                    self.detached.emit(key, plan_id)
+                    key = ("plan", plan_id)
+                newer = self._pending.get(key)
+                if newer is not None:
+                    newer["original"] = dict(entry["changes"])
+            elif key in self._pending:
+                # A newer move supersedes this one; if it fails too, go back
+                # to the last confirmed times
+                self._pending[key]["original"] = entry["original"]
+            else:
+                logger.error(f"Failed to save move of {key}: {error}")
+                self.rolled_back.emit(key, entry["original"], error)
+        self._in_flight = {}
+        self._sender = None
+        if saved:
+            self.committed.emit(saved)
+        if self._pending:
+            self._timer.start()
+
+
+@dataclass
+class _Block:
+    """An activity with its parsed times, rect and label, cached between paints."""
+
+    activity: dict
+    start: int  # Minutes since midnight
+    end: int
+    rect: QRect
+    label: str
+
+
+def _minutes(value):
+    hours, minutes = value.split(":")[:2]
+    return int(hours) * 60 + int(minutes)
+
 
 class DayView(QWidget):
     activityClicked = pyqtSignal(dict)
     activityCreated = pyqtSignal(str, str)
-    activityMoved = pyqtSignal(dict, str, str)
+    activityMoved = pyqtSignal(dict, dict)  # activity with new times, times before the drag
     activityDragging = pyqtSignal(str, str)
 
     def __init__(self, parent=None):
@@ -48,6 +308,7 @@ class DayView(QWidget):
         self.drag_start = None
         self.drag_end = None
         self.dragged_activity = None
+        self.drag_origin = None  # Times of the dragged activity when the drag began
         self.selected_activity = None
         self.hover_activity = None
         self.new_activity_selection = None
@@ -55,24 +316,91 @@ class DayView(QWidget):
         self.event_color = QColor("#116711")  # Green for event mode
         self.work_color = QColor("#007AFF")  # Blue for work mode
         self.current_mode = "event"  # Default mode
+        self.activity_font = QFont("Arial", 14)
+        self.slot_font = QFont("Arial", 10)
+
+        # Blocks sorted by top edge, plus the lowest bottom edge reached by any
+        # block up to each index, for hit-testing without a full scan.
+        # Rebuilt lazily after activities or the widget size change.
+        self._blocks = None
+        self._tops = []
+        self._reach = []
+
+    # -- geometry ------------------------------------------------------------
+
+    def _make_block(self, activity):
+        start = _minutes(activity["start_time"])
+        end = _minutes(activity["end_time"])
+        if start == end:
+            end += 15  # Ensure minimum duration of 15 minutes
+
+        start_y = start * self.height() / 1440
+        end_y = end * self.height() / 1440
+        height = max(end_y - start_y, 20)  # Minimum height of 20 pixels
+        rect = QRect(50, int(start_y), self.width() - 60, int(height))
 
-    def draw_activity(self, painter, activity, is_selected=False, is_hovered=False):
-        start_time = QTime.fromString(activity["start_time"], "HH:mm:ss")
-        end_time = QTime.fromString(activity["end_time"], "HH:mm:ss")
-
-        # Ensure minimum duration of 15 minutes
-        if start_time == end_time:
-            end_time = end_time.addSecs(900)
+        text = (
+            f"{activity['title']}\n"
+            f"{start // 60 % 24:02d}:{start % 60:02d} - {end // 60 % 24:02d}:{end % 60:02d}"
+        )
+        label = QFontMetrics(self.activity_font).elidedText(
+            text, Qt.ElideRight, rect.width() - 10
+        )
+        return _Block(activity, start, end, rect, label)
+
+    def _index(self):
+        self._tops = [block.rect.top() for block in self._blocks]
+        self._reach = []
+        reach = -1
+        for block in self._blocks:
+            reach = max(reach, block.rect.bottom())
+            self._reach.append(reach)
+
+    def _layout(self):
+        if self._blocks is None:
+            self._blocks = sorted(
+                (self._make_block(a) for a in self.activities), key=lambda b: b.rect.top()
+            )
+            self._index()
+        return self._blocks
+
+    def invalidate_layout(self):
+        """Drop cached geometry after activities were changed from outside."""
+        self._blocks = None
+
+    def _relayout(self, activity):
+        """Re-place one activity whose times changed; return (old rect, new rect)."""
+        blocks = self._layout()
+        old = next(b for b in blocks if b.activity is activity)
+        blocks.remove(old)
+        new = self._make_block(activity)
+        insort(blocks, new, key=lambda b: b.rect.top())
+        self._index()
+        return old.rect, new.rect
+
+    def _rect_of(self, activity):
+        if activity is None:
+            return None
+        for block in self._layout():
+            if block.activity is activity:
+                return block.rect
+        return None
 
-        start_y = (start_time.hour() * 60 + start_time.minute()) * self.height() / 1440
-        end_y = (end_time.hour() * 60 + end_time.minute()) * self.height() / 1440
+    def _repaint_rects(self, *rects):
+        """Repaint only the given rects (plus the outline pen's overhang)."""
+        for rect in rects:
+            if rect is not None:
+                self.update(rect.adjusted(-2, -2, 2, 2))
 
-        height = max(end_y - start_y, 20)  # Minimum height of 20 pixels
+    def resizeEvent(self, event):
+        self.invalidate_layout()
+        super().resizeEvent(event)
 
-        rect = QRect(50, int(start_y), self.width() - 60, int(height))
+    # -- painting --------------------------------------------------------------
 
+    def draw_block(self, painter, block, is_selected=False, is_hovered=False):
         # Use the activity's mode to determine color
-        if activity["mode"] == "work":
+        if block.activity["mode"] == "work":
             base_color = self.work_color
         else:
             base_color = self.event_color
@@ -86,18 +414,12 @@ class DayView(QWidget):
 
         painter.setBrush(QBrush(color))
         painter.setPen(QPen(color.darker(120), 2))
-        painter.drawRoundedRect(rect, 5, 5)
+        painter.drawRoundedRect(block.rect, 5, 5)
 
         painter.setPen(QColor("#FFFFFF"))
-        painter.setFont(QFont("Arial", 14))
-        text_rect = rect.adjusted(5, 5, -5, -5)
-
-        text = f"{activity['title']}\n{start_time.toString('HH:mm')} - {end_time.toString('HH:mm')}"
-        elided_text = painter.fontMetrics().elidedText(
-            text, Qt.ElideRight, text_rect.width()
-        )
-
-        painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignVCenter, elided_text)
+        painter.setFont(self.activity_font)
+        text_rect = block.rect.adjusted(5, 5, -5, -5)
+        painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignVCenter, block.label)
 
     def pos_to_time(self, y):
         minutes = int(y * 1440 / self.height())
@@ -108,17 +430,18 @@ class DayView(QWidget):
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
+        dirty = event.rect()
 
-        self.draw_time_slots(painter)
+        self.draw_time_slots(painter, dirty)
 
-        sorted_activities = sorted(
-            self.activities, key=lambda x: QTime.fromString(x["start_time"], "HH:mm:ss")
-        )
-
-        for activity in sorted_activities:
-            is_selected = activity == self.selected_activity
-            is_hovered = activity == self.hover_activity
-            self.draw_activity(painter, activity, is_selected, is_hovered)
+        for block in self._layout():
+            if block.rect.top() > dirty.bottom():
+                break  # Sorted by top edge; nothing further down is dirty
+            if not block.rect.adjusted(-2, -2, 2, 2).intersects(dirty):
+                continue
+            is_selected = block.activity == self.selected_activity
+            is_hovered = block.activity is self.hover_activity
+            self.draw_block(painter, block, is_selected, is_hovered)
 
         if self.new_activity_selection:
             self.draw_new_activity_selection(painter)
@@ -135,37 +458,36 @@ class DayView(QWidget):
         activity["end_time"] = end_time.toString("HH:mm:ss")
 
         self.activities.append(activity)
+        self.invalidate_layout()
         self.update()
 
     def clear_activities(self):
         self.activities.clear()
+        self.hover_activity = None
+        self.invalidate_layout()
         self.update()
 
-    def draw_time_slots(self, painter):
+    def draw_time_slots(self, painter, dirty):
         for hour in range(24):
             y = int(hour * 60 * self.height() / 1440)
+            if y > dirty.bottom() or y + 15 < dirty.top():
+                continue
             painter.setPen(QPen(QColor("#404040")))
             painter.drawLine(0, y, self.width(), y)
             painter.setPen(QColor("#b3b3b3"))
-            painter.setFont(QFont("Arial", 10))
+            painter.setFont(self.slot_font)
             painter.drawText(5, y + 15, f"{hour:02d}:00")
 
-    def draw_new_activity_selection(self, painter):
-        if self.new_activity_selection:
-            start_time = QTime.fromString(
-                self.new_activity_selection["start_time"], "HH:mm:ss"
-            )
-            end_time = QTime.fromString(
-                self.new_activity_selection["end_time"], "HH:mm:ss"
-            )
-
-            start_y = (
-                (start_time.hour() * 60 + start_time.minute()) * self.height() / 1440
-            )
-            end_y = (end_time.hour() * 60 + end_time.minute()) * self.height() / 1440
-
-            rect = QRect(50, int(start_y), self.width() - 60, int(end_y - start_y))
+    def _selection_rect(self):
+        if not self.new_activity_selection:
+            return None
+        start_y = _minutes(self.new_activity_selection["start_time"]) * self.height() / 1440
+        end_y = _minutes(self.new_activity_selection["end_time"]) * self.height() / 1440
+        return QRect(50, int(start_y), self.width() - 60, int(end_y - start_y))
 
+    def draw_new_activity_selection(self, painter):
+        rect = self._selection_rect()
+        if rect is not None:
             # Use the current mode to determine both fill and outline colors
             color = self.work_color if self.current_mode == "work" else self.event_color
 
@@ -181,6 +503,8 @@ class DayView(QWidget):
         self.current_mode = mode
         self.update()
 
+    # -- interaction -----------------------------------------------------------
+
     def mousePressEvent(self, event):
         self.drag_start = event.pos()
         self.drag_end = None
@@ -191,6 +515,14 @@ class DayView(QWidget):
         else:
             self.selected_activity = None
         self.dragged_activity = clicked_activity
+        self.drag_origin = (
+            {
+                "start_time": clicked_activity["start_time"],
+                "end_time": clicked_activity["end_time"],
+            }
+            if clicked_activity
+            else None
+        )
         self.new_activity_selection = None
         self.update()
 
@@ -198,30 +530,42 @@ class DayView(QWidget):
         if event.buttons() == Qt.LeftButton:  # Dragging
             self.drag_end = event.pos()
             if self.dragged_activity:
-                self.update_activity_times()
+                # Times snap to 15 minutes; most mouse moves change nothing
+                if not self.update_activity_times():
+                    return
+                self._repaint_rects(*self._relayout(self.dragged_activity))
                 self.activityDragging.emit(
                     self.dragged_activity["start_time"],
                     self.dragged_activity["end_time"],
                 )
             else:
+                previous = self.new_activity_selection
+                previous_rect = self._selection_rect()
                 self.update_new_activity_selection()
+                if self.new_activity_selection == previous:
+                    return
+                self._repaint_rects(previous_rect, self._selection_rect())
                 if self.new_activity_selection:
                     self.activityDragging.emit(
                         self.new_activity_selection["start_time"],
                         self.new_activity_selection["end_time"],
                     )
         else:  # Hovering
-            self.hover_activity = self.get_activity_at_pos(event.pos())
-        self.update()
+            hovered = self.get_activity_at_pos(event.pos())
+            if hovered is not self.hover_activity:
+                previous_rect = self._rect_of(self.hover_activity)
+                self.hover_activity = hovered
+                self._repaint_rects(previous_rect, self._rect_of(hovered))
 
     def mouseReleaseEvent(self, event):
         if self.drag_start and self.drag_end:
             if self.dragged_activity:
-                self.activityMoved.emit(
-                    self.dragged_activity,
-                    self.dragged_activity["start_time"],
-                    self.dragged_activity["end_time"],
-                )
+                moved_to = {
+                    "start_time": self.dragged_activity["start_time"],
+                    "end_time": self.dragged_activity["end_time"],
+                }
+                if moved_to != self.drag_origin:
+                    self.activityMoved.emit(self.dragged_activity, self.drag_origin)
             elif self.new_activity_selection:
                 self.activityCreated.emit(
                     self.new_activity_selection["start_time"],
@@ -236,23 +580,18 @@ class DayView(QWidget):
         self.drag_start = None
         self.drag_end = None
         self.dragged_activity = None
+        self.drag_origin = None
         self.update()
 
     def get_activity_at_pos(self, pos):
-        for activity in self.activities:
-            start_time = QTime.fromString(activity["start_time"], "HH:mm:ss")
-            end_time = QTime.fromString(activity["end_time"], "HH:mm:ss")
-
-            start_y = (
-                (start_time.hour() * 60 + start_time.minute()) * self.height() / 1440
-            )
-            end_y = (end_time.hour() * 60 + end_time.minute()) * self.height() / 1440
-
-            rect = QRect(50, int(start_y), self.width() - 60, int(end_y - start_y))
-
-            if rect.contains(pos):
-                return activity
-
+        """Topmost (latest-starting) activity drawn under ``pos``."""
+        blocks = self._layout()
+        y = pos.y()
+        for i in range(bisect_right(self._tops, y) - 1, -1, -1):
+            if self._reach[i] < y:
+                break  # No block at or above this index reaches down to y
+            if blocks[i].rect.contains(pos):
+                return blocks[i].activity
         return None
 
     def update_new_activity_selection(self):
@@ -273,15 +612,18 @@ class DayView(QWidget):
             }
 
     def update_activity_times(self):
+        """Move the dragged activity by the drag distance; return True if its times changed."""
         if self.drag_start and self.drag_end and self.dragged_activity:
             delta_y = self.drag_end.y() - self.drag_start.y()
             minutes_delta = int(delta_y * 1440 / self.height() / 15) * 15
 
+            # Offset from the times at the start of the drag, not the current
+            # ones, or every mouse move would add the whole distance again
             start_time = QTime.fromString(
-                self.dragged_activity["start_time"], "HH:mm:ss"
+                self.drag_origin["start_time"], "HH:mm:ss"
             ).addSecs(minutes_delta * 60)
             end_time = QTime.fromString(
-                self.dragged_activity["end_time"], "HH:mm:ss"
+                self.drag_origin["end_time"], "HH:mm:ss"
             ).addSecs(minutes_delta * 60)
 
             # Ensure the activity stays within the day
@@ -294,14 +636,105 @@ class DayView(QWidget):
                 end_time = QTime(23, 59, 59)
                 start_time = start_time.addSecs(diff)
 
-            self.dragged_activity["start_time"] = start_time.toString("HH:mm:ss")
-            self.dragged_activity["end_time"] = end_time.toString("HH:mm:ss")
+            start, end = start_time.toString("HH:mm:ss"), end_time.toString("HH:mm:ss")
+            if (start, end) == (
+                self.dragged_activity["start_time"],
+                self.dragged_activity["end_time"],
+            ):
+                return False
+            self.dragged_activity["start_time"] = start
+            self.dragged_activity["end_time"] = end
+            return True
+        return False
 
     def clear_new_activity_selection(self):
         self.new_activity_selection = None
         self.update()
 
 
+class WeekView(QWidget):
+    """Seven day columns (Monday first) drawn from the day plan cache."""
+
+    daySelected = pyqtSignal(QDate)
+
+    HEADER_HEIGHT = 30
+    TIME_GUTTER = 50
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("weekView")
+        self.setMinimumSize(700, 1440 + self.HEADER_HEIGHT)
+        self.week_start = QDate.currentDate()
+        self.selected_date = QDate.currentDate()
+        self.days = {}  # iso date -> [activity, ...]
+        self.event_color = QColor("#116711")
+        self.work_color = QColor("#007AFF")
+
+    def set_week(self, selected_date, days):
+        self.selected_date = selected_date
+        self.week_start = selected_date.addDays(1 - selected_date.dayOfWeek())
+        self.days = days
+        self.update()
+
+    def column_width(self):
+        return (self.width() - self.TIME_GUTTER) / 7
+
+    def time_to_y(self, value):
+        t = QTime.fromString(value, "HH:mm:ss")
+        body_height = self.height() - self.HEADER_HEIGHT
+        return self.HEADER_HEIGHT + (t.hour() * 60 + t.minute()) * body_height / 1440
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        body_height = self.height() - self.HEADER_HEIGHT
+        column_width = self.column_width()
+
+        painter.setFont(QFont("Arial", 10))
+        for hour in range(24):
+            y = int(self.HEADER_HEIGHT + hour * 60 * body_height / 1440)
+            painter.setPen(QPen(QColor("#404040")))
+            painter.drawLine(self.TIME_GUTTER, y, self.width(), y)
+            painter.setPen(QColor("#b3b3b3"))
+            painter.drawText(5, y + 15, f"{hour:02d}:00")
+
+        for column in range(7):
+            day = self.week_start.addDays(column)
+            x = int(self.TIME_GUTTER + column * column_width)
+            header = QRect(x, 0, int(column_width), self.HEADER_HEIGHT)
+            if day == self.selected_date:
+                painter.fillRect(header, QColor("#2D2D2D"))
+            painter.setPen(QColor("#FFFFFF"))
+            painter.drawText(header, Qt.AlignCenter, day.toString("ddd d"))
+            painter.setPen(QPen(QColor("#404040")))
+            painter.drawLine(x, 0, x, self.height())
+
+            activities = self.days.get(iso(day))
+            if activities is None:
+                continue  # Not loaded yet
+            for activity in activities:
+                start_y = self.time_to_y(activity["start_time"])
+                end_y = self.time_to_y(activity["end_time"])
+                rect = QRect(x + 2, int(start_y), int(column_width) - 4, max(int(end_y - start_y), 12))
+                color = self.work_color if activity["mode"] == "work" else self.event_color
+                painter.setBrush(QBrush(color))
+                painter.setPen(QPen(color.darker(120), 1))
+                painter.drawRoundedRect(rect, 3, 3)
+                painter.setPen(QColor("#FFFFFF"))
+                painter.drawText(
+                    rect.adjusted(3, 1, -3, -1),
+                    Qt.AlignLeft | Qt.AlignTop,
+                    painter.fontMetrics().elidedText(
+                        activity["title"], Qt.ElideRight, rect.width() - 6
+                    ),
+                )
+
+    def mousePressEvent(self, event):
+        column = int((event.pos().x() - self.TIME_GUTTER) // self.column_width())
+        if 0 <= column < 7:
+            self.daySelected.emit(self.week_start.addDays(column))
+
+
 class ToggleSwitch(QWidget):
     switched = pyqtSignal(bool)
 
@@ -357,6 +790,11 @@ class TimeBlockingApp(QMainWindow):
         self.mode = "event"  # Default mode (can be "event" or "work")
         self.event_color = QColor("#116711")  # Green for event mode
         self.work_color = QColor("#007AFF")  # Blue for work mode
+        self.plan_cache = DayPlanCache()
+        self.edit_session = ScheduleEditSession(self)
+        self.edit_session.rolled_back.connect(self.on_edit_rolled_back)
+        self.edit_session.committed.connect(self.on_edits_committed)
+        self.edit_session.detached.connect(self.on_occurrence_detached)
 
         # Apply dark theme to the entire application
         self.set_dark_theme()
@@ -431,10 +869,25 @@ class TimeBlockingApp(QMainWindow):
         left_widget = QWidget()
         left_layout = QVBoxLayout(left_widget)
 
-        # Add date label
+        # Add date navigation and label
+        nav_layout = QHBoxLayout()
+        previous_button = QPushButton("<")
+        previous_button.clicked.connect(lambda: self.show_date(self.current_date.addDays(-1)))
+        today_button = QPushButton("Today")
+        today_button.clicked.connect(lambda: self.show_date(QDate.currentDate()))
+        next_button = QPushButton(">")
+        next_button.clicked.connect(lambda: self.show_date(self.current_date.addDays(1)))
         self.date_label = QLabel(self.current_date.toString("dddd, MMMM d, yyyy"))
         self.date_label.setObjectName("dateLabel")
-        left_layout.addWidget(self.date_label)
+        self.view_button = QPushButton("Week")
+        self.view_button.clicked.connect(self.toggle_week_view)
+        nav_layout.addWidget(previous_button)
+        nav_layout.addWidget(today_button)
+        nav_layout.addWidget(next_button)
+        nav_layout.addWidget(self.date_label)
+        nav_layout.addStretch()
+        nav_layout.addWidget(self.view_button)
+        left_layout.addLayout(nav_layout)
 
         # Create and set up the day view
         self.day_view = DayView()
@@ -447,7 +900,17 @@ class TimeBlockingApp(QMainWindow):
         self.scroll_area = QScrollArea()
         self.scroll_area.setWidgetResizable(True)
         self.scroll_area.setWidget(self.day_view)
-        left_layout.addWidget(self.scroll_area)
+
+        self.week_view = WeekView()
+        self.week_view.daySelected.connect(self.on_week_day_selected)
+        week_scroll_area = QScrollArea()
+        week_scroll_area.setWidgetResizable(True)
+        week_scroll_area.setWidget(self.week_view)
+
+        self.view_stack = QStackedWidget()
+        self.view_stack.addWidget(self.scroll_area)
+        self.view_stack.addWidget(week_scroll_area)
+        left_layout.addWidget(self.view_stack)
 
         return left_widget
 
@@ -563,6 +1026,9 @@ class TimeBlockingApp(QMainWindow):
         self.description_input = QTextEdit()
         self.description_input.setPlaceholderText("Description")
 
+        self.repeat_input = QComboBox()
+        self.repeat_input.addItems(REPEAT_RULES.keys())
+
         if self.mode == "event":
             self.attendees_input = QLineEdit()
             self.attendees_input.setPlaceholderText(
@@ -576,6 +1042,8 @@ class TimeBlockingApp(QMainWindow):
         self.details_layout.addWidget(self.start_time)
         self.details_layout.addWidget(QLabel("End Time:"))
         self.details_layout.addWidget(self.end_time)
+        self.details_layout.addWidget(QLabel("Repeat:"))
+        self.details_layout.addWidget(self.repeat_input)
 
         if self.mode == "event":
             self.details_layout.addWidget(QLabel("Description:"))
@@ -630,6 +1098,7 @@ class TimeBlockingApp(QMainWindow):
         self.start_time.setTime(QTime(0, 0))
         self.end_time.setTime(QTime(0, 0))
         self.description_input.clear()
+        self.repeat_input.setCurrentIndex(0)
         if self.attendees_input:
             self.attendees_input.clear()
         self.day_view.selected_activity = None
@@ -647,6 +1116,10 @@ class TimeBlockingApp(QMainWindow):
         self.day_view.selected_activity = activity
         self.day_view.update()
 
+    def has_unsaved_changes(self):
+        """Moves not yet confirmed by the server; the page must not be dropped."""
+        return self.edit_session.has_pending()
+
     def load_stylesheet(self):
         try:
             with open("front_end/components/stylesheet.css", "r") as f:
@@ -655,55 +1128,128 @@ class TimeBlockingApp(QMainWindow):
             logger.warning("CSS file not found. Using default styles.")
 
     def load_activities(self):
+        """Reload the shown day from the server, e.g. after an edit."""
+        day = iso(self.current_date)
+        request = api_client.get(
+            "/dayplans", owner=self, params={"start": day, "end": day}, timeout=10
+        )
+        request.succeeded.connect(lambda activities: self.on_day_loaded(day, activities))
+        request.failed.connect(self.on_day_load_failed)
+        self.prefetch_around(self.current_date)
+
+    def on_day_loaded(self, day, activities):
+        logger.debug(f"Loaded activities: {activities}")
+        self.plan_cache.store([day], activities)
+        if day == iso(self.current_date):
+            self.render_day()
+        self.render_week()
+
+    def on_day_load_failed(self, error):
+        logger.error(f"Failed to load activities: {error}")
+        QMessageBox.critical(self, "Error", f"Failed to load activities: {error}")
+
+    def render_day(self):
         self.day_view.clear_activities()
-        try:
-            response = requests.get(f"{API_BASE_URL}/dayplans")
-            response.raise_for_status()
-            activities = response.json()
-            logger.debug(f"Loaded activities: {activities}")
-            for activity in activities:
-                formatted_activity = {
-                    "id": activity["id"],
-                    "title": activity["title"],
-                    "start_time": activity["start_time"],
-                    "end_time": activity["end_time"],
-                    "description": activity.get("description", ""),
-                    "mode": activity.get("mode", "event"),
-                    "status": activity.get("status", "pending"),
-                }
-                self.day_view.add_activity(formatted_activity)
-            logger.info(f"Added {len(self.day_view.activities)} activities to DayView")
-            self.day_view.update()
-            self.scroll_area.updateGeometry()
-            self.update()
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to load activities: {str(e)}")
-            QMessageBox.critical(self, "Error", f"Failed to load activities: {str(e)}")
+        for activity in self.plan_cache.get(iso(self.current_date)) or []:
+            self.day_view.add_activity(self.edit_session.overlay(format_activity(activity)))
+        logger.info(f"Added {len(self.day_view.activities)} activities to DayView")
+        self.day_view.update()
+        self.scroll_area.updateGeometry()
+        self.update()
+
+    def render_week(self):
+        week_start = self.current_date.addDays(1 - self.current_date.dayOfWeek())
+        days = {}
+        for offset in range(7):
+            day = iso(week_start.addDays(offset))
+            activities = self.plan_cache.get(day)
+            if activities is not None:
+                days[day] = [self.edit_session.overlay(format_activity(a)) for a in activities]
+        self.week_view.set_week(self.current_date, days)
+
+    def show_date(self, date):
+        """Switch to ``date``, drawing from the cache and fetching what is missing."""
+        self.current_date = date
+        self.date_label.setText(date.toString("dddd, MMMM d, yyyy"))
+        self.clear_inputs()
+        self.render_day()
+        self.render_week()
+        self.prefetch_around(date)
+
+    def prefetch_around(self, date):
+        """Load stale or missing days near ``date`` with one background request."""
+        days = [date.addDays(i) for i in range(-PREFETCH_DAYS, PREFETCH_DAYS + 1)]
+        missing = set(self.plan_cache.needs_fetch([iso(d) for d in days]))
+        if not missing:
+            return
+        wanted = [d for d in days if iso(d) in missing]
+        self.fetch_range(wanted[0], wanted[-1])
+
+    def fetch_range(self, start, end):
+        days = [iso(start.addDays(i)) for i in range(start.daysTo(end) + 1)]
+        self.plan_cache.mark_pending(days)
+        # No owner: the cache keeps the days even if the user leaves the page,
+        # and a cancelled fetch would leave them marked pending
+        request = api_client.get(
+            "/dayplans", params={"start": iso(start), "end": iso(end)}, timeout=10
+        )
+        request.succeeded.connect(lambda plans: self.on_range_loaded(days, plans))
+        request.failed.connect(lambda error: self.on_range_failed(days, error))
+
+    def on_range_loaded(self, days, activities):
+        self.plan_cache.store(days, activities)
+        if iso(self.current_date) in days:
+            self.render_day()
+        self.render_week()
+
+    def on_range_failed(self, days, error):
+        self.plan_cache.discard_pending(days)
+        logger.warning(f"Failed to prefetch day plans {days[0]}..{days[-1]}: {error}")
+
+    def toggle_week_view(self):
+        showing_week = self.view_stack.currentIndex() == 1
+        self.view_stack.setCurrentIndex(0 if showing_week else 1)
+        self.view_button.setText("Week" if showing_week else "Day")
+
+    def on_week_day_selected(self, date):
+        self.show_date(date)
+        self.toggle_week_view()
 
     def on_activity_created(self, start_time, end_time):
         self.start_time.setTime(QTime.fromString(start_time, "HH:mm"))
         self.end_time.setTime(QTime.fromString(end_time, "HH:mm"))
         self.activity_input.setFocus()
 
-    def on_activity_moved(self, activity, new_start_time, new_end_time):
-        updated_activity = {
-            "title": activity["title"],
-            "start_time": new_start_time,
-            "end_time": new_end_time,
-            "description": activity.get("description", ""),
-            "mode": activity["mode"],
-            "status": activity.get("status", "pending"),
-        }
-        try:
-            response = requests.put(
-                f"{API_BASE_URL}/dayplans/{activity['id']}", json=updated_activity
-            )
-            response.raise_for_status()
-            self.load_activities()
-            self.on_activity_clicked(response.json())
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to update activity: {str(e)}")
-            QMessageBox.warning(self, "Error", f"Failed to update activity: {str(e)}")
+    def on_activity_moved(self, activity, original_times):
+        # Already moved on screen; the edit session saves it after the drag settles
+        self.edit_session.move(
+            activity, original_times, activity["start_time"], activity["end_time"]
+        )
+        self.plan_cache.update_times(activity)
+        self.render_week()
+        self.on_activity_clicked(activity)
+
+    def on_edit_rolled_back(self, key, original_times, error):
+        for activity in self.day_view.activities:
+            if activity_key(activity) == key:
+                activity.update(original_times)
+                self.plan_cache.update_times(activity)
+        self.day_view.invalidate_layout()
+        self.day_view.update()
+        self.render_week()
+        self.statusBar().showMessage(f"Could not move activity: {error}", 5000)
+
+    def on_occurrence_detached(self, key, plan_id):
+        # The block on screen and its cached copy now stand for the new DayPlan
+        for activity in [*self.day_view.activities, *(self.plan_cache.get(key[2]) or [])]:
+            if activity_key(activity) == key:
+                activity["id"] = plan_id
+                activity["recurring_plan_id"] = None
+
+    def on_edits_committed(self, keys):
+        if any(key[0] == "occurrence" for key in keys):
+            # Moved occurrences are now DayPlans with ids of their own
+            self.fetch_range(self.current_date, self.current_date)
 
     def add_activity(self):
         activity_name = self.activity_input.text()
@@ -717,39 +1263,79 @@ class TimeBlockingApp(QMainWindow):
                 ),
                 "mode": self.mode,  # Use self.mode instead of self.mode_switch.mode
                 "status": "pending",
+                "date": iso(self.current_date),
             }
+            rule = REPEAT_RULES[self.repeat_input.currentText()]
+            if rule:
+                del new_activity["status"]
+                new_activity["start_date"] = new_activity.pop("date")
+                new_activity["rrule"] = rule
+                path = "/recurring-plans"
+            else:
+                path = "/dayplans"
             print(f"adding activity {new_activity}")
-            try:
-                response = requests.post(f"{API_BASE_URL}/dayplans", json=new_activity)
-                response.raise_for_status()
-                self.clear_inputs()
-                self.day_view.clear_new_activity_selection()
-                self.load_activities()
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Failed to add activity: {str(e)}")
-                QMessageBox.warning(self, "Error", f"Failed to add activity: {str(e)}")
+            request = api_client.post(path, json=new_activity)
+            request.succeeded.connect(lambda _: self.on_activity_added(bool(rule)))
+            request.failed.connect(self.on_activity_add_failed)
+
+    def on_activity_added(self, recurring):
+        if recurring:
+            # The new series has occurrences on the cached days too
+            self.plan_cache.clear()
+        self.clear_inputs()
+        self.day_view.clear_new_activity_selection()
+        self.load_activities()
+
+    def on_activity_add_failed(self, error):
+        logger.error(f"Failed to add activity: {error}")
+        QMessageBox.warning(self, "Error", f"Failed to add activity: {error}")
 
     def delete_activity(self):
-        if self.day_view.selected_activity:
+        activity = self.day_view.selected_activity
+        if not activity:
+            return
+        if activity.get("recurring_plan_id"):
+            path = self.confirm_recurring_delete(activity)
+        else:
             confirm = QMessageBox.question(
                 self,
                 "Confirm Deletion",
-                f"Are you sure you want to delete '{self.day_view.selected_activity['title']}'?",
+                f"Are you sure you want to delete '{activity['title']}'?",
                 QMessageBox.Yes | QMessageBox.No,
             )
-            if confirm == QMessageBox.Yes:
-                try:
-                    response = requests.delete(
-                        f"{API_BASE_URL}/dayplans/{self.day_view.selected_activity['id']}"
-                    )
-                    response.raise_for_status()
-                    self.load_activities()
-                    self.clear_inputs()
-                except requests.exceptions.RequestException as e:
-                    logger.error(f"Failed to delete activity: {str(e)}")
-                    QMessageBox.warning(
-                        self, "Error", f"Failed to delete activity: {str(e)}"
-                    )
+            path = f"/dayplans/{activity['id']}" if confirm == QMessageBox.Yes else None
+        if path is None:
+            return
+        request = api_client.delete(path)
+        request.succeeded.connect(lambda _: self.on_activity_deleted(activity))
+        request.failed.connect(self.on_activity_delete_failed)
+
+    def on_activity_deleted(self, activity):
+        if activity.get("recurring_plan_id"):
+            # A whole series spans the cached days too
+            self.plan_cache.clear()
+        self.load_activities()
+        self.clear_inputs()
+
+    def on_activity_delete_failed(self, error):
+        logger.error(f"Failed to delete activity: {error}")
+        QMessageBox.warning(self, "Error", f"Failed to delete activity: {error}")
+
+    def confirm_recurring_delete(self, activity):
+        """Ask whether to delete one occurrence or the series; return the path or None."""
+        box = QMessageBox(self)
+        box.setWindowTitle("Delete Repeating Activity")
+        box.setText(f"'{activity['title']}' repeats. What do you want to delete?")
+        occurrence_button = box.addButton("This occurrence", QMessageBox.AcceptRole)
+        series_button = box.addButton("All occurrences", QMessageBox.DestructiveRole)
+        box.addButton(QMessageBox.Cancel)
+        box.exec_()
+        series_path = f"/recurring-plans/{activity['recurring_plan_id']}"
+        if box.clickedButton() == occurrence_button:
+            return f"{series_path}/occurrences/{activity['date']}"
+        if box.clickedButton() == series_button:
+            return series_path
+        return None
 
     def cancel_new_activity(self):
         self.clear_inputs()
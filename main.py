@@ -1,3 +1,4 @@
+import argparse
 import os
 import sys
 
@@ -40,16 +41,38 @@ class ActivityMonitor:
             logger.error(f"Error checking current activity: {str(e)}")
         return None
 
+    def wait_for_activity(self, predicate):
+        """Block until the backend pushes an activity matching ``predicate``."""
+        import requests
+        from front_end.components.activity_stream import stream_activities
+
+        while True:
+            try:
+                for activity in stream_activities(self.api_base_url):
+                    if predicate(activity):
+                        return activity
+            except (requests.RequestException, ValueError) as e:
+                logger.error(f"Activity stream error: {str(e)}")
+            time.sleep(5)  # Back off before reconnecting
+
+
+def run_backend(origin=None):
+    from startup import StartupTimeline
+
+    timeline = StartupTimeline("backend", origin)
 
-def run_backend():
     # Moved imports inside the function
-    from backend.database.database import engine
-    from backend.database.models import Base
-    from backend.app import app
-    import uvicorn
+    with timeline.phase("import backend"):
+        from backend.database.database import engine
+        from backend.database.models import Base
+        from backend.app import app
+        import uvicorn
 
     # Create database tables
-    Base.metadata.create_all(bind=engine)
+    with timeline.phase("create tables"):
+        Base.metadata.create_all(bind=engine)
+    timeline.mark("start server")
+    timeline.write()
 
     # Run the FastAPI server
     uvicorn.run(
@@ -62,15 +85,32 @@ def run_backend():
     )
 
 
-def run_frontend():
-    # Moved imports inside the function
-    from PyQt5.QtWidgets import QApplication
-    from front_end.page_cordinator import PageCoordinator
-    from PyQt5.QtCore import QObject, pyqtSignal
+def run_frontend(origin=None):
+    from startup import StartupTimeline
+
+    timeline = StartupTimeline("frontend", origin)
 
-    app = QApplication(sys.argv)
-    coordinator = PageCoordinator()
-    coordinator.show()
+    # Moved imports inside the function
+    with timeline.phase("import Qt"):
+        from PyQt5.QtCore import QCoreApplication, Qt, QTimer
+        from PyQt5.QtWidgets import QApplication
+    with timeline.phase("import pages"):
+        from front_end.page_cordinator import PageCoordinator
+
+    # QtWebEngine (the Google login page) is imported lazily, after the
+    # QApplication exists, which it only allows with shared GL contexts
+    QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+    with timeline.phase("create QApplication"):
+        app = QApplication(sys.argv)
+    with timeline.phase("build window"):
+        coordinator = PageCoordinator()
+        coordinator.show()
+
+    def first_paint():
+        timeline.mark("first paint")
+        timeline.write()
+
+    QTimer.singleShot(0, first_paint)
 
     activity_monitor = ActivityMonitor("http://localhost:8000/api")
     # Assuming you have implemented signal-slot mechanism in ActivityMonitor
@@ -80,42 +120,70 @@ def run_frontend():
     return app.exec_()
 
 
-def monitor_and_relaunch_frontend():
+def monitor_and_relaunch_frontend(origin=None):
     while True:
-        process = multiprocessing.Process(target=run_frontend)
+        process = multiprocessing.Process(target=run_frontend, args=(origin,))
         process.start()
+        origin = None  # Relaunches are timed from their own start
         process.join()  # Wait for the process to finish
 
-        logger.info("Frontend closed. Checking activity in 5 seconds...")
-        time.sleep(5)  # Wait 5 seconds before checking activity
+        logger.info("Frontend closed. Waiting for a relaunch-triggering activity...")
 
+        # The backend pushes activity changes, so this blocks without polling
         activity_monitor = ActivityMonitor("http://localhost:8000/api")
-        current_activity = activity_monitor.check_activity()
-
-        if current_activity and current_activity.get("activity_type") != "queue":
-            logger.info("Relaunching frontend...")
-        else:
-            logger.info(
-                "No relaunch-triggering activity detected. Continuing to monitor..."
-            )
+        activity_monitor.wait_for_activity(
+            lambda activity: activity.get("activity_type") != "queue"
+        )
+        logger.info("Relaunching frontend...")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the Habit Manager")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="print the slowest imports of the backend and the front end first",
+    )
+    return parser.parse_args()
 
 
 def main():
+    args = parse_args()
+
     # Call set_python_path() inside the main function
     set_python_path()
 
+    from startup import StartupTimeline, profile_imports, wait_for_backend
+
+    if args.profile_startup:
+        profile_imports()
+
+    timeline = StartupTimeline("launcher")
+
     # Add freeze_support() to support multiprocessing in frozen applications
     multiprocessing.freeze_support()
 
     # Start the backend process
-    backend_process = multiprocessing.Process(target=run_backend)
+    backend_process = multiprocessing.Process(
+        target=run_backend, args=(timeline.origin,)
+    )
     backend_process.start()
 
-    # Wait for the backend to start up
-    time.sleep(5)
+    # Wait until the backend answers its health check
+    with timeline.phase("wait for backend"):
+        try:
+            wait_for_backend(backend_process)
+        except (RuntimeError, TimeoutError) as e:
+            logger.error(f"Backend failed to start: {str(e)}")
+            backend_process.terminate()
+            timeline.write()
+            sys.exit(1)
+    timeline.write()
 
     # Start the frontend process with monitoring
-    frontend_process = multiprocessing.Process(target=monitor_and_relaunch_frontend)
+    frontend_process = multiprocessing.Process(
+        target=monitor_and_relaunch_frontend, args=(timeline.origin,)
+    )
     frontend_process.start()
 
     # Wait for the processes to finish
@@ -0,0 +1,141 @@
+"""Startup timeline, backend readiness handshake and import-time profiling.
+
+``main.py`` starts the backend and front end as separate processes. Each of
+them (and the launcher itself) records its startup phases on a
+``StartupTimeline`` and appends them to ``STARTUP_LOG``. Offsets are taken
+from the launcher's start time, which is passed to the children, so the
+lines of all three processes read as one timeline.
+
+Instead of sleeping for a fixed time, the launcher waits for the backend
+with ``wait_for_backend``, which polls ``/api/health`` until it answers.
+
+``python main.py --profile-startup`` also prints ``profile_imports()``: the
+slowest imports of the backend and the front end, measured in fresh
+interpreters with ``python -X importtime``.
+"""
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+
+STARTUP_LOG = os.getenv("STARTUP_LOG", "startup.log")
+HEALTH_URL = "http://localhost:8000/api/health"
+READY_TIMEOUT = 30  # Seconds to wait for the backend before giving up
+READY_POLL_INTERVAL = 0.1
+
+# Entry points whose imports --profile-startup breaks down
+PROFILED_MODULES = ("backend.app", "front_end.page_cordinator")
+PROFILE_TOP = 20
+
+
+class StartupTimeline:
+    """Named startup phases of one process, relative to a shared origin."""
+
+    def __init__(self, process_name, origin=None):
+        self.process_name = process_name
+        # Wall-clock time so that separate processes share the same origin
+        self.origin = origin if origin is not None else time.time()
+        self.phases = []  # (name, offset seconds, duration seconds)
+
+    @contextmanager
+    def phase(self, name):
+        started = time.time()
+        try:
+            yield
+        finally:
+            self.phases.append((name, started - self.origin, time.time() - started))
+
+    def mark(self, name):
+        """Record an instant, e.g. the moment the backend became ready."""
+        self.phases.append((name, time.time() - self.origin, 0.0))
+
+    def write(self, path=STARTUP_LOG):
+        """Append the phases recorded so far to ``path``."""
+        stamp = datetime.fromtimestamp(self.origin).isoformat(timespec="seconds")
+        with open(path, "a") as log:
+            for name, offset, duration in self.phases:
+                log.write(
+                    f"{stamp} pid={os.getpid()} {self.process_name:<9} "
+                    f"+{offset * 1000:9.1f} ms {duration * 1000:9.1f} ms  {name}\n"
+                )
+        self.phases.clear()
+
+
+def wait_for_backend(process=None, url=HEALTH_URL, timeout=READY_TIMEOUT):
+    """Poll the health endpoint until it answers 200.
+
+    Raises ``RuntimeError`` if ``process`` exits first and ``TimeoutError``
+    if the backend is not ready within ``timeout`` seconds.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return
+        except (urllib.error.URLError, OSError):
+            pass  # Not listening yet
+        if process is not None and not process.is_alive():
+            raise RuntimeError(
+                f"Backend exited with code {process.exitcode} before it was ready"
+            )
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"Backend not ready after {timeout} s ({url})")
+        time.sleep(READY_POLL_INTERVAL)
+
+
+@dataclass
+class ImportTime:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output):
+    """Parse the stderr of ``python -X importtime`` into ``ImportTime`` rows."""
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        stripped = name.lstrip(" ")
+        rows.append(
+            ImportTime(
+                module=stripped.strip(),
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+                depth=(len(name) - len(stripped) - 1) // 2,
+            )
+        )
+    return rows
+
+
+def profile_imports(modules=PROFILED_MODULES, top=PROFILE_TOP, out=sys.stdout):
+    """Print the slowest imports of each module, each in a fresh interpreter."""
+    root = os.path.dirname(os.path.abspath(__file__))
+    for module in modules:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            cwd=root,
+        )
+        rows = parse_importtime(result.stderr)
+        if result.returncode != 0 or not rows:
+            error = result.stderr.strip().splitlines()[-1:] or ["no output"]
+            out.write(f"\n{module}: import failed: {error[0]}\n")
+            continue
+        total = next((r for r in rows if r.module == module and r.depth == 0), rows[-1])
+        out.write(f"\n{module}: {total.cumulative_us / 1000:.1f} ms\n")
+        out.write(f"{'cumulative ms':>14}{'self ms':>10}  module\n")
+        for row in sorted(rows, key=lambda r: r.cumulative_us, reverse=True)[:top]:
+            out.write(
+                f"{row.cumulative_us / 1000:>14.1f}{row.self_us / 1000:>10.1f}  "
+                f"{'  ' * row.depth}{row.module}\n"
+            )
@@ -0,0 +1,112 @@
+from contextlib import contextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from backend.app import app
+from backend.database.database import get_async_db, get_db, get_session_scope
+from backend.database.engine import async_url, create_async_sqlite_engine, create_sqlite_engine
+from backend.database.models import Base
+from backend.services.calendar_outbox import calendar_worker
+
+
+@pytest.fixture(autouse=True)
+def no_background_calendar_worker(monkeypatch):
+    # App startup would otherwise drain the outbox of the real database.db
+    monkeypatch.setattr(calendar_worker, "start", lambda: None)
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'test.db'}"
+
+
+@pytest.fixture
+def db_engine(db_url):
+    engine = create_sqlite_engine(db_url)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(db_engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
+
+
+@pytest.fixture
+def db_session(session_factory):
+    db = session_factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def session_scope(session_factory):
+    """Stands in for ``backend.database.database.session_scope``."""
+
+    @contextmanager
+    def scope():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    return scope
+
+
+@pytest.fixture
+def async_session_factory(db_engine, db_url):
+    # Async routes use the same file. TestClient may serve requests from
+    # different event loops, so aiosqlite connections must not be pooled.
+    engine = create_async_sqlite_engine(async_url(db_url), poolclass=NullPool)
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+@pytest.fixture
+def api_client(session_factory, session_scope, async_session_factory):
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with async_session_factory() as db:
+            yield db
+
+    overrides = {
+        get_db: override_get_db,
+        get_async_db: override_get_async_db,
+        get_session_scope: lambda: session_scope,
+    }
+    previous = {dep: app.dependency_overrides.get(dep) for dep in overrides}
+    app.dependency_overrides.update(overrides)
+    yield TestClient(app)
+    for dep, override in previous.items():
+        if override is None:
+            app.dependency_overrides.pop(dep, None)
+        else:
+            app.dependency_overrides[dep] = override
+
+
+@pytest.fixture
+def create_task(api_client):
+    """POST a queue task through the API and return its id."""
+
+    def create(title="Task", length="00:10:00"):
+        response = api_client.post(
+            "/api/tasks",
+            json={"title": title, "description": "", "original_length": length},
+        )
+        assert response.status_code == 200
+        return response.json()["id"]
+
+    return create
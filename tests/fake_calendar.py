@@ -0,0 +1,155 @@
+"""In-memory stand-in for the Google Calendar v3 ``service`` object.
+
+Implements the subset of ``service.events()`` used by the backend, including
+sync tokens, pagination, 410 Gone for expired tokens and batch requests.
+"""
+import copy
+import itertools
+from datetime import datetime
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+
+class FakeRequest:
+    def __init__(self, fn):
+        self._fn = fn
+
+    def execute(self):
+        return self._fn()
+
+
+class FakeCalendarService:
+    def __init__(self, page_size=250):
+        self.page_size = page_size
+        self.events_by_id = {}
+        self.change_log = []  # event ids in the order they changed
+        self.list_calls = []
+        self.batch_sizes = []
+        self._expired_before = 0
+        self._ids = itertools.count(1)
+
+    # -- helpers for tests -------------------------------------------------
+
+    def put_event(self, event_id=None, **event):
+        """Create or replace an event as if it was edited in Google Calendar."""
+        event_id = event_id or f"evt{next(self._ids)}"
+        stored = {"id": event_id, "status": "confirmed", **event}
+        self.events_by_id[event_id] = stored
+        self.change_log.append(event_id)
+        return stored
+
+    def cancel_event(self, event_id):
+        self.events_by_id[event_id] = {"id": event_id, "status": "cancelled"}
+        self.change_log.append(event_id)
+
+    def expire_sync_tokens(self):
+        self._expired_before = len(self.change_log) + 1
+
+    @staticmethod
+    def http_error(status):
+        return HttpError(httplib2.Response({"status": status}), b"{}")
+
+    # -- googleapiclient surface ---------------------------------------------
+
+    def events(self):
+        return _FakeEvents(self)
+
+    def new_batch_http_request(self, callback=None):
+        return FakeBatch(self, callback)
+
+
+class FakeBatch:
+    """Runs each queued request on ``execute`` and reports it to the callback.
+
+    Like Google's batch endpoint, one failing call does not affect the others.
+    """
+
+    MAX_CALLS = 50
+
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self._requests = []
+
+    def add(self, request, callback=None, request_id=None):
+        if len(self._requests) >= self.MAX_CALLS:
+            raise ValueError("Too many calls in one batch request")
+        request_id = request_id or str(len(self._requests) + 1)
+        self._requests.append((request_id, request, callback or self.callback))
+
+    def execute(self):
+        self.service.batch_sizes.append(len(self._requests))
+        for request_id, request, callback in self._requests:
+            try:
+                response, exception = request.execute(), None
+            except HttpError as error:
+                response, exception = None, error
+            if callback is not None:
+                callback(request_id, response, exception)
+
+
+class _FakeEvents:
+    def __init__(self, service):
+        self.service = service
+
+    def list(self, calendarId, pageToken=None, syncToken=None, timeMin=None, timeMax=None, **params):
+        service = self.service
+        service.list_calls.append(
+            {"calendarId": calendarId, "pageToken": pageToken, "syncToken": syncToken,
+             "timeMin": timeMin, "timeMax": timeMax, **params}
+        )
+
+        def run():
+            if syncToken is not None:
+                position = int(syncToken.split("-")[1])
+                if position < service._expired_before:
+                    raise service.http_error(410)
+                changed_ids = dict.fromkeys(service.change_log[position:])
+                items = [service.events_by_id[i] for i in changed_ids]
+            else:
+                items = [
+                    e for e in service.events_by_id.values()
+                    if e["status"] != "cancelled" and _in_window(e, timeMin, timeMax)
+                ]
+            offset = int(pageToken or 0)
+            page = items[offset : offset + service.page_size]
+            result = {"items": copy.deepcopy(page)}
+            if offset + service.page_size < len(items):
+                result["nextPageToken"] = str(offset + service.page_size)
+            else:
+                result["nextSyncToken"] = f"token-{len(service.change_log)}"
+            return result
+
+        return FakeRequest(run)
+
+    def insert(self, calendarId, body):
+        return FakeRequest(lambda: copy.deepcopy(self.service.put_event(**body)))
+
+    def update(self, calendarId, eventId, body):
+        def run():
+            if eventId not in self.service.events_by_id:
+                raise self.service.http_error(404)
+            return copy.deepcopy(self.service.put_event(eventId, **body))
+
+        return FakeRequest(run)
+
+    def delete(self, calendarId, eventId):
+        def run():
+            if eventId not in self.service.events_by_id:
+                raise self.service.http_error(404)
+            self.service.cancel_event(eventId)
+            return ""
+
+        return FakeRequest(run)
+
+
+def _in_window(event, time_min, time_max):
+    start = event.get("start", {}).get("dateTime")
+    if not start or not time_min:
+        return True
+    start = datetime.fromisoformat(start).replace(tzinfo=None)
+    return (
+        datetime.fromisoformat(time_min).replace(tzinfo=None) <= start
+        and (not time_max or start <= datetime.fromisoformat(time_max).replace(tzinfo=None))
+    )
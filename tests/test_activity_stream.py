@@ -0,0 +1,65 @@
+import asyncio
+import json
+from datetime import date, datetime, time
+
+from starlette.concurrency import run_in_threadpool
+
+from backend.database.models import DailyProgress, DayPlan
+from backend.routes.page_cordination import (
+    activity_event_stream,
+    next_activity_transition,
+)
+from backend.services.activity_events import notify_activity_changed
+
+
+def parse_event(chunk):
+    lines = chunk.strip().splitlines()
+    assert lines[0] == "event: activity"
+    return json.loads(lines[1][len("data: "):])
+
+
+def test_stream_pushes_initial_activity_and_changes(session_scope):
+    def finish_habit_pages():
+        with session_scope() as db:
+            progress = db.query(DailyProgress).one()
+            progress.current_page = 3
+            db.commit()
+        notify_activity_changed()
+
+    async def is_disconnected():
+        return False
+
+    async def run():
+        stream = activity_event_stream(session_scope, is_disconnected)
+        try:
+            first = parse_event(await asyncio.wait_for(stream.__anext__(), 5))
+            await run_in_threadpool(finish_habit_pages)
+            second = parse_event(await asyncio.wait_for(stream.__anext__(), 5))
+        finally:
+            await stream.aclose()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first == {"activity_type": "habit_page", "page_number": 0, "event_info": None}
+    assert second["activity_type"] == "queue"
+
+
+def test_next_transition_is_next_plan_boundary(db_session):
+    today = date(2024, 1, 1)
+    db_session.add_all(
+        [
+            DayPlan(title="A", mode="work", date=today, start_time=time(9), end_time=time(10)),
+            DayPlan(title="B", mode="event", date=today, start_time=time(13), end_time=time(14)),
+        ]
+    )
+    db_session.commit()
+
+    assert next_activity_transition(db_session, datetime(2024, 1, 1, 9, 30)) == datetime(
+        2024, 1, 1, 10, 0
+    )
+    assert next_activity_transition(db_session, datetime(2024, 1, 1, 11, 0)) == datetime(
+        2024, 1, 1, 13, 0
+    )
+    assert next_activity_transition(db_session, datetime(2024, 1, 1, 15, 0)) == datetime(
+        2024, 1, 2, 0, 0
+    )
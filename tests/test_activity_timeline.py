@@ -0,0 +1,69 @@
+from datetime import date, time
+
+from backend.database.models import DayPlan
+from backend.services.activity_timeline import (
+    ActivityTimeline,
+    TimelineBlock,
+    get_timeline,
+    invalidate_timeline,
+)
+
+DAY = date(2024, 1, 1)
+
+
+def block(id, start, end, title=None):
+    return TimelineBlock(
+        id=id,
+        title=title or f"block {id}",
+        mode="event",
+        date=DAY,
+        start_time=start,
+        end_time=end,
+    )
+
+
+def test_block_at_and_next_transition():
+    timeline = ActivityTimeline(
+        DAY, [block(2, time(13), time(14)), block(1, time(9), time(10))]
+    )
+
+    assert timeline.block_at(time(8, 59)) is None
+    assert timeline.block_at(time(9)).id == 1
+    assert timeline.block_at(time(9, 59, 59)).id == 1
+    assert timeline.block_at(time(10)) is None
+    assert timeline.block_at(time(13, 30)).id == 2
+
+    assert timeline.next_transition(time(8)) == time(9)
+    assert timeline.next_transition(time(9, 30)) == time(10)
+    assert timeline.next_transition(time(10)) == time(13)
+    assert timeline.next_transition(time(14)) is None
+
+
+def test_overlapping_blocks_keep_earliest_owner():
+    timeline = ActivityTimeline(
+        DAY, [block(1, time(9), time(12)), block(2, time(10), time(11))]
+    )
+
+    assert timeline.block_at(time(10, 30)).id == 1
+    # The inner block's boundaries are not transitions of the current block
+    assert timeline.next_transition(time(9, 30)) == time(12)
+
+
+def test_timeline_is_cached_until_invalidated(db_session):
+    db_session.add(
+        DayPlan(title="Gym", mode="event", date=DAY, start_time=time(7), end_time=time(8))
+    )
+    db_session.commit()
+
+    timeline = get_timeline(db_session, DAY)
+    assert timeline.block_at(time(7, 30)).title == "Gym"
+    assert get_timeline(db_session, DAY) is timeline
+
+    db_session.add(
+        DayPlan(title="Read", mode="event", date=DAY, start_time=time(8), end_time=time(9))
+    )
+    db_session.commit()
+    assert get_timeline(db_session, DAY).block_at(time(8, 30)) is None
+
+    invalidate_timeline()
+    assert get_timeline(db_session, DAY).block_at(time(8, 30)).title == "Read"
@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta
+
+
+def test_incomplete_tasks_follow_queue_order(api_client, create_task):
+    first = create_task("First", length="00:25:00")
+    second = create_task("Second")
+    third = create_task("Third")
+    api_client.put(f"/api/tasks/{second}/complete")
+
+    response = api_client.get("/api/tasks/incomplete")
+    assert response.status_code == 200
+    assert [t["id"] for t in response.json() if t["id"] != second] == [first, third]
+    assert response.json()[0]["time_remaining"] == "00:25:00"
+
+
+def test_current_activity_reads_through_async_session(api_client):
+    assert api_client.get("/api/current-activity").json()["activity_type"] == "habit_page"
+
+    api_client.put("/api/current-activity/set-page", json={"page_number": 3})
+    now = datetime.now()
+    api_client.post(
+        "/api/dayplans",
+        json={
+            "title": "Gym",
+            "mode": "event",
+            "start_time": (now - timedelta(minutes=1)).time().isoformat(),
+            "end_time": (now + timedelta(minutes=30)).time().isoformat(),
+        },
+    )
+
+    activity = api_client.get("/api/current-activity").json()
+    assert activity["activity_type"] == "event"
+    assert activity["event_info"]["title"] == "Gym"
+
+
+def test_day_plans_range_query(api_client):
+    today = datetime.now().date()
+    for offset, title in ((-1, "Yesterday"), (0, "Today"), (1, "Tomorrow"), (8, "Next week")):
+        response = api_client.post(
+            "/api/dayplans",
+            json={
+                "title": title,
+                "mode": "event",
+                "date": (today + timedelta(days=offset)).isoformat(),
+                "start_time": "09:00:00",
+                "end_time": "10:00:00",
+            },
+        )
+        assert response.status_code == 200
+
+    assert [p["title"] for p in api_client.get("/api/dayplans").json()] == ["Today"]
+    week = api_client.get(
+        "/api/dayplans",
+        params={"start": (today - timedelta(days=1)).isoformat(), "end": (today + timedelta(days=6)).isoformat()},
+    ).json()
+    assert [p["title"] for p in week] == ["Yesterday", "Today", "Tomorrow"]
+
+    backwards = {"start": today.isoformat(), "end": (today - timedelta(days=1)).isoformat()}
+    assert api_client.get("/api/dayplans", params=backwards).status_code == 422
+    too_wide = {"start": today.isoformat(), "end": (today + timedelta(days=365)).isoformat()}
+    assert api_client.get("/api/dayplans", params=too_wide).status_code == 422
@@ -0,0 +1,192 @@
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from backend.database.models import CalendarOutbox, DayPlan
+from backend.services import calendar_outbox
+from backend.services.calendar_outbox import BATCH_SIZE, CalendarSyncWorker, MAX_ATTEMPTS
+from fake_calendar import FakeCalendarService
+
+PLAN = {"title": "Write", "mode": "work", "start_time": "09:00:00", "end_time": "10:00:00"}
+
+
+@pytest.fixture
+def calendar():
+    return FakeCalendarService()
+
+
+@pytest.fixture
+def worker(session_factory, calendar):
+    return CalendarSyncWorker(session_factory, lambda: calendar)
+
+
+@pytest.fixture
+def client(api_client):
+    # Handlers must never talk to Google themselves
+    with patch(
+        "backend.services.calendar_service.service_cache.get",
+        side_effect=AssertionError("Google called inline"),
+    ), patch.object(calendar_outbox.calendar_worker, "wake"):
+        yield api_client
+
+
+def outbox(db):
+    db.expire_all()
+    return [(row.operation, row.day_plan_id) for row in db.query(CalendarOutbox)]
+
+
+def test_create_is_queued_and_pushed_by_worker(client, db_session, worker, calendar):
+    plan_id = client.post("/api/dayplans", json=PLAN).json()["id"]
+    assert outbox(db_session) == [("create", plan_id)]
+
+    assert worker.drain_once() == 1
+    assert outbox(db_session) == []
+    event_id = db_session.get(DayPlan, plan_id).google_event_id
+    assert calendar.events_by_id[event_id]["summary"] == "Write"
+
+
+def test_repeated_updates_coalesce(client, db_session, worker, calendar):
+    plan_id = client.post("/api/dayplans", json=PLAN).json()["id"]
+    for hour in (10, 11, 12):
+        client.put(f"/api/dayplans/{plan_id}", json={"start_time": f"{hour}:00:00"})
+    # Still a single create, which will push the latest state
+    assert outbox(db_session) == [("create", plan_id)]
+    worker.drain_once()
+
+    for title in ("A", "B", "C"):
+        client.put(f"/api/dayplans/{plan_id}", json={"title": title})
+    assert outbox(db_session) == [("update", plan_id)]
+    worker.drain_once()
+
+    event_id = db_session.get(DayPlan, plan_id).google_event_id
+    assert calendar.events_by_id[event_id]["summary"] == "C"
+    assert calendar.events_by_id[event_id]["start"]["dateTime"].startswith(
+        f"{datetime.now().date()}T12:00:00"
+    )
+
+
+def test_delete_before_push_cancels_create(client, db_session, worker, calendar):
+    plan_id = client.post("/api/dayplans", json=PLAN).json()["id"]
+    client.delete(f"/api/dayplans/{plan_id}")
+    assert outbox(db_session) == []
+
+    worker.drain_once()
+    assert calendar.events_by_id == {}
+
+
+def test_delete_after_push_replaces_pending_update(client, db_session, worker, calendar):
+    plan_id = client.post("/api/dayplans", json=PLAN).json()["id"]
+    worker.drain_once()
+    event_id = db_session.get(DayPlan, plan_id).google_event_id
+
+    client.put(f"/api/dayplans/{plan_id}", json={"title": "Renamed"})
+    client.delete(f"/api/dayplans/{plan_id}")
+    assert outbox(db_session) == [("delete", plan_id)]
+
+    worker.drain_once()
+    assert calendar.events_by_id[event_id]["status"] == "cancelled"
+
+
+def test_edit_during_in_flight_create_does_not_duplicate_event(
+    client, db_session, worker, calendar
+):
+    plan_id = client.post("/api/dayplans", json=PLAN).json()["id"]
+    first = db_session.query(CalendarOutbox).one()
+    first.status = "in_flight"
+    db_session.commit()
+    plan = db_session.get(DayPlan, plan_id)
+    plan.title = "Edited"
+    calendar_outbox.enqueue(db_session, "update", plan)
+    db_session.commit()
+    assert outbox(db_session) == [("create", plan_id), ("create", plan_id)]
+
+    worker.recover_in_flight()  # Both entries are now due
+    assert worker.drain_once() == 1
+    assert worker.drain_once() == 1
+    assert outbox(db_session) == []
+    (event,) = calendar.events_by_id.values()
+    assert event["summary"] == "Edited"
+    assert db_session.get(DayPlan, plan_id).google_event_id == event["id"]
+
+
+def test_failures_retry_with_backoff(client, db_session, session_factory, calendar):
+    failures = {"left": 2}
+
+    def flaky_service():
+        if failures["left"]:
+            failures["left"] -= 1
+            raise RuntimeError("network down")
+        return calendar
+
+    worker = CalendarSyncWorker(session_factory, flaky_service)
+    client.post("/api/dayplans", json=PLAN)
+    now = datetime.utcnow()
+
+    assert worker.drain_once(now) == 0
+    db_session.expire_all()
+    entry = db_session.query(CalendarOutbox).one()
+    assert (entry.status, entry.attempts) == ("pending", 1)
+    assert entry.next_attempt_at == now + timedelta(seconds=5)
+
+    # Not due yet
+    assert worker.drain_once(now + timedelta(seconds=1)) == 0
+    assert failures["left"] == 1
+
+    assert worker.drain_once(now + timedelta(seconds=6)) == 0
+    db_session.expire_all()
+    assert db_session.query(CalendarOutbox).one().next_attempt_at == now + timedelta(
+        seconds=6 + 10
+    )
+
+    assert worker.drain_once(now + timedelta(seconds=20)) == 1
+    assert outbox(db_session) == []
+
+
+def test_entry_fails_after_max_attempts(client, db_session, session_factory):
+    def broken_service():
+        raise RuntimeError("no token")
+
+    worker = CalendarSyncWorker(session_factory, broken_service)
+    client.post("/api/dayplans", json=PLAN)
+    when = datetime.utcnow()
+    for _ in range(MAX_ATTEMPTS):
+        worker.drain_once(when)
+        when += timedelta(hours=1)
+
+    db_session.expire_all()
+    entry = db_session.query(CalendarOutbox).one()
+    assert entry.status == "failed"
+    assert entry.last_error == "no token"
+
+
+def test_changes_are_sent_in_batches_of_fifty(client, db_session, worker, calendar):
+    for _ in range(BATCH_SIZE + 10):
+        client.post("/api/dayplans", json=PLAN)
+
+    assert worker.drain_once() == BATCH_SIZE
+    assert worker.drain_once() == 10
+    assert calendar.batch_sizes == [BATCH_SIZE, 10]
+    assert outbox(db_session) == []
+    assert len(calendar.events_by_id) == BATCH_SIZE + 10
+
+
+def test_batch_errors_map_back_to_their_entries(client, db_session, worker, calendar):
+    ok_id = client.post("/api/dayplans", json=PLAN).json()["id"]
+    broken_id = client.post("/api/dayplans", json=PLAN).json()["id"]
+    worker.drain_once()
+
+    # The event was removed from Google behind our back
+    broken_event = db_session.get(DayPlan, broken_id).google_event_id
+    del calendar.events_by_id[broken_event]
+    client.put(f"/api/dayplans/{ok_id}", json={"title": "Fine"})
+    client.put(f"/api/dayplans/{broken_id}", json={"title": "Lost"})
+
+    assert worker.drain_once() == 1
+    assert calendar.batch_sizes == [2, 2]
+    db_session.expire_all()
+    entry = db_session.query(CalendarOutbox).one()
+    assert (entry.day_plan_id, entry.status, entry.attempts) == (broken_id, "pending", 1)
+    assert "404" in entry.last_error
+    ok_event = db_session.get(DayPlan, ok_id).google_event_id
+    assert calendar.events_by_id[ok_event]["summary"] == "Fine"
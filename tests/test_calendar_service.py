@@ -0,0 +1,97 @@
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from backend.services.calendar_service import CalendarServiceCache, get_calendar_service
+from backend.services import calendar_service
+
+
+def write_token(path, token="access-1", expiry=None):
+    expiry = expiry or datetime.utcnow() + timedelta(hours=1)
+    path.write_text(
+        json.dumps(
+            {
+                "token": token,
+                "expiry": expiry.isoformat() + "Z",
+                "refresh_token": "refresh",
+                "client_id": "client",
+                "client_secret": "secret",
+            }
+        )
+    )
+
+
+@pytest.fixture
+def token_file(tmp_path):
+    path = tmp_path / "token.json"
+    write_token(path)
+    return path
+
+
+def test_service_is_reused_within_a_thread(token_file):
+    cache = CalendarServiceCache(str(token_file))
+
+    first = cache.get()
+    assert cache.get() is first
+    assert cache.stats.as_dict()["hits"] == 1
+    assert cache.stats.as_dict()["misses"] == 1
+
+
+def test_each_thread_gets_its_own_service(token_file):
+    cache = CalendarServiceCache(str(token_file))
+    main_service = cache.get()
+    services = []
+
+    thread = threading.Thread(target=lambda: services.append(cache.get()))
+    thread.start()
+    thread.join()
+
+    assert services[0] is not main_service
+    assert cache.stats.reloads == 1  # Credentials and discovery doc are shared
+    assert cache.stats.misses == 2
+
+
+def test_token_file_change_rebuilds_service(token_file):
+    cache = CalendarServiceCache(str(token_file))
+    first = cache.get()
+
+    write_token(token_file, token="access-2")
+    stat = os.stat(token_file)
+    os.utime(token_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    second = cache.get()
+    assert second is not first
+    assert second._http.credentials.token == "access-2"
+    assert cache.stats.reloads == 2
+
+
+def test_expired_token_is_refreshed_and_saved(token_file, monkeypatch):
+    write_token(token_file, expiry=datetime.utcnow() - timedelta(minutes=1))
+
+    def refresh(self, request):
+        self.token = "refreshed"
+        self.expiry = datetime.utcnow() + timedelta(hours=1)
+
+    monkeypatch.setattr(calendar_service.Credentials, "refresh", refresh)
+    cache = CalendarServiceCache(str(token_file))
+
+    service = cache.get()
+    assert service._http.credentials.token == "refreshed"
+    assert json.loads(token_file.read_text())["token"] == "refreshed"
+    assert cache.stats.refreshes == 1
+    assert cache.get() is service  # Saving the token is not a reload
+    assert cache.stats.reloads == 1
+
+
+def test_missing_token_requires_authentication(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        calendar_service, "service_cache", CalendarServiceCache(str(tmp_path / "token.json"))
+    )
+
+    with pytest.raises(HTTPException) as exc:
+        get_calendar_service()
+    assert exc.value.status_code == 401
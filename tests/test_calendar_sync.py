@@ -0,0 +1,118 @@
+from datetime import date, datetime, time, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from backend.database.models import CalendarSyncState, DayPlan
+from backend.services.calendar_outbox import CalendarSyncWorker, calendar_worker
+from backend.services.calendar_sync import sync_calendar, sync_if_stale
+from fake_calendar import FakeCalendarService
+
+TODAY = date.today()
+
+
+def timed_event(summary, start_hour, end_hour, **extra):
+    return {
+        "summary": summary,
+        "start": {"dateTime": f"{TODAY}T{start_hour:02d}:00:00"},
+        "end": {"dateTime": f"{TODAY}T{end_hour:02d}:00:00"},
+        **extra,
+    }
+
+
+@pytest.fixture
+def calendar():
+    return FakeCalendarService(page_size=2)
+
+
+def plan_titles(db):
+    db.expire_all()
+    return sorted(p.title for p in db.query(DayPlan).all())
+
+
+def test_full_sync_imports_events_and_stores_token(db_session, calendar):
+    calendar.put_event(**timed_event("Standup", 9, 10))
+    calendar.put_event(**timed_event("Lunch", 12, 13))
+    calendar.put_event(
+        summary="Holiday", start={"date": str(TODAY)}, end={"date": str(TODAY)}
+    )
+    calendar.put_event(
+        **timed_event("Deep work", 14, 16, extendedProperties={"private": {"mode": "work"}})
+    )
+
+    assert sync_calendar(db_session, calendar) == 3
+    assert plan_titles(db_session) == ["Deep work", "Lunch", "Standup"]
+    assert db_session.query(DayPlan).filter_by(title="Deep work").one().mode == "work"
+    assert db_session.get(CalendarSyncState, "primary").sync_token is not None
+    # Two pages of results, both without a sync token
+    assert [c["syncToken"] for c in calendar.list_calls] == [None, None]
+
+
+def test_incremental_sync_only_applies_changes(db_session, calendar):
+    standup = calendar.put_event(**timed_event("Standup", 9, 10))
+    lunch = calendar.put_event(**timed_event("Lunch", 12, 13))
+    sync_calendar(db_session, calendar)
+    calendar.list_calls.clear()
+
+    assert sync_calendar(db_session, calendar) == 0
+    assert calendar.list_calls[0]["syncToken"] is not None
+    assert calendar.list_calls[0]["timeMin"] is None
+
+    calendar.put_event(standup["id"], **timed_event("Standup (moved)", 10, 11))
+    calendar.cancel_event(lunch["id"])
+    calendar.put_event(**timed_event("Review", 15, 16))
+
+    assert sync_calendar(db_session, calendar) == 3
+    assert plan_titles(db_session) == ["Review", "Standup (moved)"]
+    moved = db_session.query(DayPlan).filter_by(google_event_id=standup["id"]).one()
+    assert moved.start_time == time(10)
+
+
+def test_expired_token_triggers_full_resync(db_session, calendar):
+    calendar.put_event(**timed_event("Standup", 9, 10))
+    gone = calendar.put_event(**timed_event("Lunch", 12, 13))
+    sync_calendar(db_session, calendar)
+
+    # The cancellation is lost with the expired token; the full resync
+    # must still remove the plan.
+    del calendar.events_by_id[gone["id"]]
+    calendar.expire_sync_tokens()
+
+    sync_calendar(db_session, calendar)
+    assert plan_titles(db_session) == ["Standup"]
+    tokens = [c["syncToken"] for c in calendar.list_calls]
+    assert tokens[-2] is not None and tokens[-1] is None
+
+
+def test_sync_if_stale_skips_recent_syncs(db_session, calendar):
+    factory_calls = []
+
+    def factory():
+        factory_calls.append(1)
+        return calendar
+
+    sync_if_stale(db_session, factory)
+    sync_if_stale(db_session, factory)
+    assert len(factory_calls) == 1
+
+    sync_if_stale(db_session, factory, min_interval=timedelta(0))
+    assert len(factory_calls) == 2
+
+
+def test_get_day_plans_reads_locally_and_requests_a_pull(api_client, session_factory, calendar):
+    calendar.put_event(**timed_event("Standup", 9, 10))
+    worker = CalendarSyncWorker(session_factory, lambda: calendar)
+
+    with patch.object(calendar_worker, "request_pull") as request_pull:
+        first = api_client.get("/api/dayplans")
+    assert first.status_code == 200
+    assert first.json() == []
+    request_pull.assert_called_once()
+    assert calendar.list_calls == []  # Google is never called inline
+
+    worker.pull_once()
+    worker.pull_once()  # Within MIN_SYNC_INTERVAL: served locally
+    with patch.object(calendar_worker, "request_pull"):
+        second = api_client.get("/api/dayplans")
+    assert [p["title"] for p in second.json()] == ["Standup"]
+    assert len(calendar.list_calls) == 1
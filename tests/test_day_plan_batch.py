@@ -0,0 +1,96 @@
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from backend.database.models import CalendarOutbox, DailyRecord, DayPlan
+from backend.services import calendar_outbox
+from backend.services.calendar_outbox import CalendarSyncWorker
+from fake_calendar import FakeCalendarService
+
+TOMORROW = date.today() + timedelta(days=1)
+
+
+def plan(title, hour, day=TOMORROW):
+    return {
+        "title": title,
+        "mode": "event",
+        "date": day.isoformat(),
+        "start_time": f"{hour:02d}:00:00",
+        "end_time": f"{hour:02d}:30:00",
+    }
+
+
+@pytest.fixture
+def wake():
+    with patch.object(calendar_outbox.calendar_worker, "wake") as wake:
+        yield wake
+
+
+def test_batch_applies_operations_in_one_request(api_client, db_session, wake):
+    keep = api_client.post("/api/dayplans", json=plan("Keep", 8)).json()
+    drop = api_client.post("/api/dayplans", json=plan("Drop", 9)).json()
+    wake.reset_mock()
+
+    response = api_client.post(
+        "/api/dayplans/batch",
+        json={
+            "operations": [
+                {"op": "create", "plan": plan("New A", 10)},
+                {"op": "create", "plan": plan("New B", 11)},
+                {"op": "update", "id": keep["id"], "changes": {"start_time": "07:00:00"}},
+                {"op": "delete", "id": drop["id"]},
+                {"op": "delete", "id": 9999},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == [200, 200, 200, 200, 404]
+    assert results[0]["plan"]["title"] == "New A"
+    assert results[2]["plan"]["start_time"] == "07:00:00"
+    assert results[3]["plan"] is None
+    assert wake.call_count == 1
+
+    titles = [p["title"] for p in api_client.get("/api/dayplans", params={"start": TOMORROW.isoformat()}).json()]
+    assert titles == ["Keep", "New A", "New B"]
+    assert db_session.query(DailyRecord).filter(DailyRecord.date == TOMORROW).count() == 1
+
+
+def test_atomic_batch_rolls_back_on_any_failure(api_client, db_session, wake):
+    response = api_client.post(
+        "/api/dayplans/batch",
+        json={
+            "atomic": True,
+            "operations": [
+                {"op": "create", "plan": plan("Rolled back", 10)},
+                {"op": "update", "id": 9999, "changes": {"title": "Missing"}},
+            ],
+        },
+    )
+    assert response.status_code == 409
+    assert [r["status"] for r in response.json()["detail"]["results"]] == [200, 404]
+    assert db_session.query(DayPlan).count() == 0
+    assert db_session.query(CalendarOutbox).count() == 0
+    wake.assert_not_called()
+
+
+def test_batch_is_pushed_as_one_calendar_batch(api_client, session_factory, wake):
+    calendar = FakeCalendarService()
+    api_client.post(
+        "/api/dayplans/batch",
+        json={"operations": [{"op": "create", "plan": plan(f"Block {h}", h)} for h in range(8, 14)]},
+    )
+
+    assert CalendarSyncWorker(session_factory, lambda: calendar).drain_once() == 6
+    assert calendar.batch_sizes == [6]
+
+
+def test_batch_validates_operations(api_client, wake):
+    unknown = api_client.post("/api/dayplans/batch", json={"operations": [{"op": "rename", "id": 1}]})
+    assert unknown.status_code == 422
+    too_many = api_client.post(
+        "/api/dayplans/batch",
+        json={"operations": [{"op": "delete", "id": i} for i in range(201)]},
+    )
+    assert too_many.status_code == 422
@@ -0,0 +1,37 @@
+from datetime import date, time
+
+from backend.database.models import DayPlan
+from backend.services import day_plan_repository
+
+
+def add_plan(db, day, start, end, title="Plan"):
+    plan = DayPlan(title=title, mode="event", date=day, start_time=start, end_time=end)
+    db.add(plan)
+    db.flush()
+    return plan
+
+
+def test_plans_on_matches_only_that_day_in_time_order(db_session):
+    day = date(2024, 5, 1)
+    add_plan(db_session, day, time(14), time(15), "Afternoon")
+    add_plan(db_session, day, time(9), time(10), "Morning")
+    add_plan(db_session, date(2024, 4, 30), time(9), time(10), "Day before")
+    add_plan(db_session, date(2024, 5, 2), time(0), time(1), "Day after")
+    db_session.commit()
+
+    assert [p.title for p in day_plan_repository.plans_on(db_session, day)] == [
+        "Morning",
+        "Afternoon",
+    ]
+    assert len(day_plan_repository.plans_between(db_session, date(2024, 4, 30), day)) == 3
+
+
+def test_plan_at_returns_the_earliest_running_plan(db_session):
+    day = date(2024, 5, 1)
+    add_plan(db_session, day, time(10), time(12), "Later")
+    first = add_plan(db_session, day, time(9), time(11), "Earlier")
+    add_plan(db_session, date(2024, 5, 2), time(9), time(11), "Next day")
+    db_session.commit()
+
+    assert day_plan_repository.plan_at(db_session, day, time(10, 30)).id == first.id
+    assert day_plan_repository.plan_at(db_session, day, time(12)) is None
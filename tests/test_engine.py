@@ -0,0 +1,27 @@
+from sqlalchemy import text
+
+from backend.database.engine import create_sqlite_engine
+
+
+def pragma(engine, name):
+    with engine.connect() as conn:
+        return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_connections_are_tuned(tmp_path):
+    engine = create_sqlite_engine(f"sqlite:///{tmp_path / 'tuned.db'}")
+
+    assert pragma(engine, "journal_mode") == "wal"
+    assert pragma(engine, "synchronous") == 1  # NORMAL
+    assert pragma(engine, "busy_timeout") == 5000
+    assert pragma(engine, "temp_store") == 2  # MEMORY
+    assert pragma(engine, "cache_size") == -20000
+
+
+def test_pragmas_can_be_overridden(tmp_path, monkeypatch):
+    monkeypatch.setenv("SQLITE_SYNCHRONOUS", "FULL")
+    engine = create_sqlite_engine(f"sqlite:///{tmp_path / 'full.db'}")
+    assert pragma(engine, "synchronous") == 2
+
+    plain = create_sqlite_engine(f"sqlite:///{tmp_path / 'plain.db'}", pragmas={})
+    assert pragma(plain, "journal_mode") == "delete"
@@ -0,0 +1,81 @@
+import json
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from backend.database.models import Reminder
+from backend.services import pagination
+
+
+def walk(client, url, limit):
+    """Follow X-Next-Cursor until the last page; return (items, page count)."""
+    items, pages, cursor = [], 0, None
+    while True:
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(url, params=params)
+        assert response.status_code == 200
+        items.extend(response.json())
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return items, pages
+
+
+def test_task_pages_follow_queue_order(api_client, create_task):
+    ids = [create_task(f"T{i}") for i in range(7)]
+    api_client.put(f"/api/tasks/{ids[6]}/move", json={"before_id": ids[0]})
+
+    tasks, pages = walk(api_client, "/api/tasks/incomplete", limit=3)
+    assert [t["id"] for t in tasks] == [ids[6]] + ids[:6]
+    assert pages == 3
+
+
+def test_queue_summary_covers_every_page(api_client, create_task):
+    ids = [create_task(f"T{i}", length="00:10:00") for i in range(30)]
+    api_client.delete(f"/api/tasks/{ids[0]}")
+
+    started = datetime(2024, 1, 1, 9, 0)
+    with patch("backend.services.timer.utcnow", lambda: started):
+        api_client.put(f"/api/tasks/{ids[1]}/timer/start")
+    with patch("backend.services.timer.utcnow", lambda: started + timedelta(minutes=4)):
+        summary = api_client.get("/api/tasks/incomplete/summary").json()
+
+    assert summary == {"count": 29, "time_remaining_seconds": 29 * 600 - 4 * 60}
+
+
+def test_reminders_with_equal_timestamps_are_not_skipped(api_client, db_session):
+    same_time = datetime(2024, 5, 1, 9, 0)
+    db_session.add_all(Reminder(content=f"R{i}", last_updated=same_time) for i in range(5))
+    db_session.add(Reminder(content="newest", last_updated=datetime(2024, 5, 2)))
+    db_session.commit()
+
+    reminders, _ = walk(api_client, "/api/reminders", limit=2)
+    assert [r["content"] for r in reminders] == ["newest", "R4", "R3", "R2", "R1", "R0"]
+
+
+def test_journal_list_and_export(api_client):
+    for _ in range(4):
+        api_client.post("/api/journals", json={"sections": []})
+
+    journals, pages = walk(api_client, "/api/journals", limit=3)
+    assert pages == 2
+    assert len({j["id"] for j in journals}) == 4
+
+    export = api_client.get("/api/journals/export")
+    assert export.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in export.text.splitlines()]
+    assert [j["id"] for j in lines] == [j["id"] for j in journals]
+
+
+def test_invalid_cursor_is_rejected(api_client):
+    assert api_client.get("/api/goals", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_task_export_streams_every_batch(api_client, create_task, monkeypatch):
+    monkeypatch.setattr(pagination, "EXPORT_BATCH_SIZE", 2)
+    for i in range(5):
+        create_task(f"T{i}")
+
+    lines = api_client.get("/api/tasks/incomplete/export").text.splitlines()
+    assert [json.loads(line)["title"] for line in lines] == [f"T{i}" for i in range(5)]
@@ -0,0 +1,122 @@
+"""EXPLAIN QUERY PLAN regression tests for the hot queries.
+
+Each test records the SELECTs an endpoint or worker actually issues and
+fails if SQLite would answer any of them with a full table scan.
+"""
+import re
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from backend.database.models import Journal, JournalSection, Reminder
+from backend.services.calendar_outbox import CalendarSyncWorker
+from fake_calendar import FakeCalendarService
+
+# "SCAN tasks" is a full table scan; "SCAN tasks USING INDEX ..." walks an
+# index in order and is fine. Subquery results (anon_1) are not tables.
+TABLE_SCAN = re.compile(r"^SCAN (?!anon_)(\w+)$")
+
+
+@pytest.fixture
+def captured_selects():
+    statements = []
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(Engine, "before_cursor_execute", before_execute)
+    yield statements
+    event.remove(Engine, "before_cursor_execute", before_execute)
+
+
+def table_scans(db_engine, statements):
+    scans = []
+    with db_engine.connect() as conn:
+        for statement, parameters in statements:
+            plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            for row in plan:
+                if TABLE_SCAN.match(row[-1]):
+                    scans.append((row[-1], " ".join(statement.split())))
+    return scans
+
+
+def test_current_activity_and_event_task_use_indexes(
+    api_client, create_task, db_engine, captured_selects
+):
+    create_task("Queued")
+    api_client.put("/api/current-activity/set-page", json={"page_number": 3})
+    now = datetime.now()
+    api_client.post(
+        "/api/dayplans",
+        json={
+            "title": "Meeting",
+            "mode": "event",
+            "start_time": (now - timedelta(minutes=5)).time().isoformat(),
+            "end_time": (now + timedelta(minutes=30)).time().isoformat(),
+        },
+    )
+    captured_selects.clear()
+
+    assert api_client.get("/api/current-activity").json()["activity_type"] == "event"
+    assert captured_selects
+    assert table_scans(db_engine, captured_selects) == []
+
+
+def test_queue_pages_use_indexes(api_client, create_task, db_engine, captured_selects):
+    for i in range(4):
+        create_task(f"T{i}")
+    captured_selects.clear()
+
+    first = api_client.get("/api/tasks/incomplete", params={"limit": 2})
+    api_client.get(
+        "/api/tasks/incomplete",
+        params={"limit": 2, "cursor": first.headers["X-Next-Cursor"]},
+    )
+    assert table_scans(db_engine, captured_selects) == []
+
+
+def test_journal_and_note_lists_use_indexes(api_client, db_engine, db_session, captured_selects):
+    journal = Journal(exact_time=datetime.now())
+    db_session.add(journal)
+    db_session.flush()
+    db_session.add_all(
+        JournalSection(journal_id=journal.id, header=f"H{i}", content="", order=i)
+        for i in range(3)
+    )
+    db_session.add_all(Reminder(content=f"R{i}", last_updated=datetime.now()) for i in range(3))
+    db_session.commit()
+    captured_selects.clear()
+
+    api_client.get(f"/api/journals/{journal.id}")
+    page = api_client.get("/api/reminders", params={"limit": 1})
+    api_client.get("/api/reminders", params={"limit": 1, "cursor": page.headers["X-Next-Cursor"]})
+    assert table_scans(db_engine, captured_selects) == []
+
+
+def test_outbox_poll_uses_index(api_client, db_engine, session_factory, captured_selects):
+    api_client.post(
+        "/api/dayplans",
+        json={"title": "Push me", "mode": "event", "start_time": "09:00:00", "end_time": "10:00:00"},
+    )
+    calendar = FakeCalendarService()
+    captured_selects.clear()
+
+    CalendarSyncWorker(session_factory, lambda: calendar).drain_once()
+    assert table_scans(db_engine, captured_selects) == []
+
+
+def test_day_plan_lookups_use_date_index(api_client, db_engine, captured_selects):
+    api_client.post(
+        "/api/dayplans",
+        json={"title": "Standup", "mode": "event", "start_time": "00:00:00", "end_time": "23:59:00"},
+    )
+    captured_selects.clear()
+
+    assert len(api_client.get("/api/dayplans").json()) == 1
+    api_client.get("/api/current-event")
+    plans = [s for s, _ in captured_selects if "FROM day_plans" in s]
+    assert plans and all("date(" not in s.lower() for s in plans)
+    assert table_scans(db_engine, captured_selects) == []
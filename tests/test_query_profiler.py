@@ -0,0 +1,45 @@
+import logging
+
+import pytest
+
+from backend.services import query_profiler
+
+
+@pytest.fixture(autouse=True)
+def fresh_stats():
+    query_profiler.reset_route_stats()
+    yield
+    query_profiler.reset_route_stats()
+
+
+def test_responses_carry_query_headers(api_client, create_task):
+    response = api_client.get(f"/api/tasks/{create_task('Profiled')}")
+
+    assert int(response.headers["X-DB-Query-Count"]) > 0
+    assert float(response.headers["X-DB-Query-Time-Ms"]) >= 0
+
+
+def test_async_routes_are_profiled(api_client):
+    response = api_client.get("/api/tasks/incomplete")
+    assert int(response.headers["X-DB-Query-Count"]) == 1
+
+
+def test_metrics_are_attributed_to_route_templates(api_client, create_task):
+    task_id = create_task("A")
+    api_client.get(f"/api/tasks/{task_id}")
+    api_client.get(f"/api/tasks/{task_id}")
+
+    routes = api_client.get("/api/_metrics").json()["routes"]
+    stats = routes["GET /api/tasks/{task_id}"]
+    assert stats["requests"] == 2
+    assert stats["avg_statements"] == 1
+    assert "POST /api/tasks" in routes
+
+
+def test_slow_queries_are_logged(api_client, monkeypatch, caplog):
+    monkeypatch.setattr(query_profiler, "SLOW_QUERY_MS", 0)
+    with caplog.at_level(logging.WARNING, logger=query_profiler.__name__):
+        api_client.get("/api/tasks/incomplete")
+
+    assert any("Slow query" in r.getMessage() and "FROM tasks" in r.getMessage()
+               for r in caplog.records)
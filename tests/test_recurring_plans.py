@@ -0,0 +1,160 @@
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from backend.database.models import DayPlan, RecurringPlan
+from backend.services import calendar_outbox
+from backend.services.calendar_outbox import CalendarSyncWorker
+from backend.services.calendar_sync import sync_calendar
+from fake_calendar import FakeCalendarService
+
+TODAY = date.today()
+MONDAY = TODAY - timedelta(days=TODAY.weekday())
+
+DAILY_STANDUP = {
+    "title": "Standup",
+    "mode": "event",
+    "rrule": "FREQ=DAILY",
+    "start_date": MONDAY.isoformat(),
+    "start_time": "09:00:00",
+    "end_time": "09:15:00",
+}
+
+
+@pytest.fixture
+def client(api_client):
+    with patch.object(calendar_outbox.calendar_worker, "wake"):
+        yield api_client
+
+
+def week(client, start=MONDAY, days=7):
+    response = client.get(
+        "/api/dayplans",
+        params={"start": start.isoformat(), "end": (start + timedelta(days=days - 1)).isoformat()},
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_occurrences_are_expanded_per_range_without_rows(client, db_session):
+    series = client.post(
+        "/api/recurring-plans",
+        json={**DAILY_STANDUP, "rrule": "FREQ=WEEKLY;BYDAY=MO,WE,FR"},
+    ).json()
+    client.post(
+        "/api/dayplans",
+        json={"title": "Dentist", "mode": "event", "date": MONDAY.isoformat(),
+              "start_time": "08:00:00", "end_time": "08:30:00"},
+    )
+
+    plans = week(client)
+    assert [(p["title"], p["date"]) for p in plans] == [
+        ("Dentist", MONDAY.isoformat()),
+        ("Standup", MONDAY.isoformat()),
+        ("Standup", (MONDAY + timedelta(days=2)).isoformat()),
+        ("Standup", (MONDAY + timedelta(days=4)).isoformat()),
+    ]
+    assert plans[1]["id"] is None and plans[1]["recurring_plan_id"] == series["id"]
+
+    # Years ahead is expanded on demand; nothing is materialized
+    assert len(week(client, MONDAY + timedelta(weeks=520))) == 3
+    assert week(client, MONDAY - timedelta(weeks=1)) == []
+    assert db_session.query(DayPlan).count() == 1
+    assert series["ends_on"] is None
+
+
+def test_bounded_rules_and_invalid_rules(client):
+    series = client.post("/api/recurring-plans", json={**DAILY_STANDUP, "rrule": "FREQ=DAILY;COUNT=3"})
+    assert series.json()["ends_on"] == (MONDAY + timedelta(days=2)).isoformat()
+    assert len(week(client)) == 3
+
+    bad = client.post("/api/recurring-plans", json={**DAILY_STANDUP, "rrule": "FREQ=SOMETIMES"})
+    assert bad.status_code == 422
+
+
+def test_occurrence_exceptions(client, db_session):
+    series_id = client.post("/api/recurring-plans", json=DAILY_STANDUP).json()["id"]
+    tuesday = MONDAY + timedelta(days=1)
+    wednesday = MONDAY + timedelta(days=2)
+
+    assert client.delete(f"/api/recurring-plans/{series_id}/occurrences/{tuesday}").status_code == 200
+    moved = client.put(
+        f"/api/recurring-plans/{series_id}/occurrences/{wednesday}",
+        json={"start_time": "10:00:00", "end_time": "10:15:00"},
+    ).json()
+    assert moved["id"] is not None and moved["title"] == "Standup"
+
+    plans = {p["date"]: p for p in week(client)}
+    assert tuesday.isoformat() not in plans
+    assert plans[wednesday.isoformat()]["start_time"] == "10:00:00"
+    assert plans[wednesday.isoformat()]["recurring_plan_id"] is None
+    assert len(plans) == 6
+
+    not_an_occurrence = client.delete(
+        f"/api/recurring-plans/{series_id}/occurrences/{MONDAY - timedelta(days=1)}"
+    )
+    assert not_an_occurrence.status_code == 404
+
+    client.delete(f"/api/recurring-plans/{series_id}")
+    assert [p["title"] for p in week(client)] == ["Standup"]  # The detached occurrence
+
+
+def test_occurrence_is_only_detached_once(client, db_session):
+    series_id = client.post("/api/recurring-plans", json=DAILY_STANDUP).json()["id"]
+    tuesday = MONDAY + timedelta(days=1)
+    url = f"/api/recurring-plans/{series_id}/occurrences/{tuesday}"
+    edit = {"start_time": "10:00:00", "end_time": "10:15:00"}
+
+    assert client.put(url, json=edit).status_code == 200
+    repeated = client.put(url, json=edit)
+    assert repeated.status_code == 409
+    assert db_session.query(DayPlan).filter(DayPlan.date == tuesday).count() == 1
+
+    # A cancelled occurrence cannot be brought back as a DayPlan either
+    wednesday = MONDAY + timedelta(days=2)
+    client.delete(f"/api/recurring-plans/{series_id}/occurrences/{wednesday}")
+    assert client.put(
+        f"/api/recurring-plans/{series_id}/occurrences/{wednesday}", json=edit
+    ).status_code == 409
+
+
+def test_series_is_pushed_as_one_recurring_event(client, session_factory, db_session):
+    calendar = FakeCalendarService()
+    worker = CalendarSyncWorker(session_factory, lambda: calendar)
+    series_id = client.post("/api/recurring-plans", json=DAILY_STANDUP).json()["id"]
+    worker.drain_once()
+
+    (event,) = calendar.events_by_id.values()
+    assert event["recurrence"] == ["RRULE:FREQ=DAILY"]
+    assert event["start"]["dateTime"].startswith(f"{MONDAY}T09:00:00")
+
+    tuesday = MONDAY + timedelta(days=1)
+    client.delete(f"/api/recurring-plans/{series_id}/occurrences/{tuesday}")
+    worker.drain_once()
+    (event,) = calendar.events_by_id.values()
+    assert event["recurrence"][1] == (
+        f"EXDATE;TZID={calendar_outbox.TIME_ZONE}:{tuesday:%Y%m%d}T090000"
+    )
+
+    # Instances of the series listed back by the pull sync are not stored as
+    # DayPlans; one cancelled in Google becomes an exception
+    db_session.expire_all()
+    series_event_id = db_session.get(RecurringPlan, series_id).google_event_id
+    assert sync_calendar(db_session, calendar) == 0
+    friday = MONDAY + timedelta(days=4)
+    for day, status in ((MONDAY, "confirmed"), (friday, "cancelled")):
+        calendar.put_event(
+            f"{series_event_id}_{day:%Y%m%d}",
+            status=status,
+            recurringEventId=series_event_id,
+            originalStartTime={"dateTime": f"{day}T09:00:00"},
+            **({} if status == "cancelled" else {
+                "summary": "Standup",
+                "start": {"dateTime": f"{day}T09:00:00"},
+                "end": {"dateTime": f"{day}T09:15:00"},
+            }),
+        )
+    assert sync_calendar(db_session, calendar) == 1
+    assert db_session.query(DayPlan).count() == 0
+    assert friday.isoformat() not in {p["date"] for p in week(client)}
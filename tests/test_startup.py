@@ -0,0 +1,58 @@
+import multiprocessing
+
+import pytest
+
+import startup
+from startup import StartupTimeline, parse_importtime, wait_for_backend
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      2500 |       4100 |     sqlalchemy.orm
+import time:       800 |       9000 |   backend.app
+import time:        40 |      13260 | front_end.page_cordinator
+"""
+
+
+def test_health_reports_ready(api_client):
+    response = api_client.get("/api/health")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+
+
+def test_parse_importtime():
+    rows = parse_importtime(IMPORTTIME_OUTPUT)
+    assert [(r.module, r.self_us, r.cumulative_us, r.depth) for r in rows] == [
+        ("_io", 120, 120, 1),
+        ("sqlalchemy.orm", 2500, 4100, 2),
+        ("backend.app", 800, 9000, 1),
+        ("front_end.page_cordinator", 40, 13260, 0),
+    ]
+
+
+def test_timeline_appends_phases_to_the_log(tmp_path):
+    log = tmp_path / "startup.log"
+    timeline = StartupTimeline("frontend", origin=0)
+    with timeline.phase("import pages"):
+        pass
+    timeline.mark("first paint")
+    timeline.write(log)
+    timeline.write(log)  # Phases are only written once
+
+    lines = log.read_text().splitlines()
+    assert len(lines) == 2
+    assert all(" frontend " in line for line in lines)
+    assert lines[0].endswith("import pages") and lines[1].endswith("first paint")
+
+
+def test_wait_for_backend_gives_up(monkeypatch):
+    monkeypatch.setattr(startup, "READY_POLL_INTERVAL", 0.01)
+    unused_port = "http://127.0.0.1:9/api/health"
+    with pytest.raises(TimeoutError):
+        wait_for_backend(url=unused_port, timeout=0.05)
+
+    exited = multiprocessing.Process(target=int)
+    exited.start()
+    exited.join()
+    with pytest.raises(RuntimeError, match="exited"):
+        wait_for_backend(exited, url=unused_port, timeout=5)
@@ -0,0 +1,111 @@
+import pytest
+from sqlalchemy import event
+
+from backend.database.models import TaskOrder
+from backend.services.task_order import ORDER_GAP
+
+
+@pytest.fixture
+def create_tasks(create_task):
+    return lambda count: [create_task(f"T{i}") for i in range(count)]
+
+
+def queue(client):
+    return [t["id"] for t in client.get("/api/tasks/incomplete?limit=1000").json()]
+
+
+def test_reorder_is_a_constant_number_of_statements(api_client, create_tasks):
+    ids = create_tasks(30)
+    small = api_client.put("/api/tasks/reorder", json={"task_ids": ids[:3][::-1]})
+    large = api_client.put("/api/tasks/reorder", json={"task_ids": ids[::-1]})
+
+    assert large.status_code == 200
+    assert large.headers["X-DB-Query-Count"] == small.headers["X-DB-Query-Count"]
+    assert queue(api_client) == ids[::-1]
+
+
+@pytest.mark.parametrize(
+    "moved, neighbours, expected",
+    [
+        (4, {"before_id": 0}, [4, 0, 1, 2, 3]),  # to the top
+        (0, {"after_id": 4}, [1, 2, 3, 4, 0]),  # to the bottom
+        (3, {"after_id": 0, "before_id": 1}, [0, 3, 1, 2, 4]),  # up
+        (1, {"after_id": 3, "before_id": 4}, [0, 2, 3, 1, 4]),  # down
+        (2, {"after_id": 1, "before_id": 3}, [0, 1, 2, 3, 4]),  # in place
+    ],
+)
+def test_move_one_task(api_client, create_tasks, moved, neighbours, expected):
+    ids = create_tasks(5)
+    body = {key: ids[index] for key, index in neighbours.items()}
+
+    response = api_client.put(f"/api/tasks/{ids[moved]}/move", json=body)
+    assert response.status_code == 200
+    assert queue(api_client) == [ids[i] for i in expected]
+
+
+def test_move_with_stale_neighbours_conflicts(api_client, create_tasks):
+    ids = create_tasks(4)
+    response = api_client.put(
+        f"/api/tasks/{ids[0]}/move", json={"after_id": ids[1], "before_id": ids[3]}
+    )
+    assert response.status_code == 409
+    assert queue(api_client) == ids
+
+    assert api_client.put(f"/api/tasks/{ids[0]}/move", json={}).status_code == 422
+    assert api_client.put("/api/tasks/999/move", json={"after_id": ids[0]}).status_code == 404
+
+
+@pytest.fixture
+def task_order_writes(db_engine):
+    """Rows written to task_order per statement, for statements that write it."""
+    writes = []
+
+    def after_execute(conn, cursor, statement, parameters, context, executemany):
+        if "task_order" in statement and not statement.lstrip().startswith("SELECT"):
+            writes.append(cursor.rowcount)
+
+    event.listen(db_engine, "after_cursor_execute", after_execute)
+    yield writes
+    event.remove(db_engine, "after_cursor_execute", after_execute)
+
+
+def test_insert_delete_and_move_touch_one_row(api_client, create_tasks, task_order_writes):
+    ids = create_tasks(5)
+    assert task_order_writes == [1] * 5
+    task_order_writes.clear()
+
+    api_client.delete(f"/api/tasks/{ids[2]}")
+    api_client.put(f"/api/tasks/{ids[4]}/move", json={"after_id": ids[0], "before_id": ids[1]})
+    assert task_order_writes == [1, 1]
+    assert queue(api_client) == [ids[0], ids[4], ids[1], ids[3]]
+
+
+def test_crowded_gap_is_rebalanced_in_background(api_client, create_tasks, db_session):
+    ids = create_tasks(3)
+    # Keep moving the last task into the halving gap below the first; the
+    # seventh move leaves a gap under MIN_GAP
+    below = ids[1]
+    for _ in range(7):
+        moved = queue(api_client)[-1]
+        response = api_client.put(
+            f"/api/tasks/{moved}/move", json={"after_id": ids[0], "before_id": below}
+        )
+        assert response.status_code == 200
+        below = moved
+
+    assert queue(api_client)[0] == ids[0]
+    keys = [row.order for row in db_session.query(TaskOrder).order_by(TaskOrder.order)]
+    assert keys == [ORDER_GAP, 2 * ORDER_GAP, 3 * ORDER_GAP]
+
+
+def test_exhausted_gap_is_rebalanced_inline(api_client, create_tasks, db_session):
+    ids = create_tasks(3)
+    for task_id, key in zip(ids, (5, 6, 7)):
+        db_session.get(TaskOrder, task_id).order = key
+    db_session.commit()
+
+    response = api_client.put(
+        f"/api/tasks/{ids[2]}/move", json={"after_id": ids[0], "before_id": ids[1]}
+    )
+    assert response.status_code == 200
+    assert queue(api_client) == [ids[0], ids[2], ids[1]]
@@ -0,0 +1,124 @@
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from backend.database.models import Task
+from backend.services import timer
+
+
+def make_task(db, seconds=3600):
+    task = Task(
+        title="Focus",
+        description="",
+        original_length_seconds=seconds,
+        time_remaining_seconds=seconds,
+    )
+    db.add(task)
+    db.commit()
+    return task.id
+
+
+@pytest.fixture
+def clock():
+    current = {"now": datetime(2024, 1, 1, 9, 0, 0)}
+    with patch("backend.services.timer.utcnow", lambda: current["now"]):
+        yield current
+
+
+def test_running_timer_is_computed_on_read(api_client, db_session, clock):
+    task_id = make_task(db_session)
+
+    response = api_client.put(f"/api/tasks/{task_id}/timer/start")
+    assert response.status_code == 200
+    assert response.json()["is_running"] is True
+
+    clock["now"] += timedelta(seconds=90)
+    state = api_client.get(f"/api/tasks/{task_id}/timer").json()
+    assert state["time_remaining"] == 3510
+    assert state["total_time"] == 3600
+
+    # Nothing but the start timestamp was persisted while running
+    db_session.expire_all()
+    assert db_session.get(Task, task_id).time_remaining_seconds == 3600
+
+
+def test_task_responses_report_live_time_remaining(api_client, create_task, clock):
+    task_id = create_task("Focus", length="01:00:00")
+    api_client.put(f"/api/tasks/{task_id}/timer/start")
+    clock["now"] += timedelta(seconds=90)
+
+    assert api_client.get(f"/api/tasks/{task_id}").json()["time_remaining"] == "00:58:30"
+    (queued,) = api_client.get("/api/tasks/incomplete").json()
+    assert queued["time_remaining"] == "00:58:30"
+
+
+def test_pause_persists_remaining_and_resume_continues(api_client, db_session, clock):
+    task_id = make_task(db_session)
+    api_client.put(f"/api/tasks/{task_id}/timer/start")
+
+    clock["now"] += timedelta(seconds=60)
+    paused = api_client.put(f"/api/tasks/{task_id}/timer/pause").json()
+    assert paused["is_running"] is False
+    assert paused["time_remaining"] == 3540
+
+    clock["now"] += timedelta(minutes=10)
+    assert api_client.get(f"/api/tasks/{task_id}/timer").json()["time_remaining"] == 3540
+
+    api_client.put(f"/api/tasks/{task_id}/timer/resume")
+    clock["now"] += timedelta(seconds=40)
+    assert api_client.get(f"/api/tasks/{task_id}/timer").json()["time_remaining"] == 3500
+
+
+def test_timer_completes_when_countdown_reaches_zero(api_client, db_session, clock):
+    task_id = make_task(db_session, seconds=30)
+    api_client.put(f"/api/tasks/{task_id}/timer/start")
+
+    clock["now"] += timedelta(seconds=45)
+    state = api_client.get(f"/api/tasks/{task_id}/timer").json()
+    assert state["time_remaining"] == 0
+    assert state["is_complete"] is True
+    assert state["is_running"] is False
+
+    response = api_client.put(f"/api/tasks/{task_id}/timer/start")
+    assert response.status_code == 400
+
+
+def test_settle_stamps_completion_in_local_time():
+    start = datetime(2024, 1, 1, 9, 0, 0)
+    task = Task(time_remaining_seconds=30, original_length_seconds=30)
+    timer.start(task, start)
+    assert timer.settle(task, start + timedelta(seconds=45)) is True
+    # Like the completions made by /update-time, not the naive UTC timer clock
+    assert task.completed_at.tzinfo is not None
+    assert abs((task.completed_at - timer.local_now()).total_seconds()) < 5
+
+
+def test_decrement_counts_running_time_once(api_client, db_session, clock):
+    task_id = make_task(db_session, seconds=60)
+    api_client.put(f"/api/tasks/{task_id}/timer/start")
+
+    clock["now"] += timedelta(seconds=10)
+    response = api_client.put(f"/api/tasks/{task_id}/decrement-time")
+    assert response.json()["time_remaining"] == 49
+    assert api_client.get(f"/api/tasks/{task_id}/timer").json()["time_remaining"] == 49
+
+    clock["now"] += timedelta(seconds=48)
+    assert api_client.put(f"/api/tasks/{task_id}/decrement-time").json()["is_complete"] is True
+    db_session.expire_all()
+    task = db_session.get(Task, task_id)
+    assert task.completed_at is not None and task.running_since is None
+
+
+def test_checkpoint_folds_elapsed_time():
+    start = datetime(2024, 1, 1, 9, 0, 0)
+    task = Task(time_remaining_seconds=600, original_length_seconds=600)
+    timer.start(task, start)
+    timer.checkpoint(task, start + timedelta(seconds=100))
+    assert task.time_remaining_seconds == 500
+    assert task.running_since == start + timedelta(seconds=100)
+    assert timer.remaining_seconds(task, start + timedelta(seconds=150)) == 450
+
+
+def test_timer_for_unknown_task_returns_404(api_client):
+    assert api_client.get("/api/tasks/999/timer").status_code == 404